@@ -83,6 +83,18 @@ resource "aws_dynamodb_table" "app_table" {
     name = "created_at"
     type = "S"
   }
+  attribute {
+    name = "order_pk"
+    type = "S"
+  }
+  attribute {
+    name = "order_sk"
+    type = "S"
+  }
+  attribute {
+    name = "published_pk"
+    type = "S"
+  }
 
   global_secondary_index {
     name               = "gsi1-entity-type-created-at"
@@ -98,6 +110,28 @@ resource "aws_dynamodb_table" "app_table" {
     projection_type    = "ALL"
   }
 
+  # Topics/levels/exercises in display order (order_sk = zero-padded position#id)
+  global_secondary_index {
+    name               = "order_pk-order_sk-index"
+    hash_key           = "order_pk"
+    range_key          = "order_sk"
+    projection_type    = "ALL"
+  }
+
+  # Sparse: only published topics/levels carry published_pk, so public lists never read drafts
+  global_secondary_index {
+    name               = "published_pk-order_sk-index"
+    hash_key           = "published_pk"
+    range_key          = "order_sk"
+    projection_type    = "ALL"
+  }
+
+  # Expire short-lived items (refresh tokens, revocations) via their `ttl` epoch attribute
+  ttl {
+    attribute_name = "ttl"
+    enabled        = true
+  }
+
   # SECURITY: Enable encryption at rest with AWS managed key
   server_side_encryption {
     enabled     = true
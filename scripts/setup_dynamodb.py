@@ -34,6 +34,9 @@ def create_table():
                 {'AttributeName': 'created_at', 'AttributeType': 'S'},
                 {'AttributeName': 'topic_id', 'AttributeType': 'S'},
                 {'AttributeName': 'email', 'AttributeType': 'S'},
+                {'AttributeName': 'order_pk', 'AttributeType': 'S'},
+                {'AttributeName': 'order_sk', 'AttributeType': 'S'},
+                {'AttributeName': 'published_pk', 'AttributeType': 'S'},
             ],
             KeySchema=[
                 {'AttributeName': 'PK', 'KeyType': 'HASH'},
@@ -56,6 +59,24 @@ def create_table():
                     ],
                     'Projection': {'ProjectionType': 'ALL'}
                 },
+                {
+                    # Topics/levels/exercises in display order (order_sk = zero-padded position#id)
+                    'IndexName': 'order_pk-order_sk-index',
+                    'KeySchema': [
+                        {'AttributeName': 'order_pk', 'KeyType': 'HASH'},
+                        {'AttributeName': 'order_sk', 'KeyType': 'RANGE'}
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'}
+                },
+                {
+                    # Sparse: only published topics/levels carry published_pk
+                    'IndexName': 'published_pk-order_sk-index',
+                    'KeySchema': [
+                        {'AttributeName': 'published_pk', 'KeyType': 'HASH'},
+                        {'AttributeName': 'order_sk', 'KeyType': 'RANGE'}
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'}
+                },
                 {
                     'IndexName': 'email-index',
                     'KeySchema': [
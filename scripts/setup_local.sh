@@ -125,7 +125,7 @@ aws lambda create-function \
     --handler lambda_handler.handler \
     --role arn:aws:iam::000000000000:role/lambda-role \
     --zip-file fileb://lambda_deployment.zip \
-    --environment "Variables={DYNAMO_TABLE=${TABLE_NAME},S3_BUCKET=${S3_BUCKET},DYNAMO_ENDPOINT_URL=${LOCALSTACK_ENDPOINT}}" \
+    --environment "Variables={DYNAMO_TABLE=${TABLE_NAME},S3_BUCKET=${S3_BUCKET},DYNAMO_ENDPOINT_URL=${LOCALSTACK_ENDPOINT},ENTITY_TYPE_INDEX=entity_type-created_at-index}" \
     --endpoint-url ${LOCALSTACK_ENDPOINT} \
     --region us-east-1 \
     2>/dev/null || aws lambda update-function-code \
@@ -320,6 +320,8 @@ ENVIRONMENT=development
 DYNAMO_TABLE=aplicacion-senas-content
 DYNAMO_ENDPOINT_URL=http://localhost:4566
 DYNAMO_REGION=us-east-1
+# GSI name created by setup_dynamo.py (infra/terraform names it gsi1-entity-type-created-at)
+ENTITY_TYPE_INDEX=entity_type-created_at-index
 
 # S3 Local (LocalStack)
 S3_BUCKET=aplicacion-senas-assets-local
@@ -99,6 +99,7 @@ echo ""
 export DYNAMO_TABLE=$TABLE_NAME
 export DYNAMO_ENDPOINT_URL=http://localhost:$DYNAMO_PORT
 export DYNAMO_REGION=us-east-1
+export ENTITY_TYPE_INDEX=entity_type-created_at-index
 export AWS_ACCESS_KEY_ID=test
 export AWS_SECRET_ACCESS_KEY=test
 export DATABASE_URL=sqlite:///./test.db
@@ -0,0 +1,190 @@
+"""Admin bulk endpoints - whole-topic content import, job status"""
+from fastapi import APIRouter, HTTPException, Query, Depends, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from typing import Optional, Dict, List
+import time
+import uuid
+from datetime import datetime
+from app.api.v1.exercises import ExerciseConfig, ExerciseTranslationInput, ExerciseType, build_exercise_items
+from app.api.v1.levels import LevelMetadata, LevelTranslationInput, build_level_items
+from app.api.v1.topics import TopicTranslationInput, build_topic_items
+from app.core.auth import get_current_admin
+from app.core.bulk_write import TRANSACTION_LIMIT, batch_delete, batch_put, transact_put
+from app.core.cascade import advance_topic_delete, get_job, mark_stale
+from app.core.config import settings
+from app.core.content_cache import content_cache
+from app.core.database import get_dynamodb_table
+from app.core.responses import FastJSONRoute
+
+router = APIRouter(prefix="/admin", tags=["admin"], route_class=FastJSONRoute)
+
+# Pydantic models (same fields as the create endpoints, nested instead of linked by id)
+class ExerciseImport(BaseModel):
+    exercise_type: ExerciseType
+    position: int
+    config: Optional[ExerciseConfig] = None
+    answer_schema: Optional[Dict] = None
+    translations: Optional[Dict[str, ExerciseTranslationInput]] = None
+
+class LevelImport(BaseModel):
+    slug: str
+    position: int
+    difficulty: int
+    metadata: Optional[LevelMetadata] = None
+    is_published: bool = False
+    translations: Optional[Dict[str, LevelTranslationInput]] = None
+    exercises: List[ExerciseImport] = []
+
+class TopicImport(BaseModel):
+    slug: str
+    default_title: str
+    order: Optional[int] = None
+    is_published: bool = False
+    translations: Optional[Dict[str, TopicTranslationInput]] = None
+    levels: List[LevelImport] = []
+
+
+def count_items(topic: TopicImport) -> int:
+    """Number of DynamoDB items an import writes (metadata plus translations)"""
+    total = 1 + len(topic.translations or {})
+    for level in topic.levels:
+        total += 1 + len(level.translations or {})
+        for exercise in level.exercises:
+            total += 1 + len(exercise.translations or {})
+    return total
+
+
+def validate_import(topic: TopicImport) -> List[dict]:
+    """Document-level checks the models cannot express, as FastAPI-style error entries"""
+    errors = []
+
+    def check_languages(loc, translations):
+        for lang_code in translations or {}:
+            if not lang_code or '#' in lang_code:
+                errors.append({"loc": loc + ["translations", lang_code], "msg": "invalid language code"})
+
+    def check_unique(loc, values, what):
+        seen = set()
+        for index, value in enumerate(values):
+            if value in seen:
+                errors.append({"loc": loc + [index], "msg": f"duplicate {what} {value!r}"})
+            seen.add(value)
+
+    check_languages(["body"], topic.translations)
+    check_unique(["body", "levels"], [level.slug for level in topic.levels], "level slug")
+    check_unique(["body", "levels"], [level.position for level in topic.levels], "level position")
+    for i, level in enumerate(topic.levels):
+        check_languages(["body", "levels", i], level.translations)
+        check_unique(["body", "levels", i, "exercises"], [e.position for e in level.exercises], "exercise position")
+        for j, exercise in enumerate(level.exercises):
+            check_languages(["body", "levels", i, "exercises", j], exercise.translations)
+
+    total = count_items(topic)
+    if total > settings.IMPORT_MAX_ITEMS:
+        errors.append({"loc": ["body"], "msg": f"{total} items exceeds the import limit of {settings.IMPORT_MAX_ITEMS}"})
+    return errors
+
+
+def build_import_items(topic: TopicImport, user_id: str) -> tuple:
+    """(all items to write, generated ids) for an import document"""
+    now = datetime.utcnow().isoformat() + 'Z'
+    topic_id = str(uuid.uuid4())
+    item, translations = build_topic_items(topic_id, topic, user_id, now)
+    items = [item, *translations]
+    ids = {"topic_id": topic_id, "levels": []}
+
+    for level in topic.levels:
+        level_id = str(uuid.uuid4())
+        item, translations = build_level_items(level_id, topic_id, level, user_id, now)
+        items += [item, *translations]
+        exercise_ids = []
+        for exercise in level.exercises:
+            exercise_id = str(uuid.uuid4())
+            item, translations = build_exercise_items(exercise_id, level_id, exercise, user_id, now)
+            items += [item, *translations]
+            exercise_ids.append(exercise_id)
+        ids["levels"].append({"level_id": level_id, "slug": level.slug, "exercise_ids": exercise_ids})
+    return items, ids
+
+
+def write_import(table, items: List[dict]) -> str:
+    """
+    Write every item: one transaction when it fits (all or nothing),
+    otherwise parallel batches, deleting what was written if any batch fails.
+    """
+    if len(items) <= TRANSACTION_LIMIT:
+        transact_put(table, items)
+        return "transaction"
+    try:
+        batch_put(table, items, workers=settings.BULK_WRITE_WORKERS)
+    except Exception:
+        try:
+            batch_delete(table, items, workers=settings.BULK_WRITE_WORKERS)
+        except Exception as cleanup_error:
+            print(f"Warning: Import cleanup failed, partial content may remain: {cleanup_error}")
+        raise
+    return "batch"
+
+
+@router.post("/import", status_code=status.HTTP_201_CREATED)
+async def import_topic(
+    topic: TopicImport,
+    dry_run: bool = Query(False, description="Validate only, write nothing"),
+    current_user: dict = Depends(get_current_admin)
+):
+    """
+    Import a whole topic (levels, exercises and all translations) in one call (admin only).
+    The document is validated before anything is written; returns the generated IDs.
+    """
+    errors = validate_import(topic)
+    if errors:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=errors)
+
+    try:
+        started = time.perf_counter()
+        items, ids = build_import_items(topic, current_user['user_id'])
+        mode = "dry_run"
+        if not dry_run:
+            table = get_dynamodb_table()
+            mode = await run_in_threadpool(write_import, table, items)
+            content_cache.invalidate()
+
+        return {
+            **ids,
+            "items_total": len(items),
+            "items_written": 0 if dry_run else len(items),
+            "mode": mode,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/jobs/{job_id}")
+async def get_job_status(
+    job_id: str,
+    advance: bool = Query(True, description="Run the next step of an unfinished job before reporting it"),
+    current_user: dict = Depends(get_current_admin)
+):
+    """
+    Status and progress of a job such as a topic cascade delete (admin only).
+    Each poll advances an unfinished topic delete by one step; a job whose
+    heartbeat stopped (nobody polling, or a step cut short) is reported as stale.
+    """
+    try:
+        job = await run_in_threadpool(get_job, job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        if advance and job.get('kind') == 'topic_delete':
+            job = await run_in_threadpool(advance_topic_delete, job, settings.CASCADE_JOB_STEP_SECONDS)
+            if job['status'] == 'completed':
+                content_cache.invalidate()
+        job = await run_in_threadpool(mark_stale, job)
+        return {k: v for k, v in job.items() if k not in ('PK', 'SK', 'ttl')}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,24 +1,35 @@
 """Authentication endpoints - Register, Login, Token"""
 from fastapi import APIRouter, HTTPException, Depends, status, Query
+from fastapi.security import HTTPAuthorizationCredentials
 from pydantic import BaseModel, EmailStr
 from typing import Optional
-import boto3
 from boto3.dynamodb.conditions import Key
-import os
 import uuid
+import time
 from datetime import datetime
 from app.core.auth import (
-    hash_password, 
-    verify_password, 
+    hash_password_async,
+    verify_password_async,
+    password_needs_rehash,
+    password_pool,
     create_access_token,
+    create_refresh_token,
+    refresh_token_key,
+    revoke_access_token,
     get_current_user,
     get_current_admin,
     MIN_PASSWORD_LENGTH,
-    MAX_PASSWORD_LENGTH
+    MAX_PASSWORD_LENGTH,
+    optional_security,
+    security,
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    REFRESH_TOKEN_EXPIRE_DAYS
 )
 from pydantic import validator
+from app.core.database import get_dynamodb_table
+from app.core.responses import FastJSONRoute
 
-router = APIRouter(prefix="/auth", tags=["authentication"])
+router = APIRouter(prefix="/auth", tags=["authentication"], route_class=FastJSONRoute)
 
 # Pydantic models
 class UserRegister(BaseModel):
@@ -44,19 +55,19 @@ class UserLogin(BaseModel):
 
 class TokenResponse(BaseModel):
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str = "bearer"
+    expires_in: int = ACCESS_TOKEN_EXPIRE_MINUTES * 60
     user: dict
 
-def get_dynamodb_table():
-    """Get DynamoDB table"""
-    dynamodb = boto3.resource(
-        'dynamodb',
-        endpoint_url=os.getenv('DYNAMO_ENDPOINT_URL', 'http://localhost:4566'),
-        region_name=os.getenv('AWS_REGION', 'us-east-1'),
-        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID', 'test'),
-        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY', 'test')
-    )
-    return dynamodb.Table('aplicacion-senas-content')
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+class RefreshResponse(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int = ACCESS_TOKEN_EXPIRE_MINUTES * 60
 
 def normalize_email(email: str) -> str:
     """
@@ -94,6 +105,36 @@ def check_email_exists(table, email: str) -> bool:
         # In case of error, assume email doesn't exist (fail-open for development)
         return False
 
+def issue_refresh_token(table, user_id: str, email: str, role: str) -> str:
+    """
+    Create and store a new refresh token.
+    The stored item is compact (claims needed to mint access tokens plus a
+    `ttl` epoch) so DynamoDB TTL removes it once it expires.
+    """
+    refresh_token = create_refresh_token(user_id)
+    item = {
+        **refresh_token_key(refresh_token),
+        'entity_type': 'refresh_token',
+        'user_id': user_id,
+        'email': email,
+        'role': role,
+        'ttl': int(time.time()) + REFRESH_TOKEN_EXPIRE_DAYS * 86400
+    }
+    table.put_item(Item=item)
+    return refresh_token
+
+def revoke_user_refresh_tokens(table, user_id: str) -> int:
+    """Revoke every refresh token of a user. Returns the number revoked."""
+    response = table.query(
+        KeyConditionExpression=Key('PK').eq(f'USER#{user_id}') & Key('SK').begins_with('REFRESH#'),
+        ProjectionExpression='PK, SK'
+    )
+    items = response.get('Items', [])
+    with table.batch_writer() as batch:
+        for item in items:
+            batch.delete_item(Key={'PK': item['PK'], 'SK': item['SK']})
+    return len(items)
+
 @router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
 async def register(user_data: UserRegister):
     """
@@ -117,7 +158,7 @@ async def register(user_data: UserRegister):
         # Create new user
         user_id = str(uuid.uuid4())
         now = datetime.utcnow().isoformat() + 'Z'
-        hashed_pw = hash_password(user_data.password)
+        hashed_pw = await hash_password_async(user_data.password)
         
         user_item = {
             'PK': f'USER#{user_id}',
@@ -143,12 +184,14 @@ async def register(user_data: UserRegister):
             "role": "user"  # Always 'user' for new registrations
         }
         access_token = create_access_token(token_data)
+        refresh_token = issue_refresh_token(table, user_id, normalized_email, "user")
         
         # Return user without password
         user_response = {k: v for k, v in user_item.items() if k != 'password_hash'}
         
         return {
             "access_token": access_token,
+            "refresh_token": refresh_token,
             "token_type": "bearer",
             "user": user_response
         }
@@ -192,8 +235,8 @@ async def login(credentials: UserLogin):
         
         user = items[0]
         
-        # Verify password
-        if not verify_password(credentials.password, user.get('password_hash', '')):
+        # Verify password (bcrypt runs on the worker pool, not the event loop)
+        if not await verify_password_async(credentials.password, user.get('password_hash', '')):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password"
@@ -206,6 +249,18 @@ async def login(credentials: UserLogin):
                 detail="Account is inactive"
             )
         
+        # Transparently upgrade the hash when the configured bcrypt cost changed
+        if password_needs_rehash(user.get('password_hash', '')):
+            try:
+                new_hash = await hash_password_async(credentials.password)
+                table.update_item(
+                    Key={'PK': user['PK'], 'SK': user['SK']},
+                    UpdateExpression='SET password_hash = :h',
+                    ExpressionAttributeValues={':h': new_hash}
+                )
+            except Exception as e:
+                print(f"Warning: Password rehash failed for user {user.get('user_id')}: {e}")
+        
         # Generate token
         token_data = {
             "sub": user['user_id'],
@@ -213,12 +268,14 @@ async def login(credentials: UserLogin):
             "role": user.get('role', 'user')
         }
         access_token = create_access_token(token_data)
+        refresh_token = issue_refresh_token(table, user['user_id'], user['email'], user.get('role', 'user'))
         
         # Return user without password
         user_response = {k: v for k, v in user.items() if k != 'password_hash'}
         
         return {
             "access_token": access_token,
+            "refresh_token": refresh_token,
             "token_type": "bearer",
             "user": user_response
         }
@@ -228,6 +285,118 @@ async def login(credentials: UserLogin):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/refresh", response_model=RefreshResponse)
+async def refresh_access_token(
+    request: RefreshRequest,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+):
+    """
+    Exchange a refresh token for a new access token and a new refresh token.
+    The presented refresh token is consumed (rotation): it is atomically
+    deleted and returned in one keyed DynamoDB call, so it can be used once.
+    The user is re-read with one keyed get (no password hashing): inactive or
+    deleted accounts cannot refresh, and the new tokens carry the current
+    email and role. A still-valid access token sent as bearer is revoked,
+    since it is being replaced.
+    """
+    try:
+        table = get_dynamodb_table()
+        key = refresh_token_key(request.refresh_token)
+        
+        try:
+            response = table.delete_item(
+                Key=key,
+                ConditionExpression='attribute_exists(PK)',
+                ReturnValues='ALL_OLD'
+            )
+        except table.meta.client.exceptions.ConditionalCheckFailedException:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired refresh token"
+            )
+        
+        stored = response.get('Attributes', {})
+        # DynamoDB TTL deletion is lazy, so expiry is also enforced here
+        if int(stored.get('ttl', 0)) <= int(time.time()):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired refresh token"
+            )
+        
+        if credentials is not None:
+            await revoke_access_token(credentials.credentials)
+        
+        user = table.get_item(
+            Key={'PK': f'USER#{stored["user_id"]}', 'SK': 'METADATA'},
+            ProjectionExpression='email, #r, is_active',
+            ExpressionAttributeNames={'#r': 'role'}
+        ).get('Item')
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired refresh token"
+            )
+        if not user.get('is_active', False):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Account is inactive"
+            )
+        
+        token_data = {
+            "sub": stored['user_id'],
+            "email": user.get('email'),
+            "role": user.get('role', 'user')
+        }
+        return {
+            "access_token": create_access_token(token_data),
+            "refresh_token": issue_refresh_token(
+                table, stored['user_id'], user.get('email'), user.get('role', 'user')
+            ),
+            "token_type": "bearer"
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    request: RefreshRequest,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+):
+    """
+    Revoke a refresh token.
+    If the request carries a bearer access token, it is revoked as well.
+    """
+    try:
+        table = get_dynamodb_table()
+        table.delete_item(Key=refresh_token_key(request.refresh_token))
+        if credentials is not None:
+            await revoke_access_token(credentials.credentials)
+        return None
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/logout-all")
+async def logout_all_sessions(
+    current_user: dict = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    """
+    Revoke every refresh token of the current user (sign out everywhere),
+    plus the access token used for this request.
+    """
+    try:
+        table = get_dynamodb_table()
+        revoked = revoke_user_refresh_tokens(table, current_user['user_id'])
+        await revoke_access_token(credentials.credentials)
+        return {"revoked_refresh_tokens": revoked}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/me")
 async def get_current_user_info(current_user: dict = Depends(get_current_user)):
     """
@@ -253,6 +422,13 @@ async def get_current_user_info(current_user: dict = Depends(get_current_user)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/password-hasher/stats", dependencies=[Depends(get_current_admin)])
+async def get_password_hasher_stats():
+    """
+    Queueing metrics for the bcrypt worker pool (admin only).
+    """
+    return password_pool.stats()
+
 @router.get("/users")
 async def list_all_users():
     """
@@ -328,6 +504,9 @@ async def update_user_role(
         
         table.put_item(Item=user_item)
         
+        # Refresh tokens carry the role; force a fresh login with the new one
+        revoke_user_refresh_tokens(table, user_id)
+        
         # Return updated user (without password)
         clean_user = {k: v for k, v in user_item.items() if k != 'password_hash'}
         
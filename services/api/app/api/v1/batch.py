@@ -0,0 +1,132 @@
+"""Batch endpoint - many GET reads in one round-trip"""
+from fastapi import APIRouter, HTTPException, Request, Depends, status
+from fastapi.security import HTTPAuthorizationCredentials
+from pydantic import BaseModel
+from typing import Optional, List
+from urllib.parse import parse_qsl, urlencode, urlsplit
+import asyncio
+import json
+from app.core.auth import get_current_user, optional_security
+from app.core.config import settings
+from app.core.responses import FastJSONRoute
+
+router = APIRouter(prefix="/batch", tags=["batch"], route_class=FastJSONRoute)
+
+# Pydantic models
+class BatchSubRequest(BaseModel):
+    id: Optional[str] = None
+    method: str = "GET"
+    path: str  # e.g. /v1/levels/topic/abc?language=es
+
+class BatchRequest(BaseModel):
+    requests: List[BatchSubRequest]
+
+
+def normalize_path(path: str) -> tuple:
+    """(path, query) with sorted query parameters, so identical reads share one execution"""
+    parts = urlsplit(path)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return parts.path, query
+
+
+def validate_sub_request(sub: BatchSubRequest) -> Optional[str]:
+    """Error message for sub-requests the batch endpoint does not run"""
+    if sub.method.upper() != "GET":
+        return "Only GET sub-requests are supported"
+    path = urlsplit(sub.path).path
+    if not path.startswith("/v1/") or path == "/v1/batch" or path.startswith("/v1/batch/"):
+        return "Sub-request path must be a /v1 route other than /v1/batch"
+    return None
+
+
+async def dispatch(request: Request, path: str, query: str) -> tuple:
+    """Run GET path?query through the application in-process; returns (status, body)"""
+    headers = [(b"accept", b"application/json")]
+    authorization = request.headers.get("authorization")
+    if authorization:
+        headers.append((b"authorization", authorization.encode("latin-1")))
+    scope = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": request.scope.get("http_version", "1.1"),
+        "method": "GET",
+        "scheme": request.scope.get("scheme", "https"),
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "root_path": request.scope.get("root_path", ""),
+        "query_string": query.encode("utf-8"),
+        "headers": headers,
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+    }
+    response = {"status": 500, "body": b""}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+
+    await request.app(scope, receive, send)
+    body = response["body"]
+    try:
+        return response["status"], json.loads(body) if body else None
+    except ValueError:
+        return response["status"], body.decode("utf-8", errors="replace")
+
+
+@router.post("")
+async def run_batch(
+    batch: BatchRequest,
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+):
+    """
+    Run up to BATCH_MAX_REQUESTS GET sub-requests concurrently in-process.
+    The bearer token is checked once here (sub-requests then hit the verified
+    token cache) and identical sub-requests are executed only once.
+    Each result carries its own status code.
+    """
+    if len(batch.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BATCH_MAX_REQUESTS} sub-requests per batch"
+        )
+    if credentials is not None:
+        await get_current_user(credentials)
+
+    try:
+        results = [None] * len(batch.requests)
+        pending = {}
+        for index, sub in enumerate(batch.requests):
+            error = validate_sub_request(sub)
+            if error:
+                results[index] = (status.HTTP_400_BAD_REQUEST, {"detail": error})
+            else:
+                pending.setdefault(normalize_path(sub.path), []).append(index)
+
+        keys = list(pending)
+        outcomes = await asyncio.gather(
+            *(dispatch(request, path, query) for path, query in keys), return_exceptions=True
+        )
+        for key, outcome in zip(keys, outcomes):
+            if isinstance(outcome, Exception):
+                outcome = (status.HTTP_500_INTERNAL_SERVER_ERROR, {"detail": str(outcome)})
+            for index in pending[key]:
+                results[index] = outcome
+
+        return {
+            "responses": [
+                {"id": sub.id if sub.id is not None else str(index), "status": code, "body": body}
+                for index, (sub, (code, body)) in enumerate(zip(batch.requests, results))
+            ],
+            "total": len(results),
+            "executed": len(keys)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -4,14 +4,18 @@ from pydantic import BaseModel
 from typing import Optional, Dict, List, Any
 from enum import Enum
 from decimal import Decimal
-import boto3
-from boto3.dynamodb.conditions import Key
-import os
 import uuid
 from datetime import datetime
-from app.core.auth import get_current_admin
+from fastapi.concurrency import run_in_threadpool
+from app.core.auth import get_current_admin, get_current_user
+from app.core.content_cache import content_cache
+from app.core.database import get_dynamodb_table
+from app.core.ordering import MAX_PAGE_SIZE, apply_order_keys, decode_cursor, encode_cursor, exercises_list_key, order_key_changes, query_ordered
+from app.core.projection import FIELDS_DESCRIPTION, parse_fields, projection, trim
+from app.core.responses import FastJSONRoute
+# Grading, scoring and write-path modules load inside their handlers; loading this router for a GET never imports them
 
-router = APIRouter(prefix="/exercises", tags=["exercises"])
+router = APIRouter(prefix="/exercises", tags=["exercises"], route_class=FastJSONRoute)
 
 # Helper function to convert floats to Decimal for DynamoDB
 def convert_floats_to_decimal(obj: Any) -> Any:
@@ -55,30 +59,78 @@ class ExerciseUpdate(BaseModel):
     position: Optional[int] = None
     config: Optional[ExerciseConfig] = None
     answer_schema: Optional[Dict] = None
+    version: Optional[int] = None  # Version the edit is based on (409 if it changed since)
 
-def get_dynamodb_table():
-    dynamodb = boto3.resource(
-        'dynamodb',
-        endpoint_url=os.getenv('DYNAMO_ENDPOINT_URL', 'http://localhost:4566'),
-        region_name=os.getenv('AWS_REGION', 'us-east-1'),
-        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID', 'test'),
-        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY', 'test')
-    )
-    return dynamodb.Table('aplicacion-senas-content')
+class GradeRequest(BaseModel):
+    answer: Any  # MCQ: a choice (or list); COPY_PRACTICE: {"sign", "confidence"} and/or {"completed"}; CAMERA_PRODUCE: {"frames"}
+
+class SignLandmarks(BaseModel):
+    frames: List[List[List[float]]]  # frames x keypoints x (x, y, z)
+
+def build_exercise_items(exercise_id: str, level_id: str, exercise_data, user_id: str, now: str) -> tuple:
+    """(exercise item, translation items) for a new exercise of level_id"""
+    item = {
+        'PK': f'LEVEL#{level_id}',
+        'SK': f'EXERCISE#{exercise_id}',
+        'entity_type': 'exercise',
+        'exercise_id': exercise_id,
+        'level_id': level_id,
+        'exercise_type': exercise_data.exercise_type.value,
+        'position': str(exercise_data.position),
+        'created_at': now,
+        'updated_at': now,
+        'created_by': user_id
+    }
+    
+    if exercise_data.config:
+        item['config'] = convert_floats_to_decimal(exercise_data.config.dict(exclude_none=True))
+    if exercise_data.answer_schema:
+        item['answer_schema'] = convert_floats_to_decimal(exercise_data.answer_schema)
+    apply_order_keys(item)
+    item['version'] = 1
+    
+    translations = []
+    for lang_code, translation in (exercise_data.translations or {}).items():
+        trans_item = {
+            'PK': f'EXERCISE#{exercise_id}',
+            'SK': f'LANG#{lang_code}',
+            'entity_type': 'exercise_translation',
+            'exercise_id': exercise_id,
+            'language_code': lang_code,
+            'prompt_text': translation.prompt_text,
+        }
+        if translation.choice_texts:
+            trans_item['choice_texts'] = translation.choice_texts
+        if translation.feedback_text:
+            trans_item['feedback_text'] = translation.feedback_text
+        translations.append(trans_item)
+    return item, translations
+
+def _level_archived(table, level_id: str) -> bool:
+    """Whether the level is being deleted with its topic (marker written by app.core.cascade.archive_topic)"""
+    return 'Item' in table.get_item(Key={'PK': f'LEVEL#{level_id}', 'SK': 'ARCHIVED'}, ProjectionExpression='PK')
 
 # PUBLIC ENDPOINTS
 @router.get("/level/{level_id}")
 async def list_exercises_by_level(
     level_id: str,
-    language: Optional[str] = Query(None)
+    language: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page")
 ):
-    """List all exercises for a level (public)"""
-    try:
+    """List the exercises of a level in display order (public, paged with limit/cursor)"""
+    selected = parse_fields(fields)
+    start_key = decode_cursor(cursor, exercises_list_key(level_id))
+
+    def load():
         table = get_dynamodb_table()
-        response = table.query(
-            KeyConditionExpression=Key('PK').eq(f'LEVEL#{level_id}') & Key('SK').begins_with('EXERCISE#')
+        if _level_archived(table, level_id):
+            return {"exercises": [], "total": 0, "next_cursor": None}
+        exercises, last_key = query_ordered(
+            table, exercises_list_key(level_id), limit=limit, start_key=start_key,
+            **projection(selected, required=('exercise_id',))
         )
-        exercises = response.get('Items', [])
         
         # Load translations
         if language:
@@ -91,8 +143,11 @@ async def list_exercises_by_level(
                     if trans_resp.get('Item'):
                         exercise['translation'] = trans_resp['Item']
         
-        exercises.sort(key=lambda x: int(x.get('position', 999)))
-        return {"exercises": exercises, "total": len(exercises)}
+        exercises = [trim(e, selected) for e in exercises]
+        return {"exercises": exercises, "total": len(exercises), "next_cursor": encode_cursor(last_key)}
+    
+    try:
+        return await content_cache.get_or_load_async(("exercises", level_id, language, selected, limit, cursor), load)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -100,16 +155,20 @@ async def list_exercises_by_level(
 async def get_exercise(
     exercise_id: str,
     level_id: str = Query(..., description="Parent level ID"),
-    language: Optional[str] = Query(None)
+    language: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
 ):
     """Get exercise by ID (public)"""
-    try:
+    selected = parse_fields(fields)
+
+    def load():
         table = get_dynamodb_table()
         response = table.get_item(
-            Key={'PK': f'LEVEL#{level_id}', 'SK': f'EXERCISE#{exercise_id}'}
+            Key={'PK': f'LEVEL#{level_id}', 'SK': f'EXERCISE#{exercise_id}'},
+            **projection(selected, required=('PK',))
         )
         item = response.get('Item')
-        if not item:
+        if not item or _level_archived(table, level_id):
             raise HTTPException(status_code=404, detail="Exercise not found")
         
         if language:
@@ -119,13 +178,80 @@ async def get_exercise(
             if trans_resp.get('Item'):
                 item['translation'] = trans_resp['Item']
         
-        return item
+        return trim(item, selected)
+    
+    try:
+        return await content_cache.get_or_load_async(("exercise", level_id, exercise_id, language, selected), load)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # ADMIN ENDPOINTS
+@router.post("/{exercise_id}/grade")
+async def grade_exercise(
+    exercise_id: str,
+    level_id: str,
+    grade_request: GradeRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Grade an answer against the exercise's answer_schema and scoring_rules.
+    Returns correct, points, max_points, score (0-100) and status; nothing is stored
+    (send the answer with /progress/submit to record it). CAMERA_PRODUCE answers are
+    hand landmarks, scored on the server like /score-sign.
+    """
+    from app.core.grading import GradingError, grade_answer
+
+    try:
+        result = await grade_answer(level_id, exercise_id, grade_request.answer)
+        if result is None:
+            raise HTTPException(status_code=404, detail="Exercise not found")
+        return result
+    except GradingError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/{exercise_id}/score-sign")
+async def score_sign(
+    exercise_id: str,
+    level_id: str,
+    landmarks_data: SignLandmarks,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Score a produced sign (CAMERA_PRODUCE): compare the client's hand-landmark sequence
+    with the exercise's reference templates. Returns similarity (0-1) and passed
+    (similarity >= config.required_confidence). Concurrent requests are scored
+    together in micro-batches.
+    """
+    from app.core.grading import GradingError, load_exercise, score_produced_sign
+
+    try:
+        exercise = await run_in_threadpool(load_exercise, level_id, exercise_id)
+        if exercise is None:
+            raise HTTPException(status_code=404, detail="Exercise not found")
+        return await score_produced_sign(exercise, landmarks_data.frames)
+    except GradingError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/score-sign/stats", dependencies=[Depends(get_current_admin)])
+async def get_score_sign_stats():
+    """
+    Queue depth and batch-size metrics for sign scoring micro-batches (admin only).
+    """
+    from app.core import landmarks
+    from app.core.microbatch import sign_batcher
+
+    return {**sign_batcher.stats(), "templates": landmarks.template_cache.stats()}
+
 @router.post("", status_code=status.HTTP_201_CREATED)
 async def create_exercise(
     exercise_data: ExerciseCreate,
@@ -137,46 +263,18 @@ async def create_exercise(
         
         exercise_id = str(uuid.uuid4())
         now = datetime.utcnow().isoformat() + 'Z'
-        
-        # Main exercise item
-        item = {
-            'PK': f'LEVEL#{exercise_data.level_id}',
-            'SK': f'EXERCISE#{exercise_id}',
-            'entity_type': 'exercise',
-            'exercise_id': exercise_id,
-            'level_id': exercise_data.level_id,
-            'exercise_type': exercise_data.exercise_type.value,
-            'position': str(exercise_data.position),
-            'created_at': now,
-            'updated_at': now,
-            'created_by': current_user['user_id']
-        }
-        
-        if exercise_data.config:
-            item['config'] = convert_floats_to_decimal(exercise_data.config.dict(exclude_none=True))
-        if exercise_data.answer_schema:
-            item['answer_schema'] = convert_floats_to_decimal(exercise_data.answer_schema)
+        item, translations = build_exercise_items(
+            exercise_id, exercise_data.level_id, exercise_data, current_user['user_id'], now
+        )
         
         table.put_item(Item=item)
         
-        # Add translations
-        if exercise_data.translations:
-            for lang_code, translation in exercise_data.translations.items():
-                trans_item = {
-                    'PK': f'EXERCISE#{exercise_id}',
-                    'SK': f'LANG#{lang_code}',
-                    'entity_type': 'exercise_translation',
-                    'exercise_id': exercise_id,
-                    'language_code': lang_code,
-                    'prompt_text': translation.prompt_text,
-                }
-                if translation.choice_texts:
-                    trans_item['choice_texts'] = translation.choice_texts
-                if translation.feedback_text:
-                    trans_item['feedback_text'] = translation.feedback_text
-                
-                table.put_item(Item=trans_item)
+        # Add translations (batched: one request per 25 items)
+        with table.batch_writer() as batch:
+            for trans_item in translations:
+                batch.put_item(Item=trans_item)
         
+        content_cache.invalidate()
         return item
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -188,29 +286,41 @@ async def update_exercise(
     exercise_data: ExerciseUpdate,
     current_user: dict = Depends(get_current_admin)
 ):
-    """Update exercise (admin only)"""
+    """
+    Update only the provided fields of an exercise (admin only).
+    Pass the version the edit is based on to get 409 instead of overwriting a concurrent edit.
+    """
+    from app.core import landmarks
+    from app.core.grading import validator_cache
+    from app.core.partial_update import update_item
+
     try:
         table = get_dynamodb_table()
         
-        response = table.get_item(
-            Key={'PK': f'LEVEL#{level_id}', 'SK': f'EXERCISE#{exercise_id}'}
-        )
-        item = response.get('Item')
-        if not item:
-            raise HTTPException(status_code=404, detail="Exercise not found")
-        
-        # Update fields
+        changes = {}
         if exercise_data.position is not None:
-            item['position'] = str(exercise_data.position)
+            changes['position'] = str(exercise_data.position)
         if exercise_data.config is not None:
-            item['config'] = convert_floats_to_decimal(exercise_data.config.dict(exclude_none=True))
+            changes['config'] = convert_floats_to_decimal(exercise_data.config.dict(exclude_none=True))
         if exercise_data.answer_schema is not None:
-            item['answer_schema'] = convert_floats_to_decimal(exercise_data.answer_schema)
-        
-        item['updated_at'] = datetime.utcnow().isoformat() + 'Z'
-        item['updated_by'] = current_user['user_id']
+            changes['answer_schema'] = convert_floats_to_decimal(exercise_data.answer_schema)
+        # A position change moves the exercise within the ordering index
+        index_set, index_remove = order_key_changes(
+            {'entity_type': 'exercise', 'level_id': level_id, 'exercise_id': exercise_id, **changes}, set(changes)
+        )
         
-        table.put_item(Item=item)
+        item = update_item(
+            table,
+            {'PK': f'LEVEL#{level_id}', 'SK': f'EXERCISE#{exercise_id}'},
+            {**changes, **index_set},
+            current_user['user_id'],
+            expected_version=exercise_data.version,
+            remove=index_remove,
+            entity="Exercise"
+        )
+        validator_cache.invalidate(exercise_id)
+        landmarks.template_cache.invalidate(exercise_id)
+        content_cache.invalidate()
         return item
     except HTTPException:
         raise
@@ -223,10 +333,18 @@ async def delete_exercise(
     level_id: str,
     current_user: dict = Depends(get_current_admin)
 ):
-    """Delete exercise (admin only)"""
+    """Delete exercise with its translations (admin only)"""
+    from app.core import landmarks
+    from app.core.cascade import exercise_subtree, purge
+    from app.core.grading import validator_cache
+
     try:
         table = get_dynamodb_table()
-        table.delete_item(Key={'PK': f'LEVEL#{level_id}', 'SK': f'EXERCISE#{exercise_id}'})
+        keys = await run_in_threadpool(exercise_subtree, table, exercise_id, level_id)
+        await run_in_threadpool(purge, table, keys)
+        validator_cache.invalidate(exercise_id)
+        landmarks.template_cache.invalidate(exercise_id)
+        content_cache.invalidate()
         return None
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
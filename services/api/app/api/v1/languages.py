@@ -1,50 +1,55 @@
 """Languages API endpoints"""
-from fastapi import APIRouter, HTTPException
-import boto3
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
 from boto3.dynamodb.conditions import Key
-import os
+from app.core.config import settings
+from app.core.content_cache import content_cache
+from app.core.database import get_dynamodb_table
+from app.core.projection import FIELDS_DESCRIPTION, parse_fields, projection, trim
+from app.core.responses import FastJSONRoute
 
-router = APIRouter(prefix="/languages", tags=["languages"])
-
-def get_dynamodb_table():
-    """Get DynamoDB table"""
-    dynamodb = boto3.resource(
-        'dynamodb',
-        endpoint_url=os.getenv('DYNAMO_ENDPOINT_URL', 'http://localhost:4566'),
-        region_name=os.getenv('AWS_REGION', 'us-east-1'),
-        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID', 'test'),
-        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY', 'test')
-    )
-    return dynamodb.Table('aplicacion-senas-content')
+router = APIRouter(prefix="/languages", tags=["languages"], route_class=FastJSONRoute)
 
 @router.get("")
-async def list_languages():
+async def list_languages(fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)):
     """Get all languages"""
-    try:
+    selected = parse_fields(fields)
+
+    def load():
         table = get_dynamodb_table()
         response = table.query(
-            IndexName='entity_type-created_at-index',
-            KeyConditionExpression=Key('entity_type').eq('language')
+            IndexName=settings.ENTITY_TYPE_INDEX,
+            KeyConditionExpression=Key('entity_type').eq('language'),
+            **projection(selected)
         )
         return {
             "languages": response.get('Items', []),
             "total": len(response.get('Items', []))
         }
+    
+    try:
+        return await content_cache.get_or_load_async(("languages", selected), load)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{code}")
-async def get_language(code: str):
+async def get_language(code: str, fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)):
     """Get language by code"""
-    try:
+    selected = parse_fields(fields)
+
+    def load():
         table = get_dynamodb_table()
         response = table.get_item(
-            Key={'PK': f'LANG#{code}', 'SK': 'METADATA'}
+            Key={'PK': f'LANG#{code}', 'SK': 'METADATA'},
+            **projection(selected, required=('PK',))
         )
         item = response.get('Item')
         if not item:
             raise HTTPException(status_code=404, detail="Language not found")
-        return item
+        return trim(item, selected)
+    
+    try:
+        return await content_cache.get_or_load_async(("language", code, selected), load)
     except HTTPException:
         raise
     except Exception as e:
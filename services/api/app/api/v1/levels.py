@@ -2,14 +2,18 @@
 from fastapi import APIRouter, HTTPException, Query, Depends, status
 from pydantic import BaseModel
 from typing import Optional, Dict
-import boto3
-from boto3.dynamodb.conditions import Key
-import os
 import uuid
 from datetime import datetime
-from app.core.auth import get_current_admin
+from fastapi.concurrency import run_in_threadpool
+from app.core.auth import get_current_admin, get_optional_user, require_draft_access
+from app.core.content_cache import content_cache
+from app.core.database import get_dynamodb_table
+from app.core.ordering import MAX_PAGE_SIZE, apply_order_keys, decode_cursor, encode_cursor, levels_list_key, order_key_changes, query_ordered
+from app.core.projection import FIELDS_DESCRIPTION, parse_fields, projection, trim
+from app.core.responses import FastJSONRoute
+# partial_update and cascade are imported by the write handlers that use them (see scripts/check_content_imports.py)
 
-router = APIRouter(prefix="/levels", tags=["levels"])
+router = APIRouter(prefix="/levels", tags=["levels"], route_class=FastJSONRoute)
 
 # Pydantic models
 class LevelMetadata(BaseModel):
@@ -37,35 +41,76 @@ class LevelUpdate(BaseModel):
     difficulty: Optional[int] = None
     metadata: Optional[LevelMetadata] = None
     is_published: Optional[bool] = None
+    version: Optional[int] = None  # Version the edit is based on (409 if it changed since)
 
-def get_dynamodb_table():
-    dynamodb = boto3.resource(
-        'dynamodb',
-        endpoint_url=os.getenv('DYNAMO_ENDPOINT_URL', 'http://localhost:4566'),
-        region_name=os.getenv('AWS_REGION', 'us-east-1'),
-        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID', 'test'),
-        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY', 'test')
-    )
-    return dynamodb.Table('aplicacion-senas-content')
+def build_level_items(level_id: str, topic_id: str, level_data, user_id: str, now: str) -> tuple:
+    """(level item, translation items) for a new level of topic_id"""
+    item = {
+        'PK': f'TOPIC#{topic_id}',
+        'SK': f'LEVEL#{level_id}',
+        'entity_type': 'level',
+        'level_id': level_id,
+        'topic_id': topic_id,
+        'slug': level_data.slug,
+        'position': str(level_data.position),
+        'difficulty': str(level_data.difficulty),
+        'is_published': level_data.is_published,
+        'created_at': now,
+        'updated_at': now,
+        'created_by': user_id
+    }
+    
+    if level_data.metadata:
+        item['metadata'] = level_data.metadata.dict()
+    apply_order_keys(item)
+    item['version'] = 1
+    
+    translations = []
+    for lang_code, translation in (level_data.translations or {}).items():
+        trans_item = {
+            'PK': f'LEVEL#{level_id}',
+            'SK': f'LANG#{lang_code}',
+            'entity_type': 'level_translation',
+            'level_id': level_id,
+            'language_code': lang_code,
+            'title': translation.title,
+        }
+        if translation.description:
+            trans_item['description'] = translation.description
+        if translation.hint:
+            trans_item['hint'] = translation.hint
+        translations.append(trans_item)
+    return item, translations
 
 # PUBLIC ENDPOINTS
 @router.get("/topic/{topic_id}")
 async def list_levels_by_topic(
     topic_id: str, 
     language: Optional[str] = Query(None),
-    published_only: bool = True
+    published_only: bool = True,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    current_user: Optional[dict] = Depends(get_optional_user)
 ):
-    """List all levels for a topic (public)"""
-    try:
+    """List the levels of a topic in display order (public, paged with limit/cursor)"""
+    require_draft_access(published_only, current_user)
+    selected = parse_fields(fields)
+    start_key = decode_cursor(cursor, levels_list_key(topic_id), published_only)
+
+    def load():
         table = get_dynamodb_table()
-        response = table.query(
-            IndexName='topic_id-SK-index',
-            KeyConditionExpression=Key('topic_id').eq(topic_id) & Key('SK').begins_with('LEVEL#')
+        # Levels of an archived topic (being deleted, see app.core.cascade) are hidden
+        topic = table.get_item(
+            Key={'PK': f'TOPIC#{topic_id}', 'SK': 'METADATA'}, ProjectionExpression='archived_at'
+        ).get('Item')
+        if topic and 'archived_at' in topic:
+            return {"levels": [], "total": 0, "next_cursor": None}
+        levels, last_key = query_ordered(
+            table, levels_list_key(topic_id), limit=limit, start_key=start_key,
+            published_only=published_only,
+            **projection(selected, required=('level_id',))
         )
-        levels = response.get('Items', [])
-        
-        if published_only:
-            levels = [l for l in levels if l.get('is_published', False)]
         
         # Load translations
         if language:
@@ -78,8 +123,13 @@ async def list_levels_by_topic(
                     if trans_resp.get('Item'):
                         level['translation'] = trans_resp['Item']
         
-        levels.sort(key=lambda x: int(x.get('position', 999)))
-        return {"levels": levels, "total": len(levels)}
+        levels = [trim(l, selected) for l in levels]
+        return {"levels": levels, "total": len(levels), "next_cursor": encode_cursor(last_key)}
+    
+    try:
+        return await content_cache.get_or_load_async(
+            ("levels", topic_id, language, published_only, selected, limit, cursor), load
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -87,16 +137,21 @@ async def list_levels_by_topic(
 async def get_level(
     level_id: str,
     topic_id: str = Query(..., description="Parent topic ID"),
-    language: Optional[str] = Query(None)
+    language: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
 ):
     """Get level by ID (public)"""
-    try:
+    selected = parse_fields(fields)
+
+    def load():
         table = get_dynamodb_table()
         response = table.get_item(
-            Key={'PK': f'TOPIC#{topic_id}', 'SK': f'LEVEL#{level_id}'}
+            Key={'PK': f'TOPIC#{topic_id}', 'SK': f'LEVEL#{level_id}'},
+            **projection(selected, required=('PK', 'archived_at'))
         )
         item = response.get('Item')
-        if not item:
+        # Archived levels are being deleted with their topic (app.core.cascade)
+        if not item or 'archived_at' in item:
             raise HTTPException(status_code=404, detail="Level not found")
         
         if language:
@@ -106,7 +161,10 @@ async def get_level(
             if trans_resp.get('Item'):
                 item['translation'] = trans_resp['Item']
         
-        return item
+        return trim(item, selected)
+    
+    try:
+        return await content_cache.get_or_load_async(("level", topic_id, level_id, language, selected), load)
     except HTTPException:
         raise
     except Exception as e:
@@ -124,46 +182,18 @@ async def create_level(
         
         level_id = str(uuid.uuid4())
         now = datetime.utcnow().isoformat() + 'Z'
-        
-        # Main level item
-        item = {
-            'PK': f'TOPIC#{level_data.topic_id}',
-            'SK': f'LEVEL#{level_id}',
-            'entity_type': 'level',
-            'level_id': level_id,
-            'topic_id': level_data.topic_id,
-            'slug': level_data.slug,
-            'position': str(level_data.position),
-            'difficulty': str(level_data.difficulty),
-            'is_published': level_data.is_published,
-            'created_at': now,
-            'updated_at': now,
-            'created_by': current_user['user_id']
-        }
-        
-        if level_data.metadata:
-            item['metadata'] = level_data.metadata.dict()
+        item, translations = build_level_items(
+            level_id, level_data.topic_id, level_data, current_user['user_id'], now
+        )
         
         table.put_item(Item=item)
         
-        # Add translations
-        if level_data.translations:
-            for lang_code, translation in level_data.translations.items():
-                trans_item = {
-                    'PK': f'LEVEL#{level_id}',
-                    'SK': f'LANG#{lang_code}',
-                    'entity_type': 'level_translation',
-                    'level_id': level_id,
-                    'language_code': lang_code,
-                    'title': translation.title,
-                }
-                if translation.description:
-                    trans_item['description'] = translation.description
-                if translation.hint:
-                    trans_item['hint'] = translation.hint
-                
-                table.put_item(Item=trans_item)
+        # Add translations (batched: one request per 25 items)
+        with table.batch_writer() as batch:
+            for trans_item in translations:
+                batch.put_item(Item=trans_item)
         
+        content_cache.invalidate()
         return item
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -175,33 +205,41 @@ async def update_level(
     level_data: LevelUpdate,
     current_user: dict = Depends(get_current_admin)
 ):
-    """Update level (admin only)"""
+    """
+    Update only the provided fields of a level (admin only).
+    Pass the version the edit is based on to get 409 instead of overwriting a concurrent edit.
+    """
+    from app.core.partial_update import update_item
+
     try:
         table = get_dynamodb_table()
         
-        response = table.get_item(
-            Key={'PK': f'TOPIC#{topic_id}', 'SK': f'LEVEL#{level_id}'}
-        )
-        item = response.get('Item')
-        if not item:
-            raise HTTPException(status_code=404, detail="Level not found")
-        
-        # Update fields
+        changes = {}
         if level_data.slug is not None:
-            item['slug'] = level_data.slug
+            changes['slug'] = level_data.slug
         if level_data.position is not None:
-            item['position'] = str(level_data.position)
+            changes['position'] = str(level_data.position)
         if level_data.difficulty is not None:
-            item['difficulty'] = str(level_data.difficulty)
+            changes['difficulty'] = str(level_data.difficulty)
         if level_data.metadata is not None:
-            item['metadata'] = level_data.metadata.dict()
+            changes['metadata'] = level_data.metadata.dict()
         if level_data.is_published is not None:
-            item['is_published'] = level_data.is_published
-        
-        item['updated_at'] = datetime.utcnow().isoformat() + 'Z'
-        item['updated_by'] = current_user['user_id']
+            changes['is_published'] = level_data.is_published
+        # A position change moves the level within the ordering index
+        index_set, index_remove = order_key_changes(
+            {'entity_type': 'level', 'topic_id': topic_id, 'level_id': level_id, **changes}, set(changes)
+        )
         
-        table.put_item(Item=item)
+        item = update_item(
+            table,
+            {'PK': f'TOPIC#{topic_id}', 'SK': f'LEVEL#{level_id}'},
+            {**changes, **index_set},
+            current_user['user_id'],
+            expected_version=level_data.version,
+            remove=index_remove,
+            entity="Level"
+        )
+        content_cache.invalidate()
         return item
     except HTTPException:
         raise
@@ -214,10 +252,14 @@ async def delete_level(
     topic_id: str,
     current_user: dict = Depends(get_current_admin)
 ):
-    """Delete level (admin only)"""
+    """Delete level with its translations, exercises and their translations (admin only)"""
+    from app.core.cascade import level_subtree, purge
+
     try:
         table = get_dynamodb_table()
-        table.delete_item(Key={'PK': f'TOPIC#{topic_id}', 'SK': f'LEVEL#{level_id}'})
+        keys = await run_in_threadpool(level_subtree, table, level_id, topic_id)
+        await run_in_threadpool(purge, table, keys)
+        content_cache.invalidate()
         return None
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,16 +1,19 @@
 """User Progress endpoints - Track exercise completion and scores"""
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, status
 from pydantic import BaseModel
-from typing import Optional, Dict
+from typing import Optional, Dict, Any
 from enum import Enum
-import boto3
 from boto3.dynamodb.conditions import Key
-import os
+from fastapi.concurrency import run_in_threadpool
 import uuid
 from datetime import datetime
 from app.core.auth import get_current_user
+from app.core.database import get_dynamodb_table
+from app.core.grading import LANDMARK_GRADED_TYPES, GradingError, grade_answer, load_exercise
+from app.core.projection import FIELDS_DESCRIPTION, parse_fields, projection, trim
+from app.core.responses import FastJSONRoute
 
-router = APIRouter(prefix="/progress", tags=["user-progress"])
+router = APIRouter(prefix="/progress", tags=["user-progress"], route_class=FastJSONRoute)
 
 # Progress status enum
 class ProgressStatus(str, Enum):
@@ -26,27 +29,33 @@ class ProgressSubmit(BaseModel):
     status: ProgressStatus
     score: Optional[float] = None
     data: Optional[Dict] = None  # Extra metadata (time taken, answers, etc)
-
-def get_dynamodb_table():
-    dynamodb = boto3.resource(
-        'dynamodb',
-        endpoint_url=os.getenv('DYNAMO_ENDPOINT_URL', 'http://localhost:4566'),
-        region_name=os.getenv('AWS_REGION', 'us-east-1'),
-        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID', 'test'),
-        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY', 'test')
-    )
-    return dynamodb.Table('aplicacion-senas-content')
+    answer: Optional[Any] = None  # Graded server-side when set (replaces score and status); required for CAMERA_PRODUCE
 
 @router.post("/submit")
 async def submit_progress(
     progress_data: ProgressSubmit,
     current_user: dict = Depends(get_current_user)
 ):
-    """Submit exercise progress/completion"""
+    """
+    Submit exercise progress/completion (with an answer, the score and status are graded server-side).
+    CAMERA_PRODUCE results are only accepted as an answer of hand landmarks, scored on the server.
+    """
     try:
         table = get_dynamodb_table()
         user_id = current_user['user_id']
         
+        grade = None
+        if progress_data.answer is not None:
+            grade = await grade_answer(progress_data.level_id, progress_data.exercise_id, progress_data.answer)
+            if grade is None:
+                raise HTTPException(status_code=404, detail="Exercise not found")
+            progress_data.score = grade['score']
+            progress_data.status = ProgressStatus(grade['status'])
+        elif progress_data.score is not None or progress_data.status in (ProgressStatus.COMPLETED, ProgressStatus.FAILED):
+            exercise = await run_in_threadpool(load_exercise, progress_data.level_id, progress_data.exercise_id)
+            if exercise and exercise.get('exercise_type') in LANDMARK_GRADED_TYPES:
+                raise GradingError('CAMERA_PRODUCE results need an answer of hand landmarks: {"frames": [...]}')
+        
         # Check if progress record exists
         progress_key = f'PROGRESS#{progress_data.exercise_id}'
         response = table.get_item(
@@ -86,27 +95,37 @@ async def submit_progress(
             item['created_at'] = existing['created_at']
         
         item['updated_at'] = now
+        if grade is not None:
+            item['graded'] = True
         
         table.put_item(Item=item)
         
-        return item
+        return item if grade is None else {**item, 'grade': grade}
+    except GradingError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/level/{level_id}")
 async def get_level_progress(
     level_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     current_user: dict = Depends(get_current_user)
 ):
     """Get user's progress for all exercises in a level"""
+    selected = parse_fields(fields)
     try:
         table = get_dynamodb_table()
         user_id = current_user['user_id']
         
+        # FilterExpression is evaluated before the projection, so level_id need not be projected
         response = table.query(
             KeyConditionExpression=Key('PK').eq(f'USER#{user_id}') & Key('SK').begins_with('PROGRESS#'),
             FilterExpression='level_id = :level_id',
-            ExpressionAttributeValues={':level_id': level_id}
+            ExpressionAttributeValues={':level_id': level_id},
+            **projection(selected, required=('status', 'best_score'))
         )
         
         progress_items = response.get('Items', [])
@@ -118,7 +137,7 @@ async def get_level_progress(
         
         return {
             "level_id": level_id,
-            "progress": progress_items,
+            "progress": [trim(p, selected) for p in progress_items],
             "total_exercises": total_exercises,
             "completed_exercises": completed,
             "completion_percentage": (completed / total_exercises * 100) if total_exercises > 0 else 0,
@@ -130,15 +149,18 @@ async def get_level_progress(
 @router.get("/exercise/{exercise_id}")
 async def get_exercise_progress(
     exercise_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     current_user: dict = Depends(get_current_user)
 ):
     """Get user's progress for a specific exercise"""
+    selected = parse_fields(fields)
     try:
         table = get_dynamodb_table()
         user_id = current_user['user_id']
         
         response = table.get_item(
-            Key={'PK': f'USER#{user_id}', 'SK': f'PROGRESS#{exercise_id}'}
+            Key={'PK': f'USER#{user_id}', 'SK': f'PROGRESS#{exercise_id}'},
+            **projection(selected, required=('PK',))
         )
         
         item = response.get('Item')
@@ -149,7 +171,7 @@ async def get_exercise_progress(
                 "attempts": 0
             }
         
-        return item
+        return trim(item, selected)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -162,8 +184,10 @@ async def get_user_summary(
         table = get_dynamodb_table()
         user_id = current_user['user_id']
         
+        # Only the attributes the summary aggregates
         response = table.query(
-            KeyConditionExpression=Key('PK').eq(f'USER#{user_id}') & Key('SK').begins_with('PROGRESS#')
+            KeyConditionExpression=Key('PK').eq(f'USER#{user_id}') & Key('SK').begins_with('PROGRESS#'),
+            **projection(('status', 'best_score', 'attempts'))
         )
         
         progress_items = response.get('Items', [])
@@ -2,14 +2,19 @@
 from fastapi import APIRouter, HTTPException, Query, Depends, status
 from pydantic import BaseModel
 from typing import Optional, Dict
-import boto3
-from boto3.dynamodb.conditions import Key
-import os
 import uuid
 from datetime import datetime
-from app.core.auth import get_current_admin
+from fastapi.concurrency import run_in_threadpool
+from app.core.auth import get_current_admin, get_optional_user, require_draft_access
+from app.core.config import settings
+from app.core.content_cache import content_cache
+from app.core.database import get_dynamodb_table
+from app.core.ordering import MAX_PAGE_SIZE, apply_order_keys, decode_cursor, encode_cursor, order_key_changes, query_ordered, topics_list_key
+from app.core.projection import FIELDS_DESCRIPTION, parse_fields, projection, trim
+from app.core.responses import FastJSONRoute
+# Write-path modules (partial_update, cascade) are imported in their handlers, keeping the content read path light
 
-router = APIRouter(prefix="/topics", tags=["topics"])
+router = APIRouter(prefix="/topics", tags=["topics"], route_class=FastJSONRoute)
 
 # Pydantic models
 class TopicTranslationInput(BaseModel):
@@ -28,34 +33,65 @@ class TopicUpdate(BaseModel):
     default_title: Optional[str] = None
     order: Optional[int] = None
     is_published: Optional[bool] = None
+    version: Optional[int] = None  # Version the edit is based on (409 if it changed since)
 
-def get_dynamodb_table():
-    dynamodb = boto3.resource(
-        'dynamodb',
-        endpoint_url=os.getenv('DYNAMO_ENDPOINT_URL', 'http://localhost:4566'),
-        region_name=os.getenv('AWS_REGION', 'us-east-1'),
-        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID', 'test'),
-        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY', 'test')
-    )
-    return dynamodb.Table('aplicacion-senas-content')
+def build_topic_items(topic_id: str, topic_data, user_id: str, now: str) -> tuple:
+    """(topic item, translation items) for a new topic"""
+    item = {
+        'PK': f'TOPIC#{topic_id}',
+        'SK': 'METADATA',
+        'entity_type': 'topic',
+        'topic_id': topic_id,
+        'slug': topic_data.slug,
+        'default_title': topic_data.default_title,
+        'is_published': topic_data.is_published,
+        'created_at': now,
+        'updated_at': now,
+        'created_by': user_id
+    }
+    
+    if topic_data.order is not None:
+        item['order'] = str(topic_data.order)
+    apply_order_keys(item)
+    item['version'] = 1
+    
+    translations = []
+    for lang_code, translation in (topic_data.translations or {}).items():
+        trans_item = {
+            'PK': f'TOPIC#{topic_id}',
+            'SK': f'LANG#{lang_code}',
+            'entity_type': 'topic_translation',
+            'topic_id': topic_id,
+            'language_code': lang_code,
+            'title': translation.title,
+        }
+        if translation.description:
+            trans_item['description'] = translation.description
+        translations.append(trans_item)
+    return item, translations
 
 # PUBLIC ENDPOINTS
 @router.get("")
 async def list_topics(
     language: Optional[str] = Query(None),
-    published_only: bool = True
+    published_only: bool = True,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    current_user: Optional[dict] = Depends(get_optional_user)
 ):
-    """List all topics (public)"""
-    try:
+    """List topics in display order (public, paged with limit/cursor)"""
+    require_draft_access(published_only, current_user)
+    selected = parse_fields(fields)
+    start_key = decode_cursor(cursor, topics_list_key(), published_only)
+
+    def load():
         table = get_dynamodb_table()
-        response = table.query(
-            IndexName='entity_type-created_at-index',
-            KeyConditionExpression=Key('entity_type').eq('topic')
+        topics, last_key = query_ordered(
+            table, topics_list_key(), limit=limit, start_key=start_key,
+            published_only=published_only,
+            **projection(selected, required=('topic_id',))
         )
-        topics = response.get('Items', [])
-        
-        if published_only:
-            topics = [t for t in topics if t.get('is_published', False)]
         
         # Load translations
         if language:
@@ -68,21 +104,32 @@ async def list_topics(
                     if trans_resp.get('Item'):
                         topic['translation'] = trans_resp['Item']
         
-        topics.sort(key=lambda x: int(x.get('order', 999)))
-        return {"topics": topics, "total": len(topics)}
+        topics = [trim(t, selected) for t in topics]
+        return {"topics": topics, "total": len(topics), "next_cursor": encode_cursor(last_key)}
+    
+    try:
+        return await content_cache.get_or_load_async(("topics", language, published_only, selected, limit, cursor), load)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{topic_id}")
-async def get_topic(topic_id: str, language: Optional[str] = Query(None)):
+async def get_topic(
+    topic_id: str,
+    language: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
     """Get topic by ID (public)"""
-    try:
+    selected = parse_fields(fields)
+
+    def load():
         table = get_dynamodb_table()
         response = table.get_item(
-            Key={'PK': f'TOPIC#{topic_id}', 'SK': 'METADATA'}
+            Key={'PK': f'TOPIC#{topic_id}', 'SK': 'METADATA'},
+            **projection(selected, required=('PK', 'archived_at'))
         )
         item = response.get('Item')
-        if not item:
+        # Archived topics are being deleted (app.core.cascade)
+        if not item or 'archived_at' in item:
             raise HTTPException(status_code=404, detail="Topic not found")
         
         if language:
@@ -92,7 +139,10 @@ async def get_topic(topic_id: str, language: Optional[str] = Query(None)):
             if trans_resp.get('Item'):
                 item['translation'] = trans_resp['Item']
         
-        return item
+        return trim(item, selected)
+    
+    try:
+        return await content_cache.get_or_load_async(("topic", topic_id, language, selected), load)
     except HTTPException:
         raise
     except Exception as e:
@@ -110,42 +160,16 @@ async def create_topic(
         
         topic_id = str(uuid.uuid4())
         now = datetime.utcnow().isoformat() + 'Z'
-        
-        # Main topic item
-        item = {
-            'PK': f'TOPIC#{topic_id}',
-            'SK': 'METADATA',
-            'entity_type': 'topic',
-            'topic_id': topic_id,
-            'slug': topic_data.slug,
-            'default_title': topic_data.default_title,
-            'is_published': topic_data.is_published,
-            'created_at': now,
-            'updated_at': now,
-            'created_by': current_user['user_id']
-        }
-        
-        if topic_data.order is not None:
-            item['order'] = str(topic_data.order)
+        item, translations = build_topic_items(topic_id, topic_data, current_user['user_id'], now)
         
         table.put_item(Item=item)
         
-        # Add translations
-        if topic_data.translations:
-            for lang_code, translation in topic_data.translations.items():
-                trans_item = {
-                    'PK': f'TOPIC#{topic_id}',
-                    'SK': f'LANG#{lang_code}',
-                    'entity_type': 'topic_translation',
-                    'topic_id': topic_id,
-                    'language_code': lang_code,
-                    'title': translation.title,
-                }
-                if translation.description:
-                    trans_item['description'] = translation.description
-                
-                table.put_item(Item=trans_item)
+        # Add translations (batched: one request per 25 items)
+        with table.batch_writer() as batch:
+            for trans_item in translations:
+                batch.put_item(Item=trans_item)
         
+        content_cache.invalidate()
         return item
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -156,53 +180,70 @@ async def update_topic(
     topic_data: TopicUpdate,
     current_user: dict = Depends(get_current_admin)
 ):
-    """Update topic (admin only)"""
+    """
+    Update only the provided fields of a topic (admin only).
+    Pass the version the edit is based on to get 409 instead of overwriting a concurrent edit.
+    """
+    from app.core.partial_update import update_item
+
     try:
         table = get_dynamodb_table()
         
-        # Get existing topic
-        response = table.get_item(
-            Key={'PK': f'TOPIC#{topic_id}', 'SK': 'METADATA'}
-        )
-        item = response.get('Item')
-        if not item:
-            raise HTTPException(status_code=404, detail="Topic not found")
-        
-        # Update fields
+        changes = {}
         if topic_data.slug is not None:
-            item['slug'] = topic_data.slug
+            changes['slug'] = topic_data.slug
         if topic_data.default_title is not None:
-            item['default_title'] = topic_data.default_title
+            changes['default_title'] = topic_data.default_title
         if topic_data.order is not None:
-            item['order'] = str(topic_data.order)
+            changes['order'] = str(topic_data.order)
         if topic_data.is_published is not None:
-            item['is_published'] = topic_data.is_published
-        
-        item['updated_at'] = datetime.utcnow().isoformat() + 'Z'
-        item['updated_by'] = current_user['user_id']
+            changes['is_published'] = topic_data.is_published
+        index_set, index_remove = order_key_changes(
+            {'entity_type': 'topic', 'topic_id': topic_id, **changes}, set(changes)
+        )
         
-        table.put_item(Item=item)
+        item = update_item(
+            table,
+            {'PK': f'TOPIC#{topic_id}', 'SK': 'METADATA'},
+            {**changes, **index_set},
+            current_user['user_id'],
+            expected_version=topic_data.version,
+            remove=index_remove,
+            entity="Topic"
+        )
+        content_cache.invalidate()
         return item
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.delete("/{topic_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{topic_id}", status_code=status.HTTP_202_ACCEPTED)
 async def delete_topic(
     topic_id: str,
     current_user: dict = Depends(get_current_admin)
 ):
-    """Delete topic (admin only)"""
+    """
+    Delete topic with its translations, levels, exercises and their translations (admin only).
+    The topic is archived (hidden from gets and lists) at once and purged by a job that
+    this request starts and each poll of the returned status_url advances until it completes.
+    """
+    from app.core.cascade import advance_topic_delete, start_topic_delete
+
     try:
-        table = get_dynamodb_table()
-        
-        # Delete main item
-        table.delete_item(Key={'PK': f'TOPIC#{topic_id}', 'SK': 'METADATA'})
-        
-        # TODO: Delete related translations, levels, exercises
-        # In production, implement cascade delete or soft delete
-        
-        return None
+        job = await run_in_threadpool(start_topic_delete, topic_id, current_user['user_id'])
+        if job is None:
+            raise HTTPException(status_code=404, detail="Topic not found")
+        content_cache.invalidate()
+        job = await run_in_threadpool(advance_topic_delete, job, settings.CASCADE_JOB_STEP_SECONDS)
+        if job['status'] == 'completed':
+            content_cache.invalidate()
+        return {
+            "job_id": job['job_id'],
+            "status": job['status'],
+            "status_url": f"/v1/admin/jobs/{job['job_id']}"
+        }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -2,25 +2,43 @@
 Authentication and authorization utilities.
 JWT token generation, password hashing, and permission validation.
 """
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import asyncio
 import os
 import hashlib
+import secrets
+import threading
+import time
+import uuid
+from app.core.config import settings
+from app.core.revocation import revocation_list
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing (cost factor configurable via BCRYPT_ROUNDS)
+# passlib/bcrypt and jose are imported on first use to keep cold starts cheap
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    from passlib.context import CryptContext
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=settings.BCRYPT_ROUNDS
+    )
 
 # JWT settings
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
+REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
 
 # Security scheme
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 # Password constraints for security
 MAX_PASSWORD_LENGTH = 128  # Reasonable max to prevent DoS attacks
@@ -56,7 +74,7 @@ def hash_password(password: str) -> str:
         raise ValueError(f"Password cannot be longer than {MAX_PASSWORD_LENGTH} characters (DoS protection)")
     
     prehashed = _prehash_password(password)
-    return pwd_context.hash(prehashed)
+    return get_pwd_context().hash(prehashed)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -64,7 +82,120 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Applies the same SHA256 pre-hash before bcrypt verification.
     """
     prehashed = _prehash_password(plain_password)
-    return pwd_context.verify(prehashed, hashed_password)
+    return get_pwd_context().verify(prehashed, hashed_password)
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Check whether a stored hash was made with a different bcrypt cost
+    than the configured BCRYPT_ROUNDS (or with a deprecated scheme).
+    """
+    try:
+        rounds = int(hashed_password.split('$')[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds != settings.BCRYPT_ROUNDS or get_pwd_context().needs_update(hashed_password)
+
+class PasswordHasherPool:
+    """
+    Bounded worker pool for bcrypt so hashing never runs on the event loop.
+
+    At most max_workers hashes run at once and at most max_queue more wait;
+    beyond that requests are rejected with 503 instead of piling up.
+    bcrypt releases the GIL, so threads give real parallelism here.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="bcrypt"
+            )
+        return self._executor
+
+    async def run(self, func, *args):
+        """Run func(*args) on the pool and await its result"""
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many concurrent authentication requests, retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+
+        submitted_at = time.perf_counter()
+
+        def task():
+            waited = time.perf_counter() - submitted_at
+            with self._lock:
+                self._active += 1
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), task)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def stats(self) -> dict:
+        """Queueing metrics for the pool"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queued": self._pending - self._active,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": (self._total_wait / self._completed * 1000) if self._completed else 0.0,
+                "max_wait_ms": self._max_wait * 1000,
+                "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+            }
+
+password_pool = PasswordHasherPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+async def revoke_access_token(token: str) -> None:
+    """Revoke an access token until it expires (no-op for invalid/expired tokens)"""
+    try:
+        payload = decode_token(token)
+    except HTTPException:
+        return
+    jti = payload.get("jti")
+    if jti:
+        await revocation_list.revoke(jti, payload.get("exp", time.time()))
+    token_cache.invalidate(token)
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the bcrypt worker pool (use from async handlers)"""
+    return await password_pool.run(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the bcrypt worker pool (use from async handlers)"""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
@@ -74,14 +205,106 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    # jti identifies the token for revocation
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
+    from jose import jwt
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def create_refresh_token(user_id: str) -> str:
+    """
+    Create an opaque refresh token: "<user_id>.<random secret>".
+    The user_id prefix lets the server locate the stored item with one keyed
+    operation; only a digest of the full token is ever persisted.
+    """
+    return f"{user_id}.{secrets.token_urlsafe(32)}"
+
+def refresh_token_key(refresh_token: str) -> dict:
+    """DynamoDB key of the stored refresh token item"""
+    user_id, _, secret = refresh_token.rpartition('.')
+    if not user_id or not secret:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token"
+        )
+    digest = hashlib.sha256(refresh_token.encode('utf-8')).hexdigest()
+    return {'PK': f'USER#{user_id}', 'SK': f'REFRESH#{digest}'}
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU cache of already-validated JWT payloads.
+
+    Keyed by the SHA256 digest of the token (raw tokens are never stored).
+    Entries expire at the token's `exp` claim or after max_ttl seconds,
+    whichever comes first, so a cached token is never accepted past expiry.
+    """
+
+    def __init__(self, max_entries: int, max_ttl: float):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    def get(self, token: str) -> Optional[dict]:
+        """Return the cached payload for token, or None if missing/expired"""
+        digest = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            payload, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+            return payload
+
+    def put(self, token: str, payload: dict) -> None:
+        """Cache a validated payload until its exp claim (bounded by max_ttl)"""
+        if self.max_entries <= 0:
+            return
+        expires_at = time.time() + self.max_ttl
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+        digest = self._digest(token)
+        with self._lock:
+            self._entries[digest] = (payload, expires_at)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token: str) -> None:
+        """Immediately drop a token so the next request re-validates it"""
+        with self._lock:
+            self._entries.pop(self._digest(token), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+token_cache = VerifiedTokenCache(
+    max_entries=settings.TOKEN_CACHE_MAX_ENTRIES,
+    max_ttl=settings.TOKEN_CACHE_TTL_SECONDS,
+)
+
 def decode_token(token: str) -> dict:
-    """Decode and validate JWT token"""
+    """
+    Decode and validate JWT token.
+    Already-validated tokens are served from token_cache without re-verifying
+    the signature; jwt.decode only runs on a cache miss.
+    """
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+    from jose import JWTError, jwt
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        token_cache.put(token, payload)
         return payload
     except JWTError:
         raise HTTPException(
@@ -94,6 +317,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     """
     Get current authenticated user from JWT token.
     Returns user data from token payload.
+    Revoked tokens are rejected (in-process check, see app.core.revocation).
     """
     token = credentials.credentials
     payload = decode_token(token)
@@ -105,6 +329,14 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             detail="Invalid authentication credentials"
         )
     
+    jti = payload.get("jti")
+    if jti and await revocation_list.is_revoked(jti):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
     return {
         "user_id": user_id,
         "email": payload.get("email"),
@@ -125,7 +357,7 @@ async def get_current_admin(current_user: dict = Depends(get_current_user)) -> d
 
 # Optional authentication (allows both authenticated and anonymous)
 async def get_optional_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
 ) -> Optional[dict]:
     """Get current user if authenticated, None otherwise"""
     if credentials is None:
@@ -134,3 +366,11 @@ async def get_optional_user(
         return await get_current_user(credentials)
     except HTTPException:
         return None
+
+def require_draft_access(published_only: bool, current_user: Optional[dict]) -> None:
+    """Unpublished content (published_only=false on list endpoints) is visible to admins only"""
+    if not published_only and (current_user is None or current_user.get("role") != "admin"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Listing unpublished content requires admin"
+        )
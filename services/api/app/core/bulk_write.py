@@ -0,0 +1,102 @@
+"""
+Bulk DynamoDB writes.
+
+- batch_put / batch_delete: items split into BatchWriteItem requests of 25,
+  sent by a small thread pool, with UnprocessedItems retried (exponential
+  backoff with jitter). Not atomic.
+- transact_put: up to 100 puts in one TransactWriteItems call, all or
+  nothing, each conditioned on the key not existing yet.
+
+Both use the low-level client behind a Table resource (botocore clients are
+thread-safe, resources are not). That client keeps the resource's type
+conversion, so items are passed as plain Python values, like to put_item.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional
+import random
+import time
+
+BATCH_SIZE = 25
+TRANSACTION_LIMIT = 100
+
+
+class BulkWriteError(Exception):
+    """Some items could not be written after all retries"""
+
+    def __init__(self, message: str, written: int = 0):
+        super().__init__(message)
+        self.written = written
+
+
+def _write_requests(
+    table,
+    requests: List[dict],
+    workers: int,
+    max_retries: int,
+    on_progress: Optional[Callable[[int], None]]
+) -> int:
+    """Send write requests in chunks of BATCH_SIZE from `workers` threads; returns the count written"""
+    client = table.meta.client
+    name = table.name
+    chunks = [requests[i:i + BATCH_SIZE] for i in range(0, len(requests), BATCH_SIZE)]
+
+    def write_chunk(chunk: List[dict]) -> int:
+        pending = {name: chunk}
+        for attempt in range(max_retries + 1):
+            response = client.batch_write_item(RequestItems=pending)
+            pending = response.get('UnprocessedItems') or {}
+            if not pending:
+                if on_progress:
+                    on_progress(len(chunk))
+                return len(chunk)
+            time.sleep(random.uniform(0, min(5.0, 0.05 * 2 ** attempt)))
+        left = len(pending.get(name, []))
+        raise BulkWriteError(f"{left} items still unprocessed after {max_retries} retries", len(chunk) - left)
+
+    if not chunks:
+        return 0
+    if workers <= 1 or len(chunks) == 1:
+        return sum(write_chunk(chunk) for chunk in chunks)
+    with ThreadPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        return sum(pool.map(write_chunk, chunks))
+
+
+def batch_put(
+    table,
+    items: Iterable[dict],
+    workers: int = 4,
+    max_retries: int = 8,
+    on_progress: Optional[Callable[[int], None]] = None
+) -> int:
+    """Put items with parallel BatchWriteItem calls (keys must be unique within the call)"""
+    requests = [{'PutRequest': {'Item': item}} for item in items]
+    return _write_requests(table, requests, workers, max_retries, on_progress)
+
+
+def batch_delete(
+    table,
+    keys: Iterable[dict],
+    workers: int = 4,
+    max_retries: int = 8,
+    on_progress: Optional[Callable[[int], None]] = None
+) -> int:
+    """Delete {'PK', 'SK'} keys with parallel BatchWriteItem calls"""
+    requests = [{'DeleteRequest': {'Key': {'PK': key['PK'], 'SK': key['SK']}}} for key in keys]
+    return _write_requests(table, requests, workers, max_retries, on_progress)
+
+
+def transact_put(table, items: List[dict]) -> int:
+    """Put up to TRANSACTION_LIMIT new items atomically (fails if any key already exists)"""
+    if len(items) > TRANSACTION_LIMIT:
+        raise ValueError(f"A transaction holds at most {TRANSACTION_LIMIT} items")
+    if not items:
+        return 0
+    table.meta.client.transact_write_items(TransactItems=[
+        {'Put': {
+            'TableName': table.name,
+            'Item': item,
+            'ConditionExpression': 'attribute_not_exists(PK)'
+        }}
+        for item in items
+    ])
+    return len(items)
@@ -0,0 +1,283 @@
+"""
+Cascade delete of topics, levels and exercises.
+
+The subtree is discovered with key-prefix queries (keys only):
+- TOPIC#<id>: topic metadata, topic translations, level items
+- LEVEL#<id>: level translations, exercise items
+- EXERCISE#<id>: exercise translations
+
+Keys are deleted with parallel BatchWriteItem calls (app/core/bulk_write.py),
+throttled to CASCADE_DELETE_RATE items/second. The root item goes last, so
+an interrupted delete is resumed by deleting again.
+
+Topics can be too large for one request. They are archived first: the
+topic and its levels get archived_at and lose their ordering and published
+index keys, and each level gets a LEVEL#<id> / ARCHIVED marker, so gets and
+lists (exercises included) hide them at once. The purge is then a job,
+recorded as a TTL'd JOB#<id> item, that runs in steps of about
+CASCADE_JOB_STEP_SECONDS, one level subtree at a time, inside requests: the
+delete request itself and every GET /v1/admin/jobs/{job_id} poll advance it
+until it completes. Nothing runs after a response is sent, so a frozen Lambda
+cannot strand a job; a step cut short is redone by the next one (the level
+item, and the topic item, go last). Each step holds a lease on the job and
+records heartbeat_at; a job whose heartbeat stops for CASCADE_JOB_STALE_SECONDS
+is reported as stale, and the next poll resumes it. User progress rows are
+history and are kept.
+"""
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+import threading
+import time
+import uuid
+from app.core.bulk_write import batch_delete
+from app.core.config import settings
+from app.core.database import get_dynamodb_table
+
+JOB_TTL_SECONDS = 7 * 24 * 3600
+# Minimum seconds between job progress writes
+JOB_PROGRESS_INTERVAL = 2.0
+# Extra seconds a step's lease outlives its time budget (one level can overrun it)
+JOB_LEASE_MARGIN = 30
+ACTIVE_JOB_STATUSES = ('pending', 'deleting', 'stale')
+# SK of the marker item hiding an archived level's exercises (see exercises._level_archived)
+ARCHIVED_SK = 'ARCHIVED'
+
+
+def query_keys(table, pk: str) -> List[dict]:
+    """Every {'PK', 'SK'} in one partition"""
+    from boto3.dynamodb.conditions import Key
+
+    query = {
+        'KeyConditionExpression': Key('PK').eq(pk),
+        'ProjectionExpression': 'PK, SK'
+    }
+    keys = []
+    while True:
+        response = table.query(**query)
+        keys.extend(response.get('Items', []))
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            return keys
+        query['ExclusiveStartKey'] = last_key
+
+
+def exercise_subtree(table, exercise_id: str, level_id: str) -> List[dict]:
+    """Keys of an exercise and its translations, the exercise item last"""
+    return query_keys(table, f'EXERCISE#{exercise_id}') + [{'PK': f'LEVEL#{level_id}', 'SK': f'EXERCISE#{exercise_id}'}]
+
+
+def level_subtree(table, level_id: str, topic_id: str) -> List[dict]:
+    """Keys of a level, its translations and its exercises' subtrees, the level item last"""
+    keys = []
+    for key in query_keys(table, f'LEVEL#{level_id}'):
+        if key['SK'].startswith('EXERCISE#'):
+            keys.extend(exercise_subtree(table, key['SK'][len('EXERCISE#'):], level_id))
+        else:
+            keys.append(key)
+    return keys + [{'PK': f'TOPIC#{topic_id}', 'SK': f'LEVEL#{level_id}'}]
+
+
+def topic_level_ids(table, topic_id: str) -> List[str]:
+    """Ids of the levels still stored under a topic"""
+    return [key['SK'][len('LEVEL#'):] for key in query_keys(table, f'TOPIC#{topic_id}') if key['SK'].startswith('LEVEL#')]
+
+
+def purge(table, keys: List[dict], on_progress: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Delete keys in throttled parallel batches, the last key (the subtree root)
+    only once everything else is gone. Returns the number deleted.
+    """
+    rate = settings.CASCADE_DELETE_RATE
+    children, root = keys[:-1], keys[-1:]
+    step = rate or len(children) or 1
+    deleted = 0
+    for start in range(0, len(children), step):
+        began = time.monotonic()
+        chunk = children[start:start + step]
+        deleted += batch_delete(table, chunk, workers=settings.BULK_WRITE_WORKERS, on_progress=on_progress)
+        if rate:
+            time.sleep(max(0.0, len(chunk) / rate - (time.monotonic() - began)))
+    return deleted + batch_delete(table, root, workers=1, on_progress=on_progress)
+
+
+def archive(table, key: dict) -> bool:
+    """Hide an item from list endpoints (drop its index keys, unpublish); False if it does not exist"""
+    try:
+        table.update_item(
+            Key=key,
+            UpdateExpression='SET archived_at = :now, is_published = :false REMOVE order_pk, published_pk',
+            ConditionExpression='attribute_exists(PK)',
+            ExpressionAttributeValues={':now': datetime.utcnow().isoformat() + 'Z', ':false': False}
+        )
+        return True
+    except table.meta.client.exceptions.ConditionalCheckFailedException:
+        return False
+
+
+def archive_topic(table, topic_id: str) -> bool:
+    """Archive a topic and its levels, marking each level's exercises hidden; False if the topic does not exist"""
+    if not archive(table, {'PK': f'TOPIC#{topic_id}', 'SK': 'METADATA'}):
+        return False
+    now = datetime.utcnow().isoformat() + 'Z'
+    with table.batch_writer() as batch:
+        for level_id in topic_level_ids(table, topic_id):
+            archive(table, {'PK': f'TOPIC#{topic_id}', 'SK': f'LEVEL#{level_id}'})
+            # Purged with the level's partition
+            batch.put_item(Item={
+                'PK': f'LEVEL#{level_id}',
+                'SK': ARCHIVED_SK,
+                'entity_type': 'archived_marker',
+                'archived_at': now
+            })
+    return True
+
+
+# ==================== JOBS ====================
+
+def get_job(job_id: str) -> Optional[dict]:
+    """Job record (blocking)"""
+    return get_dynamodb_table().get_item(Key={'PK': f'JOB#{job_id}', 'SK': 'METADATA'}).get('Item')
+
+
+def _job_key(job_id: str) -> dict:
+    return {'PK': f'JOB#{job_id}', 'SK': 'METADATA'}
+
+
+def _claim(table, job: dict, budget: float) -> Optional[dict]:
+    """Take the job's lease for one step; None while another step holds it or once it finished"""
+    now = datetime.utcnow()
+    try:
+        return table.update_item(
+            Key=_job_key(job['job_id']),
+            UpdateExpression='SET #status = :deleting, lease_until = :lease, heartbeat_at = :now, updated_at = :now',
+            ConditionExpression='#status IN (:pending, :deleting, :stale) AND '
+                                '(attribute_not_exists(lease_until) OR lease_until < :epoch)',
+            ExpressionAttributeNames={'#status': 'status'},
+            ExpressionAttributeValues={
+                ':deleting': 'deleting',
+                ':pending': 'pending',
+                ':stale': 'stale',
+                ':lease': int(now.timestamp() + budget) + JOB_LEASE_MARGIN,
+                ':epoch': int(now.timestamp()),
+                ':now': now.isoformat() + 'Z'
+            },
+            ReturnValues='ALL_NEW'
+        )['Attributes']
+    except table.meta.client.exceptions.ConditionalCheckFailedException:
+        return None
+
+
+def _record(table, job_id: str, deleted: int, release: bool = False, **fields) -> dict:
+    """Add deleted to the job's count and refresh its heartbeat (ending the step when release)"""
+    now = datetime.utcnow().isoformat() + 'Z'
+    fields.update(heartbeat_at=now, updated_at=now)
+    expression = 'SET ' + ', '.join(f'#{name} = :{name}' for name in fields) + ' ADD deleted :deleted'
+    if release:
+        expression += ' REMOVE lease_until'
+    return table.update_item(
+        Key=_job_key(job_id),
+        UpdateExpression=expression,
+        ExpressionAttributeNames={f'#{name}': name for name in fields},
+        ExpressionAttributeValues={':deleted': deleted, **{f':{name}': value for name, value in fields.items()}},
+        ReturnValues='ALL_NEW'
+    )['Attributes']
+
+
+def advance_topic_delete(job: dict, budget: float) -> dict:
+    """
+    Purge level subtrees of a topic delete job for about budget seconds, then
+    the topic itself once no level is left (blocking). Returns the job as it
+    stands afterwards; unchanged when another step holds it or it finished.
+    """
+    if job.get('status') not in ACTIVE_JOB_STATUSES:
+        return job
+    table = get_dynamodb_table()
+    claimed = _claim(table, job, budget)
+    if claimed is None:
+        return job
+    job_id, topic_id = job['job_id'], job['target_id']
+    deadline = time.monotonic() + budget
+
+    lock = threading.Lock()
+    progress = {'deleted': 0, 'reported': time.monotonic()}
+
+    def on_progress(count: int):
+        with lock:
+            progress['deleted'] += count
+            now = time.monotonic()
+            if now - progress['reported'] < JOB_PROGRESS_INTERVAL:
+                return
+            progress['reported'] = now
+            deleted, progress['deleted'] = progress['deleted'], 0
+        _record(table, job_id, deleted)
+
+    def unreported() -> int:
+        with lock:
+            deleted, progress['deleted'] = progress['deleted'], 0
+        return deleted
+
+    try:
+        level_ids = topic_level_ids(table, topic_id)
+        for number, level_id in enumerate(level_ids, 1):
+            purge(table, level_subtree(table, level_id, topic_id), on_progress)
+            # At least one level per step, so every step makes progress
+            if number < len(level_ids) and time.monotonic() >= deadline:
+                return _record(table, job_id, unreported(), release=True, status='deleting')
+        # Translations first, the topic metadata item last
+        keys = [key for key in query_keys(table, f'TOPIC#{topic_id}') if key['SK'] != 'METADATA']
+        purge(table, keys + [{'PK': f'TOPIC#{topic_id}', 'SK': 'METADATA'}], on_progress)
+        return _record(table, job_id, unreported(), release=True, status='completed')
+    except Exception as e:
+        print(f"Warning: Cascade delete of topic {topic_id} failed: {e}")
+        return _record(table, job_id, unreported(), release=True, status='failed', error=str(e))
+
+
+def mark_stale(job: dict) -> dict:
+    """Report an unfinished job whose heartbeat stopped CASCADE_JOB_STALE_SECONDS ago as stale (blocking)"""
+    if job.get('status') not in ('pending', 'deleting'):
+        return job
+    heartbeat = job.get('heartbeat_at') or job['created_at']
+    stale_before = datetime.utcnow() - timedelta(seconds=settings.CASCADE_JOB_STALE_SECONDS)
+    if heartbeat >= stale_before.isoformat() + 'Z':
+        return job
+    table = get_dynamodb_table()
+    try:
+        return table.update_item(
+            Key=_job_key(job['job_id']),
+            UpdateExpression='SET #status = :stale',
+            ConditionExpression='#status = :seen AND updated_at = :updated',
+            ExpressionAttributeNames={'#status': 'status'},
+            ExpressionAttributeValues={':stale': 'stale', ':seen': job['status'], ':updated': job['updated_at']},
+            ReturnValues='ALL_NEW'
+        )['Attributes']
+    except table.meta.client.exceptions.ConditionalCheckFailedException:
+        # Moved on since it was read
+        return get_job(job['job_id']) or job
+
+
+def start_topic_delete(topic_id: str, user_id: str) -> Optional[dict]:
+    """
+    Archive the topic and record a pending delete job for it (blocking).
+    Returns the job, or None when the topic does not exist.
+    """
+    table = get_dynamodb_table()
+    if not archive_topic(table, topic_id):
+        return None
+    job_id = str(uuid.uuid4())
+    now = datetime.utcnow()
+    job = {
+        'PK': f'JOB#{job_id}',
+        'SK': 'METADATA',
+        'entity_type': 'job',
+        'job_id': job_id,
+        'kind': 'topic_delete',
+        'target_id': topic_id,
+        'status': 'pending',
+        'deleted': 0,
+        'created_by': user_id,
+        'created_at': now.isoformat() + 'Z',
+        'updated_at': now.isoformat() + 'Z',
+        'ttl': int(now.timestamp()) + JOB_TTL_SECONDS
+    }
+    table.put_item(Item=job)
+    return job
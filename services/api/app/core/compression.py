@@ -0,0 +1,199 @@
+"""
+Response compression (gzip, and brotli when the brotli package is installed).
+
+CompressionMiddleware compresses JSON, MessagePack and text responses of at
+least COMPRESSION_MIN_SIZE bytes with the best encoding the client accepts
+(Accept-Encoding, q-values honoured). Smaller bodies, streamed bodies and
+responses that already carry a Content-Encoding pass through untouched.
+
+Compressed bodies of public GET responses (no Authorization header) are kept
+in a byte-bounded LRU keyed by a digest of the uncompressed body, so the same
+cached catalog/exercise payload is compressed once rather than on every hit.
+
+Mangum returns compressed bodies base64-encoded (they are not valid UTF-8),
+which API Gateway decodes before sending them to the client.
+"""
+from collections import OrderedDict
+from typing import Optional
+import gzip
+import hashlib
+import threading
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional, gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/msgpack", "text/", "application/javascript", "application/xml"
+)
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """Map each encoding in an Accept-Encoding header to its q-value"""
+    accepted = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[name] = q
+    return accepted
+
+
+def choose_encoding(header: str) -> Optional[str]:
+    """Best supported encoding for an Accept-Encoding header (None for identity)"""
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_q = None, 0.0
+    for encoding in candidates:
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class CompressedBodyCache:
+    """LRU of compressed bodies keyed by (encoding, digest of the uncompressed body)"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(body: bytes, encoding: str) -> tuple:
+        return encoding, hashlib.blake2b(body, digest_size=16).digest()
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: tuple, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = value
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "bytes": self._size, "hits": self.hits, "misses": self.misses}
+
+
+compressed_cache = CompressedBodyCache(settings.COMPRESSION_CACHE_MAX_BYTES)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing buffered responses above minimum_size"""
+
+    def __init__(self, app, minimum_size: int = 1024, cache: Optional[CompressedBodyCache] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        encoding = choose_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        cacheable = (
+            self.cache is not None and scope.get("method") == "GET" and b"authorization" not in headers
+        )
+        responder = _CompressingResponder(send, encoding, self.minimum_size, self.cache if cacheable else None)
+        await self.app(scope, receive, responder)
+
+
+class _CompressingResponder:
+    """Wraps send: holds http.response.start until the body is known"""
+
+    def __init__(self, send, encoding: str, minimum_size: int, cache: Optional[CompressedBodyCache]):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.cache = cache
+        self.start_message = None
+        self.passthrough = False
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        headers = list(self.start_message.get("headers", []))
+        names = {name.lower(): value for name, value in headers}
+        if message.get("more_body", False) or not self._compressible(names, body):
+            # Streamed or not worth compressing: send everything as is
+            self.passthrough = True
+            await self.send(self.start_message)
+            await self.send(message)
+            return
+
+        compressed = None
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(body, self.encoding)
+            compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = compress(body, self.encoding)
+            if key is not None:
+                self.cache.set(key, compressed)
+
+        headers = [(name, value) for name, value in headers if name.lower() not in (b"content-length", b"vary")]
+        vary = names.get(b"vary")
+        headers += [
+            (b"content-encoding", self.encoding.encode("latin-1")),
+            (b"content-length", str(len(compressed)).encode("latin-1")),
+            (b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding"),
+        ]
+        await self.send({**self.start_message, "headers": headers})
+        await self.send({"type": "http.response.body", "body": compressed})
+
+    def _compressible(self, headers: dict, body: bytes) -> bool:
+        if len(body) < self.minimum_size or b"content-encoding" in headers:
+            return False
+        content_type = headers.get(b"content-type", b"").decode("latin-1")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
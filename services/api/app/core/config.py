@@ -11,6 +11,8 @@ class Settings(BaseSettings):
     DYNAMO_TABLE_NAME: str = os.environ.get("DYNAMO_TABLE", "aplicacion-senas-content")
     DYNAMO_ENDPOINT_URL: str | None = os.environ.get("DYNAMO_ENDPOINT_URL")  # For local testing
     AWS_REGION: str = os.environ.get("AWS_REGION", "us-east-1")
+    # GSI on (entity_type, created_at) - the name infra/terraform creates; the local setup scripts create "entity_type-created_at-index" and set ENTITY_TYPE_INDEX to it
+    ENTITY_TYPE_INDEX: str = os.environ.get("ENTITY_TYPE_INDEX", "gsi1-entity-type-created-at")
 
     # S3
     S3_BUCKET: str = os.environ.get("S3_BUCKET", "aplicacion-senas-assets")
@@ -27,6 +29,23 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    # Verified-token cache (skips jwt.decode for recently validated tokens)
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+    # Access token revocation (Bloom filter synced from DynamoDB)
+    REVOCATION_BLOOM_CAPACITY: int = 100000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.01
+    REVOCATION_SYNC_SECONDS: int = 30
+    REVOCATION_FULL_SYNC_SECONDS: int = 3600
+    # Revocation reads: one attempt with this timeout; after a failure, checks fail open for the TTL
+    REVOCATION_TIMEOUT_SECONDS: float = 1.0
+    REVOCATION_FAILURE_TTL_SECONDS: int = 10
+    # Incremental syncs re-read revocations this far behind the cursor (GSI replication lag)
+    REVOCATION_SYNC_SKEW_SECONDS: int = 10
+    # Password hashing - bcrypt cost and worker pool bounds
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 64
     
     # CORS - Configure allowed origins
     CORS_ORIGINS: list[str] = [
@@ -36,6 +55,64 @@ class Settings(BaseSettings):
         # Add production domains here
     ]
 
+    # Leaderboard snapshots - freshness bounds in seconds, per scope kind
+    # Snapshots younger than FRESH are served as-is; up to FRESH + STALE they are
+    # served immediately while a background refresh runs.
+    LEADERBOARD_FRESH_SECONDS: dict[str, int] = {"global": 60, "topic": 30, "level": 15}
+    LEADERBOARD_STALE_SECONDS: dict[str, int] = {"global": 600, "topic": 300, "level": 120}
+    LEADERBOARD_MAX_SNAPSHOTS: int = 256
+
+    # Public content response cache (in-process)
+    CONTENT_CACHE_TTL_SECONDS: int = 60
+    CONTENT_CACHE_MAX_ENTRIES: int = 2048
+    # Disk tier under /tmp (survives process restarts in a Lambda container); 0 bytes disables it
+    CONTENT_DISK_CACHE_PATH: str = os.environ.get("CONTENT_DISK_CACHE_PATH", "/tmp/content_cache.sqlite3")
+    CONTENT_DISK_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # Upper bound only; entries are also dropped once the shared content version moves on
+    CONTENT_DISK_CACHE_TTL_SECONDS: int = 600
+
+    # Response compression (gzip, brotli when installed) for bodies of at least this size
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    # Compressed bodies of public GET responses kept for reuse (0 disables)
+    COMPRESSION_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+
+    # POST /v1/batch - maximum GET sub-requests per call
+    BATCH_MAX_REQUESTS: int = 20
+
+    # POST /v1/admin/import - maximum items (metadata + translations) per document
+    IMPORT_MAX_ITEMS: int = 2000
+    # Parallel BatchWriteItem workers for bulk writes
+    BULK_WRITE_WORKERS: int = 4
+    # Compiled answer validators kept per exercise version
+    GRADER_CACHE_MAX_ENTRIES: int = 4096
+    # CAMERA_PRODUCE landmark scoring (NumPy DTW against the exercise's templates)
+    SIGN_MAX_FRAMES: int = 300
+    SIGN_RESAMPLE_FRAMES: int = 48
+    SIGN_DTW_BAND: float = 0.25  # Sakoe-Chiba band, as a fraction of SIGN_RESAMPLE_FRAMES
+    SIGN_SIMILARITY_SCALE: float = 0.15  # similarity = exp(-distance / scale)
+    SIGN_TEMPLATE_CACHE_MAX_ENTRIES: int = 512
+    # Packed templates from scripts/build_template_index.py (relative to services/api; missing = none)
+    SIGN_TEMPLATE_INDEX_PATH: str = os.environ.get("SIGN_TEMPLATE_INDEX_PATH", "data/sign_templates.npy")
+    # Micro-batching of concurrent score-sign requests (app/core/microbatch.py); size 1 = no batching
+    SIGN_BATCH_MAX_SIZE: int = 32
+    SIGN_BATCH_MAX_WAIT_MS: float = 5.0
+    SIGN_BATCH_WORKERS: int = 2
+    SIGN_BATCH_MAX_QUEUE: int = 256
+    # Cascade deletes - items deleted per second (0 = unthrottled)
+    CASCADE_DELETE_RATE: int = 500
+    # Topic delete jobs - purge work per delete request / status poll, and heartbeat age reported as stale
+    CASCADE_JOB_STEP_SECONDS: float = 5.0
+    CASCADE_JOB_STALE_SECONDS: int = 120
+
+    # Warm-up - "auto" runs it during init only for provisioned concurrency
+    WARMUP_ON_INIT: str = os.environ.get("WARMUP_ON_INIT", "auto")
+    WARMUP_LEADERBOARD_SCOPES: list[str] = ["global"]
+
+    # Startup - mount /v1 routers (and import their dependencies) on first use
+    LAZY_ROUTERS: bool = os.environ.get("LAZY_ROUTERS", "false").lower() == "true"
+
     # Environment
     ENVIRONMENT: str = os.environ.get("ENVIRONMENT", "development")
 
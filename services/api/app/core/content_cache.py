@@ -0,0 +1,182 @@
+"""
+Cache of public content responses (languages, topics, levels, exercises).
+
+Two tiers: an in-process LRU (CONTENT_CACHE_TTL_SECONDS) backed by a local
+disk tier under /tmp (see app.core.disk_cache) that survives process
+restarts within the same container. Both tiers, and the compressed response
+bodies kept by app.core.compression, are dropped on any admin content write
+in this process.
+
+Every admin content write also bumps a shared CONTENT#VERSION item. Disk
+entries are stored with the version they were loaded at and are only served
+while it is still current; each instance re-reads it at most once per
+CONTENT_CACHE_TTL_SECONDS. Other instances therefore see an edit within the
+in-memory TTL, whatever the disk TTL. Callers that must not see an older
+copy beyond that (grading) skip the disk tier.
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+import threading
+import time
+from fastapi.concurrency import run_in_threadpool
+from app.core.compression import compressed_cache
+from app.core.config import settings
+from app.core.database import get_dynamodb_table
+from app.core.disk_cache import DiskCache
+
+CONTENT_VERSION_KEY = {'PK': 'CONTENT#VERSION', 'SK': 'METADATA'}
+
+
+class SharedContentVersion:
+    """Content version shared by every instance, kept in one counter item"""
+
+    def __init__(self, check_every: float):
+        self.check_every = check_every
+        self._value: Optional[int] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _store(self, value: int) -> int:
+        with self._lock:
+            self._value = value
+            self._checked_at = time.monotonic()
+        return value
+
+    def current(self) -> Optional[int]:
+        """The shared version, re-read at most every check_every seconds (None when it cannot be read)"""
+        if self._value is not None and time.monotonic() - self._checked_at < self.check_every:
+            return self._value
+        try:
+            item = get_dynamodb_table().get_item(
+                Key=CONTENT_VERSION_KEY,
+                ProjectionExpression='#v',
+                ExpressionAttributeNames={'#v': 'version'}
+            ).get('Item')
+        except Exception as e:
+            print(f"Warning: Content version check failed: {e}")
+            return None
+        return self._store(int(item['version']) if item else 0)
+
+    def bump(self) -> Optional[int]:
+        """Increment the shared version (after a content write)"""
+        try:
+            response = get_dynamodb_table().update_item(
+                Key=CONTENT_VERSION_KEY,
+                UpdateExpression='ADD #v :one',
+                ExpressionAttributeNames={'#v': 'version'},
+                ExpressionAttributeValues={':one': 1},
+                ReturnValues='UPDATED_NEW'
+            )
+        except Exception as e:
+            print(f"Warning: Content version bump failed: {e}")
+            with self._lock:
+                self._value = None
+            return None
+        return self._store(int(response['Attributes']['version']))
+
+
+class ContentCache:
+    """Bounded LRU cache with per-entry TTL and an optional disk tier"""
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int,
+        disk: Optional[DiskCache] = None,
+        version: Optional[SharedContentVersion] = None
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.disk = disk
+        self.version = version
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _disk_version(self) -> Optional[int]:
+        """Version disk entries must carry to be served (None: skip the disk tier)"""
+        if self.disk is None:
+            return None
+        return self.version.current() if self.version is not None else 0
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], disk: bool = True) -> Any:
+        """
+        Return the cached value for key (memory, then disk), calling loader() on a miss.
+        disk=False keeps the value in memory only.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        return self._load(key, loader, disk)
+
+    async def get_or_load_async(self, key: Hashable, loader: Callable[[], Any], disk: bool = True) -> Any:
+        """get_or_load for async handlers: memory hits return inline, misses (disk, loader) run on the threadpool"""
+        value = self.get(key)
+        if value is not None:
+            return value
+        return await run_in_threadpool(self._load, key, loader, disk)
+
+    def _load(self, key: Hashable, loader: Callable[[], Any], disk: bool) -> Any:
+        """Disk tier, then loader() (blocking)"""
+        version = self._disk_version() if disk else None
+        if version is not None:
+            value = self.disk.get(key, version)
+            if value is not None:
+                self.set(key, value)
+                return value
+        value = loader()
+        self.set(key, value)
+        if version is not None:
+            self.disk.set(key, value, version)
+        return value
+
+    def invalidate(self) -> None:
+        """Drop every entry in both tiers and bump the shared version (call after any content write)"""
+        with self._lock:
+            self._entries.clear()
+        if self.version is not None:
+            self.version.bump()
+        if self.disk is not None:
+            self.disk.invalidate()
+        compressed_cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        stats = {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
+
+
+content_cache = ContentCache(
+    ttl=settings.CONTENT_CACHE_TTL_SECONDS,
+    max_entries=settings.CONTENT_CACHE_MAX_ENTRIES,
+    disk=DiskCache(
+        path=settings.CONTENT_DISK_CACHE_PATH,
+        max_bytes=settings.CONTENT_DISK_CACHE_MAX_BYTES,
+        ttl=settings.CONTENT_DISK_CACHE_TTL_SECONDS,
+    ),
+    version=SharedContentVersion(check_every=settings.CONTENT_CACHE_TTL_SECONDS),
+)
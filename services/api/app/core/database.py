@@ -0,0 +1,57 @@
+"""
+Shared AWS clients (DynamoDB, S3).
+Built once per process (during the Lambda init phase when imported from
+lambda_handler) and reused by every request. boto3 is imported on first use
+so modules that only reference these helpers stay cheap to import.
+"""
+from functools import lru_cache
+import os
+
+TABLE_NAME = 'aplicacion-senas-content'
+
+
+def _dynamodb_options() -> dict:
+    return dict(
+        endpoint_url=os.getenv('DYNAMO_ENDPOINT_URL', 'http://localhost:4566'),
+        region_name=os.getenv('AWS_REGION', 'us-east-1'),
+        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID', 'test'),
+        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY', 'test')
+    )
+
+
+@lru_cache(maxsize=None)
+def get_dynamodb_resource():
+    """Get the process-wide DynamoDB resource"""
+    import boto3
+    return boto3.resource('dynamodb', **_dynamodb_options())
+
+
+@lru_cache(maxsize=None)
+def get_dynamodb_table():
+    """Get DynamoDB table"""
+    return get_dynamodb_resource().Table(TABLE_NAME)
+
+
+@lru_cache(maxsize=None)
+def get_fail_fast_table(timeout: float):
+    """
+    DynamoDB table for checks on the request path that must not stall:
+    a single attempt (no retries) with connect and read timeouts of timeout seconds
+    """
+    import boto3
+    from botocore.config import Config
+    config = Config(connect_timeout=timeout, read_timeout=timeout, retries={'total_max_attempts': 1})
+    return boto3.resource('dynamodb', config=config, **_dynamodb_options()).Table(TABLE_NAME)
+
+
+@lru_cache(maxsize=None)
+def get_s3_client():
+    """Get the process-wide S3 client"""
+    import boto3
+    return boto3.client(
+        's3',
+        endpoint_url=os.getenv('S3_ENDPOINT_URL'),
+        region_name=os.getenv('AWS_REGION', 'us-east-1'),
+        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID', 'test'),
+        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY', 'test')
+    )
@@ -0,0 +1,159 @@
+"""
+Local disk (SQLite under /tmp) second tier for the content cache.
+
+Survives Python process restarts inside the same Lambda container, so a
+re-initialized handler can serve content from disk before going to DynamoDB.
+
+- Entries carry the shared content version they were loaded at (see
+  app.core.content_cache.SharedContentVersion); get() only returns entries
+  stored at the version the caller passes, so content edited on any
+  instance is not served from here. invalidate() drops every entry.
+- Size is bounded by max_bytes with least-recently-used eviction.
+- Writes are single SQLite transactions (WAL journal), so a crash never
+  leaves a half-written entry; a corrupted file is deleted and recreated.
+"""
+from decimal import Decimal
+from typing import Any, Hashable, Optional
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Bump when the serialized shape of cached responses changes
+FORMAT_VERSION = 2
+
+
+def _json_default(obj):
+    """Encode DynamoDB Decimals like FastAPI's jsonable_encoder does"""
+    if isinstance(obj, Decimal):
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class DiskCache:
+    """Size-bounded LRU key/value store in a single SQLite file"""
+
+    def __init__(self, path: str, max_bytes: int, ttl: float):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, version INTEGER NOT NULL,"
+            " size INTEGER NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        if meta.get("format") != FORMAT_VERSION:
+            conn.execute("DELETE FROM entries")
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('format', ?)", (FORMAT_VERSION,))
+        return conn
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            try:
+                self._conn = self._open()
+            except sqlite3.DatabaseError:
+                self._reset_file()
+                self._conn = self._open()
+        return self._conn
+
+    def _reset_file(self) -> None:
+        """Drop a corrupted cache file (and its WAL/SHM siblings)"""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(self.path + suffix)
+            except FileNotFoundError:
+                pass
+
+    def _run(self, operation, default=None):
+        """Run operation(conn) under the lock; storage errors never reach callers"""
+        if not self.enabled:
+            return default
+        with self._lock:
+            try:
+                return operation(self._connection())
+            except sqlite3.DatabaseError as e:
+                print(f"Warning: Disk cache unusable, recreating {self.path}: {e}")
+                self._reset_file()
+            except (sqlite3.Error, OSError) as e:
+                print(f"Warning: Disk cache operation failed: {e}")
+        return default
+
+    @staticmethod
+    def _key(key: Hashable) -> str:
+        return json.dumps(key, default=str)
+
+    def get(self, key: Hashable, version: int) -> Optional[Any]:
+        """The entry for key if it was stored at `version` and is within its TTL"""
+        def operation(conn):
+            row = conn.execute(
+                "SELECT value, version, stored_at FROM entries WHERE key = ?", (self._key(key),)
+            ).fetchone()
+            if row is None:
+                return None
+            value, stored_version, stored_at = row
+            now = time.time()
+            if stored_version != version or stored_at + self.ttl <= now:
+                conn.execute("DELETE FROM entries WHERE key = ?", (self._key(key),))
+                return None
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, self._key(key)))
+            return json.loads(value)
+        return self._run(operation)
+
+    def set(self, key: Hashable, value: Any, version: int) -> None:
+        payload = json.dumps(value, default=_json_default, separators=(",", ":")).encode("utf-8")
+        if len(payload) > self.max_bytes:
+            return
+
+        def operation(conn):
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                    (self._key(key), payload, version, len(payload), now, now)
+                )
+                total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                while total > self.max_bytes:
+                    oldest = conn.execute(
+                        "SELECT key, size FROM entries ORDER BY accessed_at LIMIT 1"
+                    ).fetchone()
+                    if oldest is None:
+                        break
+                    conn.execute("DELETE FROM entries WHERE key = ?", (oldest[0],))
+                    total -= oldest[1]
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        self._run(operation)
+
+    def invalidate(self) -> None:
+        """Drop every entry"""
+        self._run(lambda conn: conn.execute("DELETE FROM entries"))
+
+    def stats(self) -> dict:
+        def operation(conn):
+            count, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            return {"entries": count, "bytes": size, "max_bytes": self.max_bytes}
+        return self._run(operation, default={"entries": 0, "bytes": 0, "max_bytes": self.max_bytes})
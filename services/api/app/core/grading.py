@@ -0,0 +1,243 @@
+"""
+Server-side grading of exercise answers.
+
+An exercise's answer_schema and config.scoring_rules are compiled once into
+a small validator object, so grading one answer is a set lookup or a few
+comparisons:
+
+- MCQ: answer_schema {"correct_answer": "A"} (or "correct_answers": [...]);
+  answers are matched after strip/casefold unless "case_sensitive" is set.
+  Rules: "correct" (default 100) and "incorrect" (default 0) points.
+- COPY_PRACTICE / CAMERA_PRODUCE: answer_schema {"target_sign": "B"}.
+  Rules "high_confidence" / "medium_confidence" / "low_confidence" pay out
+  at config.required_confidence (default 0.8), 0.15 below it and 0.3 below
+  it; a "completed" rule pays for a completed attempt at the right sign.
+  COPY_PRACTICE answers are {"sign": ..., "confidence": 0..1} and/or
+  {"completed": true}. CAMERA_PRODUCE answers are the hand landmarks,
+  {"frames": [...]}: the confidence is the similarity app/core/landmarks.py
+  computes on the server, never a number the client sends.
+
+Validators are cached per (exercise_id, version). update_exercise bumps the
+version and drops the exercise's validators, so an edited answer key never
+grades with a stale validator.
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+import threading
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.content_cache import content_cache
+from app.core.database import get_dynamodb_table
+
+# Confidence tiers: (rule, offset below required_confidence)
+CONFIDENCE_TIERS = (("high_confidence", 0.0), ("medium_confidence", 0.15), ("low_confidence", 0.3))
+DEFAULT_REQUIRED_CONFIDENCE = 0.8
+DEFAULT_POINTS = 100
+# Exercise types graded from landmarks scored on the server
+LANDMARK_GRADED_TYPES = ("CAMERA_PRODUCE",)
+
+
+class GradingError(ValueError):
+    """The exercise cannot be graded, or the answer has the wrong shape"""
+
+
+def _normalize(value: Any, case_sensitive: bool) -> str:
+    text = str(value).strip()
+    return text if case_sensitive else text.casefold()
+
+
+def _result(correct: bool, points: float, max_points: float) -> dict:
+    return {
+        "correct": correct,
+        "points": points,
+        "max_points": max_points,
+        "score": round(100.0 * points / max_points, 2) if max_points else (100.0 if correct else 0.0),
+        "status": "completed" if correct else "failed"
+    }
+
+
+class MCQValidator:
+    """Multiple choice: answer (or list of answers) must equal the correct set"""
+    __slots__ = ("correct", "case_sensitive", "points", "wrong_points")
+
+    def __init__(self, answer_schema: dict, rules: dict):
+        answers = answer_schema.get("correct_answers")
+        if answers is None and "correct_answer" in answer_schema:
+            answers = [answer_schema["correct_answer"]]
+        if not answers:
+            raise GradingError("MCQ answer_schema needs correct_answer or correct_answers")
+        self.case_sensitive = bool(answer_schema.get("case_sensitive", False))
+        self.correct = frozenset(_normalize(answer, self.case_sensitive) for answer in answers)
+        self.points = float(rules.get("correct", DEFAULT_POINTS))
+        self.wrong_points = float(rules.get("incorrect", 0))
+
+    def grade(self, answer: Any) -> dict:
+        if isinstance(answer, dict):
+            answer = answer.get("answer", answer.get("choice"))
+        if answer is None:
+            raise GradingError("MCQ answer must be a choice or a list of choices")
+        chosen = answer if isinstance(answer, (list, tuple)) else [answer]
+        correct = frozenset(_normalize(choice, self.case_sensitive) for choice in chosen) == self.correct
+        return _result(correct, self.points if correct else self.wrong_points, self.points)
+
+
+class SignValidator:
+    """
+    Produced or copied sign: target match, paid by confidence tier or completion.
+    With from_landmarks the confidence is the server-side landmark similarity.
+    """
+    __slots__ = ("target", "required", "tiers", "completed_points", "max_points", "from_landmarks")
+
+    def __init__(self, answer_schema: dict, rules: dict, config: dict, from_landmarks: bool = False):
+        if "target_sign" not in answer_schema:
+            raise GradingError("answer_schema needs target_sign")
+        self.target = _normalize(answer_schema["target_sign"], False)
+        self.from_landmarks = from_landmarks
+        self.required = required = float(config.get("required_confidence") or DEFAULT_REQUIRED_CONFIDENCE)
+        # Highest threshold first, so the first tier reached is the best one
+        self.tiers = tuple(
+            (required - offset, float(rules[name])) for name, offset in CONFIDENCE_TIERS if name in rules
+        )
+        self.completed_points = float(rules["completed"]) if "completed" in rules else None
+        if not self.tiers and self.completed_points is None:
+            self.completed_points = float(DEFAULT_POINTS)
+        self.max_points = max([points for _, points in self.tiers] + [self.completed_points or 0.0])
+
+    def grade(self, answer: Any, similarity: Optional[float] = None) -> dict:
+        if self.from_landmarks:
+            if similarity is None:
+                raise GradingError('CAMERA_PRODUCE answers are the hand landmarks: {"frames": [...]}')
+            return self.grade_similarity(similarity)
+
+        if not isinstance(answer, dict):
+            answer = {"sign": answer}
+        sign = answer.get("sign")
+        if sign is not None and _normalize(sign, False) != self.target:
+            return _result(False, 0.0, self.max_points)
+
+        confidence = answer.get("confidence")
+        if confidence is not None and self.tiers:
+            try:
+                confidence = float(confidence)
+            except (TypeError, ValueError):
+                raise GradingError("confidence must be a number")
+            for threshold, points in self.tiers:
+                if confidence >= threshold:
+                    return _result(True, points, self.max_points)
+            return _result(False, 0.0, self.max_points)
+
+        if self.completed_points is not None and answer.get("completed", sign is not None):
+            return _result(True, self.completed_points, self.max_points)
+        return _result(False, 0.0, self.max_points)
+
+    def grade_similarity(self, similarity: float) -> dict:
+        """Tier reached by a server-computed similarity ("completed" pays at required_confidence)"""
+        for threshold, points in self.tiers:
+            if similarity >= threshold:
+                return _result(True, points, self.max_points)
+        if not self.tiers and similarity >= self.required:
+            return _result(True, self.completed_points, self.max_points)
+        return _result(False, 0.0, self.max_points)
+
+
+def compile_validator(exercise: dict):
+    """Validator for an exercise item (exercise_type, answer_schema, config)"""
+    exercise_type = exercise.get("exercise_type")
+    answer_schema = exercise.get("answer_schema") or {}
+    config = exercise.get("config") or {}
+    rules = config.get("scoring_rules") or {}
+    if exercise_type == "MCQ":
+        return MCQValidator(answer_schema, rules)
+    if exercise_type in ("COPY_PRACTICE", "CAMERA_PRODUCE"):
+        return SignValidator(answer_schema, rules, config, from_landmarks=exercise_type in LANDMARK_GRADED_TYPES)
+    raise GradingError(f"Exercises of type {exercise_type} cannot be graded")
+
+
+class ValidatorCache:
+    """Objects compiled from exercise items, keyed by (exercise_id, version), LRU-bounded"""
+
+    def __init__(self, max_entries: int, compile: Callable[[dict], Any] = compile_validator):
+        self.max_entries = max_entries
+        self.compile = compile
+        self._entries: "OrderedDict[tuple, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.compiles = 0
+
+    def get(self, exercise: dict):
+        """Validator for an exercise item, compiled on first use of its version"""
+        key = (exercise["exercise_id"], int(exercise.get("version", 0)))
+        with self._lock:
+            validator = self._entries.get(key)
+            if validator is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return validator
+        validator = self.compile(exercise)
+        with self._lock:
+            self.compiles += 1
+            self._entries[key] = validator
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return validator
+
+    def invalidate(self, exercise_id: Optional[str] = None) -> None:
+        """Drop one exercise's validators (every version), or all of them"""
+        with self._lock:
+            if exercise_id is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == exercise_id]:
+                del self._entries[key]
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "compiles": self.compiles}
+
+
+validator_cache = ValidatorCache(settings.GRADER_CACHE_MAX_ENTRIES)
+
+
+def load_exercise(level_id: str, exercise_id: str) -> Optional[dict]:
+    """Grading view of an exercise (blocking; cached in memory like other content reads)"""
+    def load():
+        response = get_dynamodb_table().get_item(
+            Key={'PK': f'LEVEL#{level_id}', 'SK': f'EXERCISE#{exercise_id}'},
+            ProjectionExpression='exercise_id, exercise_type, answer_schema, config, #v',
+            ExpressionAttributeNames={'#v': 'version'}
+        )
+        return response.get('Item') or {}
+
+    # Memory tier only: a disk copy could outlive an answer-key edit made on another instance
+    return content_cache.get_or_load(("grading", level_id, exercise_id), load, disk=False) or None
+
+
+async def score_produced_sign(exercise: dict, frames) -> dict:
+    """Landmark score of a produced sign, through the sign micro-batcher (503 without NumPy)"""
+    # NumPy and the scorer are loaded on first use
+    from fastapi import HTTPException, status
+    from app.core import landmarks
+    from app.core.microbatch import sign_batcher
+
+    if not landmarks.available():
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Landmark scoring is not available")
+    return await sign_batcher.submit((exercise, frames))
+
+
+async def grade_answer(level_id: str, exercise_id: str, answer: Any) -> Optional[dict]:
+    """
+    Grade an answer to an exercise (None when the exercise does not exist).
+    CAMERA_PRODUCE answers are scored from their landmarks first; the result
+    then also carries the similarity.
+    """
+    exercise = await run_in_threadpool(load_exercise, level_id, exercise_id)
+    if exercise is None:
+        return None
+    validator = validator_cache.get(exercise)
+    if not getattr(validator, "from_landmarks", False):
+        return validator.grade(answer)
+
+    frames = answer.get("frames") if isinstance(answer, dict) else None
+    if frames is None:
+        raise GradingError('CAMERA_PRODUCE answers are the hand landmarks: {"frames": [...]}')
+    similarity = (await score_produced_sign(exercise, frames))["similarity"]
+    return {**validator.grade(answer, similarity), "similarity": similarity}
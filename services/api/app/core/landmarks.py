@@ -0,0 +1,212 @@
+"""
+Landmark-sequence scoring for produced signs (CAMERA_PRODUCE exercises).
+
+The client sends the hand landmarks it tracked (frames x keypoints x xyz,
+e.g. 21 MediaPipe hand keypoints). The exercise's answer_schema.templates
+holds one or more reference sequences of the same layout. Scoring is all
+NumPy:
+
+1. normalize: per frame, translate so the wrist (keypoint 0) is the origin
+   and scale by the largest wrist-to-keypoint distance, so hand position,
+   camera distance and hand size do not matter
+2. resample to SIGN_RESAMPLE_FRAMES frames (linear interpolation), so DTW
+   cost is fixed whatever the clip length or frame rate
+3. dynamic time warping against each template: the cost matrices are one
+   batched broadcast operation, and the accumulated costs of all
+   (candidate, template) pairs are filled together one anti-diagonal at a
+   time (cells on a diagonal are independent), within a Sakoe-Chiba band.
+   score_batch runs many requests' pairs through the same pass (see
+   sign_batcher in app/core/microbatch.py)
+4. similarity = exp(-distance / SIGN_SIMILARITY_SCALE) for the closest
+   template, where distance is the per-keypoint RMS along the warping path;
+   it passes at config.required_confidence
+
+Templates come from the memory-mapped template index when it has them
+(app/core/template_index.py, already normalized, no copy), otherwise from
+answer_schema.templates, normalized once per exercise version (see
+TemplateSet and template_cache).
+"""
+from app.core.config import settings
+from app.core.grading import DEFAULT_REQUIRED_CONFIDENCE, GradingError, ValidatorCache
+from app.core.template_index import template_index
+
+try:
+    import numpy as np
+except ImportError:  # optional, landmark scoring is unavailable without it
+    np = None
+
+WRIST = 0
+COORDINATES = 3
+
+
+def available() -> bool:
+    return np is not None
+
+
+def to_array(frames) -> "np.ndarray":
+    """frames x keypoints x 3 float32 array (GradingError when the shape is wrong)"""
+    try:
+        array = np.asarray(frames, dtype=np.float32)
+    except (TypeError, ValueError):
+        raise GradingError("Landmarks must be a frames x keypoints x 3 array of numbers")
+    if array.ndim != 3 or array.shape[2] != COORDINATES or array.shape[1] <= WRIST:
+        raise GradingError("Landmarks must be a frames x keypoints x 3 array of numbers")
+    if not 2 <= array.shape[0] <= settings.SIGN_MAX_FRAMES:
+        raise GradingError(f"Between 2 and {settings.SIGN_MAX_FRAMES} frames are required")
+    if not np.isfinite(array).all():
+        raise GradingError("Landmarks must be finite numbers")
+    return array
+
+
+def normalize(sequence: "np.ndarray", frames: int) -> "np.ndarray":
+    """Wrist-centred, hand-size-scaled sequence resampled to `frames`, flattened to frames x (keypoints*3)"""
+    centred = sequence - sequence[:, WRIST:WRIST + 1, :]
+    size = np.linalg.norm(centred, axis=2).max(axis=1)
+    centred /= np.maximum(size, 1e-6)[:, None, None]
+
+    flat = centred.reshape(len(centred), -1)
+    source = np.linspace(0.0, 1.0, len(flat))
+    target = np.linspace(0.0, 1.0, frames)
+    # Linear interpolation of every column at once
+    position = np.interp(target, source, np.arange(len(flat), dtype=np.float64))
+    low = np.floor(position).astype(np.intp)
+    high = np.minimum(low + 1, len(flat) - 1)
+    weight = (position - low)[:, None].astype(np.float32)
+    return flat[low] * (1.0 - weight) + flat[high] * weight
+
+
+def dtw_distances(a: "np.ndarray", b: "np.ndarray", band: int) -> "np.ndarray":
+    """
+    DTW distance of each pair (a[p], b[p]) of pairs x frames x features
+    sequences: accumulated Euclidean frame distance along the best path,
+    divided by n + m. All pairs advance through the wavefront together.
+    """
+    pairs, n, _ = a.shape
+    m = b.shape[1]
+    # In float64: float32 matmul results vary with the batch shape, and a score must not depend on its batch
+    a, b = a.astype(np.float64), b.astype(np.float64)
+    # Pairwise frame distances |a_i - b_j| in one broadcast: |a|^2 + |b|^2 - 2 a.b
+    squared = (a * a).sum(axis=2)[:, :, None] + (b * b).sum(axis=2)[:, None, :] - 2.0 * np.matmul(a, b.transpose(0, 2, 1))
+    cost = np.sqrt(np.maximum(squared, 0.0))
+    if band < max(n, m):
+        rows, columns = np.indices((n, m))
+        cost[:, np.abs(rows * (m / n) - columns) > band] = np.inf
+
+    accumulated = np.full((pairs, n + 1, m + 1), np.inf)
+    accumulated[:, 0, 0] = 0.0
+    for diagonal in range(2, n + m + 1):
+        i = np.arange(max(1, diagonal - m), min(n, diagonal - 1) + 1)
+        j = diagonal - i
+        best = np.minimum(np.minimum(accumulated[:, i - 1, j - 1], accumulated[:, i - 1, j]), accumulated[:, i, j - 1])
+        accumulated[:, i, j] = cost[:, i - 1, j - 1] + best
+    return accumulated[:, n, m] / (n + m)
+
+
+def dtw_band() -> int:
+    return max(1, int(settings.SIGN_DTW_BAND * settings.SIGN_RESAMPLE_FRAMES))
+
+
+def normalize_templates(raw) -> "np.ndarray":
+    """count x SIGN_RESAMPLE_FRAMES x (keypoints*3) array of normalized templates"""
+    arrays = [to_array(template) for template in raw]
+    keypoints = arrays[0].shape[1]
+    if any(array.shape[1] != keypoints for array in arrays):
+        raise GradingError("Exercise templates have different keypoint counts")
+    return np.stack([normalize(array, settings.SIGN_RESAMPLE_FRAMES) for array in arrays])
+
+
+class TemplateSet:
+    """An exercise's reference sequences, normalized once, plus its pass threshold"""
+    __slots__ = ("templates", "keypoints", "required_confidence")
+
+    def __init__(self, exercise: dict):
+        config = exercise.get("config") or {}
+        self.required_confidence = float(config.get("required_confidence") or DEFAULT_REQUIRED_CONFIDENCE)
+        indexed = template_index.lookup(exercise["exercise_id"], config.get("model_version"))
+        if indexed is not None:
+            self.templates = indexed
+            self.keypoints = indexed.shape[2] // COORDINATES
+            return
+
+        answer_schema = exercise.get("answer_schema") or {}
+        raw = answer_schema.get("templates")
+        if not raw:
+            raise GradingError("Exercise has no landmark templates")
+        self.templates = normalize_templates(raw)
+        self.keypoints = self.templates.shape[2] // COORDINATES
+
+    def prepare(self, frames) -> tuple:
+        """(normalized candidate, original frame count) for a landmark sequence"""
+        sequence = to_array(frames)
+        if sequence.shape[1] != self.keypoints:
+            raise GradingError(f"Expected {self.keypoints} keypoints per frame, got {sequence.shape[1]}")
+        return normalize(sequence, settings.SIGN_RESAMPLE_FRAMES), int(sequence.shape[0])
+
+    def result(self, distances: "np.ndarray", frames: int) -> dict:
+        """Score for the DTW distances of one candidate to each template"""
+        # Per-keypoint RMS, so the scale does not depend on the keypoint count
+        distances = distances / np.sqrt(self.keypoints)
+        best = int(np.argmin(distances))
+        similarity = float(np.exp(-distances[best] / settings.SIGN_SIMILARITY_SCALE))
+        return {
+            "similarity": round(similarity, 4),
+            "passed": similarity >= self.required_confidence,
+            "required_confidence": self.required_confidence,
+            "distance": round(float(distances[best]), 6),
+            "template": best,
+            "frames": frames
+        }
+
+    def score(self, frames) -> dict:
+        """Similarity (0-1) of a landmark sequence to the closest template, and whether it passes"""
+        candidate, count = self.prepare(frames)
+        distances = dtw_distances(np.broadcast_to(candidate, self.templates.shape), self.templates, dtw_band())
+        return self.result(distances, count)
+
+
+def compile_templates(exercise: dict) -> TemplateSet:
+    if exercise.get("exercise_type") != "CAMERA_PRODUCE":
+        raise GradingError("Only CAMERA_PRODUCE exercises are scored from landmarks")
+    return TemplateSet(exercise)
+
+
+template_cache = ValidatorCache(settings.SIGN_TEMPLATE_CACHE_MAX_ENTRIES, compile=compile_templates)
+
+
+def score_landmarks(exercise: dict, frames) -> dict:
+    """Score a landmark sequence against an exercise item's templates (blocking, CPU only)"""
+    return template_cache.get(exercise).score(frames)
+
+
+def score_batch(jobs: list) -> list:
+    """
+    Score many (exercise item, frames) jobs with one DTW computation per
+    keypoint layout; returns a result dict or the exception for each job.
+    """
+    results = [None] * len(jobs)
+    groups = {}
+    for index, (exercise, frames) in enumerate(jobs):
+        try:
+            template_set = template_cache.get(exercise)
+            candidate, count = template_set.prepare(frames)
+        except Exception as e:
+            results[index] = e
+            continue
+        groups.setdefault(candidate.shape[1], []).append((index, template_set, candidate, count))
+
+    for prepared in groups.values():
+        try:
+            candidates = np.concatenate([
+                np.broadcast_to(candidate, template_set.templates.shape) for _, template_set, candidate, _ in prepared
+            ])
+            templates = np.concatenate([template_set.templates for _, template_set, _, _ in prepared])
+            distances = dtw_distances(candidates, templates, dtw_band())
+            offset = 0
+            for index, template_set, _, count in prepared:
+                size = len(template_set.templates)
+                results[index] = template_set.result(distances[offset:offset + size], count)
+                offset += size
+        except Exception as e:
+            for index, _, _, _ in prepared:
+                results[index] = e
+    return results
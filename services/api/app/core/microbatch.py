@@ -0,0 +1,185 @@
+"""
+Micro-batching of CPU-bound scoring requests.
+
+Concurrent callers submit one item each. A collector task takes the first
+waiting item, gathers more for up to max_wait_ms (or until max_batch_size),
+and hands the whole batch to process_batch on a worker thread, which returns
+one result - or one exception - per item. Each caller's future is resolved
+with its own result.
+
+At most max_workers batches run at once. While they run, new requests keep
+queueing, so batches grow with load: an idle server scores a request after
+at most max_wait_ms, a busy one amortizes the per-call overhead (and NumPy's
+per-operation overhead) over a whole batch. Beyond max_queue waiting items
+requests are rejected with 503, like the password hasher pool.
+
+The queue, the worker semaphore and the collector are created together on
+first submit in the running event loop (and again if the loop changes, e.g.
+between Lambda invocations). The collector hands its own semaphore to the
+batches it starts, so batches of an old loop never release a newer one.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+import asyncio
+import threading
+import time
+from fastapi import HTTPException, status
+from app.core import landmarks
+from app.core.config import settings
+
+
+class MicroBatcher:
+    """Groups concurrent submits into batches for process_batch(items) -> results"""
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int,
+        max_wait_ms: float,
+        max_workers: int,
+        max_queue: int,
+        name: str = "batch"
+    ):
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max_queue
+        self.name = name
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._loop = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._collector = None
+        self._lock = threading.Lock()
+        self._max_depth = 0
+        self._running = 0
+        self._batches = 0
+        self._items = 0
+        self._last_batch_size = 0
+        self._largest_batch = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_run = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=self.name
+            )
+        return self._executor
+
+    def _start(self, loop) -> asyncio.Queue:
+        """Queue and collector (with its worker semaphore) for the running loop, created on first use"""
+        if self._loop is not loop or self._collector is None or self._collector.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._collector = asyncio.ensure_future(self._collect(self._queue, asyncio.Semaphore(self.max_workers)))
+        return self._queue
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and await its result (raises the item's exception)"""
+        queue = self._start(asyncio.get_running_loop())
+        if queue.qsize() >= self.max_queue:
+            with self._lock:
+                self._rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent scoring requests, retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        future = self._loop.create_future()
+        queue.put_nowait((item, future, time.perf_counter()))
+        with self._lock:
+            self._max_depth = max(self._max_depth, queue.qsize())
+        return await future
+
+    async def _collect(self, queue: asyncio.Queue, workers: asyncio.Semaphore):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await workers.acquire()
+            # Whatever arrived while every worker was busy rides along
+            while len(batch) < self.max_batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            asyncio.ensure_future(self._run(batch, workers))
+
+    async def _run(self, batch: list, workers: asyncio.Semaphore):
+        try:
+            # Callers that gave up (disconnect, timeout) are not scored
+            batch = [entry for entry in batch if not entry[1].done()]
+            if not batch:
+                return
+            started = time.perf_counter()
+            waits = [started - submitted_at for _, _, submitted_at in batch]
+            with self._lock:
+                self._running += 1
+            try:
+                results = await asyncio.get_running_loop().run_in_executor(
+                    self._get_executor(), self.process_batch, [item for item, _, _ in batch]
+                )
+            except Exception as e:
+                results = [e] * len(batch)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._batches += 1
+                    self._items += len(batch)
+                    self._last_batch_size = len(batch)
+                    self._largest_batch = max(self._largest_batch, len(batch))
+                    self._total_wait += sum(waits)
+                    self._max_wait = max(self._max_wait, max(waits))
+                    self._total_run += time.perf_counter() - started
+
+            for (_, future, _), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        finally:
+            workers.release()
+
+    def stats(self) -> dict:
+        """Queue depth and batch-size metrics"""
+        with self._lock:
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queued": self._queue.qsize() if self._queue is not None else 0,
+                "max_queued": self._max_depth,
+                "running": self._running,
+                "batches": self._batches,
+                "items": self._items,
+                "rejected": self._rejected,
+                "avg_batch_size": (self._items / self._batches) if self._batches else 0.0,
+                "last_batch_size": self._last_batch_size,
+                "largest_batch_size": self._largest_batch,
+                "avg_wait_ms": (self._total_wait / self._items * 1000) if self._items else 0.0,
+                "max_wait_ms_seen": self._max_wait * 1000,
+                "avg_batch_ms": (self._total_run / self._batches * 1000) if self._batches else 0.0,
+            }
+
+
+# (exercise item, frames) -> landmarks.score_batch result
+sign_batcher = MicroBatcher(
+    landmarks.score_batch,
+    max_batch_size=settings.SIGN_BATCH_MAX_SIZE,
+    max_wait_ms=settings.SIGN_BATCH_MAX_WAIT_MS,
+    max_workers=settings.SIGN_BATCH_WORKERS,
+    max_queue=settings.SIGN_BATCH_MAX_QUEUE,
+    name="sign-score",
+)
@@ -0,0 +1,180 @@
+"""
+Display-order keys for topics, levels and exercises.
+
+Each orderable item carries two index attributes for the ordering GSI
+(ORDER_INDEX):
+- order_pk: the list it belongs to (TOPICS, TOPIC#<id>#LEVELS, LEVEL#<id>#EXERCISES)
+- order_sk: zero-padded position plus the item id (e.g. 000003#<level_id>)
+
+A query on order_pk therefore returns rows already in display order, which
+allows Limit/ExclusiveStartKey paging instead of reading and sorting the
+whole list.
+
+Published topics and levels also carry published_pk (same value as
+order_pk), which is removed while they are drafts. PUBLISHED_INDEX is keyed
+on it, so it is sparse: public lists read published rows only and drafts
+cost no read capacity there.
+
+Items written before these attributes existed are backfilled by
+scripts/migrate_order_keys.py.
+"""
+from typing import Optional, Tuple
+import base64
+import binascii
+import json
+from fastapi import HTTPException, status
+
+ORDER_INDEX = 'order_pk-order_sk-index'
+PUBLISHED_INDEX = 'published_pk-order_sk-index'
+
+POSITION_WIDTH = 6
+MAX_POSITION = 10 ** POSITION_WIDTH - 1
+# Items without a position sort last, as they did with int(x.get('position', 999))
+DEFAULT_POSITION = 999
+
+MAX_PAGE_SIZE = 100
+
+
+def topics_list_key() -> str:
+    return 'TOPICS'
+
+
+def levels_list_key(topic_id: str) -> str:
+    return f'TOPIC#{topic_id}#LEVELS'
+
+
+def exercises_list_key(level_id: str) -> str:
+    return f'LEVEL#{level_id}#EXERCISES'
+
+
+def position_key(position, item_id: str) -> str:
+    """Sort key for position (clamped to 0..MAX_POSITION); the id breaks ties"""
+    try:
+        value = int(position) if position is not None else DEFAULT_POSITION
+    except (TypeError, ValueError):
+        value = DEFAULT_POSITION
+    value = max(0, min(value, MAX_POSITION))
+    return f'{value:0{POSITION_WIDTH}d}#{item_id}'
+
+
+def order_keys(item: dict) -> dict:
+    """
+    Index attributes for a topic, level or exercise item ({} for other entity types).
+    published_pk is None for drafts, meaning the attribute must be absent.
+    """
+    entity_type = item.get('entity_type')
+    if entity_type == 'topic':
+        keys = {'order_pk': topics_list_key(), 'order_sk': position_key(item.get('order'), item['topic_id'])}
+    elif entity_type == 'level':
+        keys = {
+            'order_pk': levels_list_key(item['topic_id']),
+            'order_sk': position_key(item.get('position'), item['level_id'])
+        }
+    elif entity_type == 'exercise':
+        return {
+            'order_pk': exercises_list_key(item['level_id']),
+            'order_sk': position_key(item.get('position'), item['exercise_id'])
+        }
+    else:
+        return {}
+    keys['published_pk'] = keys['order_pk'] if item.get('is_published') else None
+    return keys
+
+
+def apply_order_keys(item: dict) -> dict:
+    """Set (or, for published_pk on drafts, remove) the index attributes on item before put_item"""
+    for name, value in order_keys(item).items():
+        if value is None:
+            item.pop(name, None)
+        else:
+            item[name] = value
+    return item
+
+
+def order_key_changes(item: dict, changed: set) -> Tuple[dict, list]:
+    """
+    (attributes to SET, attributes to REMOVE) keeping the index attributes in
+    step with a partial update. item holds the ids and the new values of the
+    changed fields; changed names the fields being updated.
+    """
+    keys = order_keys(item)
+    to_set, to_remove = {}, []
+    if changed & {'order', 'position'}:
+        to_set['order_pk'] = keys['order_pk']
+        to_set['order_sk'] = keys['order_sk']
+    if 'is_published' in changed and 'published_pk' in keys:
+        if keys['published_pk']:
+            to_set['published_pk'] = keys['published_pk']
+        else:
+            to_remove.append('published_pk')
+    return to_set, to_remove
+
+
+def encode_cursor(last_evaluated_key: Optional[dict]) -> Optional[str]:
+    """Opaque page cursor for a LastEvaluatedKey (None on the last page)"""
+    if not last_evaluated_key:
+        return None
+    raw = json.dumps(last_evaluated_key, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def cursor_key_names(published_only: bool = False) -> frozenset:
+    """Attributes of a LastEvaluatedKey from the ordering (or published) index: table keys plus index keys"""
+    return frozenset(('PK', 'SK', 'published_pk' if published_only else 'order_pk', 'order_sk'))
+
+
+def decode_cursor(cursor: Optional[str], order_pk: str, published_only: bool = False) -> Optional[dict]:
+    """
+    ExclusiveStartKey for a cursor from encode_cursor on the list order_pk
+    (400 when malformed, forged, or taken from another list or index).
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)
+    except (binascii.Error, ValueError):
+        key = None
+    partition = 'published_pk' if published_only else 'order_pk'
+    if not isinstance(key, dict) or set(key) != cursor_key_names(published_only) \
+            or not all(isinstance(v, str) and v for v in key.values()) or key[partition] != order_pk:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return key
+
+
+def query_ordered(
+    table,
+    order_pk: str,
+    limit: Optional[int] = None,
+    start_key: Optional[dict] = None,
+    published_only: bool = False,
+    **kwargs
+) -> Tuple[list, Optional[dict]]:
+    """
+    Items of one list in display order (published ones only from the sparse index).
+    With a limit, reads a single page and returns its LastEvaluatedKey;
+    without one, follows every page and returns (items, None).
+    """
+    from boto3.dynamodb.conditions import Key
+
+    partition = 'published_pk' if published_only else 'order_pk'
+    query = {
+        'IndexName': PUBLISHED_INDEX if published_only else ORDER_INDEX,
+        'KeyConditionExpression': Key(partition).eq(order_pk),
+        **kwargs
+    }
+    if start_key:
+        query['ExclusiveStartKey'] = start_key
+    if limit is not None:
+        query['Limit'] = limit
+        response = table.query(**query)
+        return response.get('Items', []), response.get('LastEvaluatedKey')
+
+    items = []
+    while True:
+        response = table.query(**query)
+        items.extend(response.get('Items', []))
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            return items, None
+        query['ExclusiveStartKey'] = last_key
@@ -0,0 +1,81 @@
+"""
+Partial updates of admin-edited items with optimistic concurrency.
+
+One UpdateItem sets only the provided attributes and bumps a `version`
+counter. Items written before versioning are treated as version 0. When
+the caller passes the version its edit was based on, the write is
+conditioned on it, so concurrent edits fail with 409 instead of
+overwriting each other. The updated item comes back from the same call
+(ReturnValues=ALL_NEW), so no second read is needed.
+
+Archived items (a topic or level whose cascade delete is running, see
+app/core/cascade.py) cannot be updated: an edit would put their ordering or
+published index keys back and show them in lists again. They get 404, like
+the gets.
+"""
+from datetime import datetime
+from typing import Iterable, Optional
+from fastapi import HTTPException, status
+
+
+def update_item(
+    table,
+    key: dict,
+    changes: dict,
+    user_id: str,
+    expected_version: Optional[int] = None,
+    remove: Iterable[str] = (),
+    entity: str = "Item"
+) -> dict:
+    """
+    SET changes (plus updated_at/updated_by/version) and REMOVE remove on an
+    existing item; returns the whole updated item.
+    404 when the item does not exist or is archived, 409 when its version is not expected_version.
+    """
+    values = dict(changes)
+    values['updated_at'] = datetime.utcnow().isoformat() + 'Z'
+    values['updated_by'] = user_id
+    names = {f'#u{i}': name for i, name in enumerate(values)}
+    expression_values = {f':u{i}': value for i, value in enumerate(values.values())}
+    assignments = [f'{alias} = :u{i}' for i, alias in enumerate(names)]
+
+    names['#version'] = 'version'
+    expression_values[':zero'] = 0
+    expression_values[':one'] = 1
+    assignments.append('#version = if_not_exists(#version, :zero) + :one')
+
+    expression = 'SET ' + ', '.join(assignments)
+    removed = [name for name in remove if name not in values]
+    if removed:
+        for i, name in enumerate(removed):
+            names[f'#r{i}'] = name
+        expression += ' REMOVE ' + ', '.join(f'#r{i}' for i in range(len(removed)))
+
+    condition = 'attribute_exists(PK) AND attribute_not_exists(archived_at)'
+    if expected_version is not None:
+        expression_values[':expected'] = expected_version
+        if expected_version == 0:
+            condition += ' AND (attribute_not_exists(#version) OR #version = :expected)'
+        else:
+            condition += ' AND #version = :expected'
+
+    try:
+        response = table.update_item(
+            Key=key,
+            UpdateExpression=expression,
+            ConditionExpression=condition,
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=expression_values,
+            ReturnValues='ALL_NEW',
+            ReturnValuesOnConditionCheckFailure='ALL_OLD'
+        )
+    except table.meta.client.exceptions.ConditionalCheckFailedException as e:
+        current = e.response.get('Item')
+        if not current or 'archived_at' in current:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"{entity} not found")
+        current_version = int(current.get('version', {}).get('N', 0))
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"{entity} was modified concurrently (version {current_version}, expected {expected_version})"
+        )
+    return response['Attributes']
@@ -0,0 +1,79 @@
+"""
+Sparse field selection (`fields=` query parameter).
+
+The requested attributes are pushed down to DynamoDB as a ProjectionExpression,
+so only those attributes are read, returned and serialized. Endpoints add the
+attributes they need internally (sort keys, ids for translation lookups,
+values for aggregates) as `required` and drop them again with trim().
+
+The kwargs from projection() fit get_item, query and the per-table part of
+batch_get_item alike. DynamoDB rejects overlapping paths (config and
+config.time_limit), so a path under another requested path is dropped: the
+parent already returns it.
+"""
+from typing import Iterable, Optional, Tuple
+import re
+from fastapi import HTTPException, status
+
+# Top-level or nested (config.time_limit) attribute paths
+FIELD_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_\-]*(\.[A-Za-z_][A-Za-z0-9_\-]*)*$")
+MAX_FIELDS = 50
+
+FIELDS_DESCRIPTION = "Comma-separated attributes to return (e.g. topic_id,slug,order)"
+
+
+def without_covered(paths: Iterable[str]) -> Tuple[str, ...]:
+    """Sorted paths minus those nested under another path in the set (config.time_limit under config)"""
+    paths = set(paths)
+    return tuple(sorted(
+        path for path in paths
+        if not any(path.startswith(parent + ".") for parent in paths)
+    ))
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Parse a fields= value into a sorted tuple of attribute paths (None = whole items)"""
+    if fields is None:
+        return None
+    paths = {path.strip() for path in fields.split(",") if path.strip()}
+    if not paths:
+        return None
+    if len(paths) > MAX_FIELDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_FIELDS} fields can be requested"
+        )
+    invalid = sorted(path for path in paths if not FIELD_PATTERN.match(path))
+    if invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid field names: {', '.join(invalid)}"
+        )
+    return without_covered(paths)
+
+
+def projection(fields: Optional[Tuple[str, ...]], required: Iterable[str] = ()) -> dict:
+    """ProjectionExpression kwargs for fields plus required attributes ({} when fields is None)"""
+    if fields is None:
+        return {}
+    aliases = {}
+    expressions = []
+    for path in without_covered(set(fields) | set(required)):
+        parts = []
+        for name in path.split("."):
+            if name not in aliases:
+                aliases[name] = f"#p{len(aliases)}"
+            parts.append(aliases[name])
+        expressions.append(".".join(parts))
+    return {
+        'ProjectionExpression': ", ".join(expressions),
+        'ExpressionAttributeNames': {alias: name for name, alias in aliases.items()}
+    }
+
+
+def trim(item: dict, fields: Optional[Tuple[str, ...]], keep: Iterable[str] = ('translation',)) -> dict:
+    """Drop attributes that were only projected for internal use"""
+    if fields is None:
+        return item
+    wanted = {path.split(".", 1)[0] for path in fields} | set(keep)
+    return {name: value for name, value in item.items() if name in wanted}
@@ -0,0 +1,162 @@
+"""
+Fast JSON responses.
+
+DynamoDB items come back from boto3 with Decimal numbers (and sets for SS/NS
+attributes), which FastAPI normally walks with jsonable_encoder before
+json.dumps. FastJSONResponse serializes them directly, with orjson when it is
+installed and the standard library otherwise.
+
+FastJSONRoute goes one step further for routes without a response_model: a
+plain dict or list returned by the endpoint is rendered straight away instead
+of going through jsonable_encoder first. Routes with a response_model are
+validated and encoded by FastAPI as usual.
+
+FastJSONRoute also negotiates the body format: a request with
+`Accept: application/msgpack` gets the same response shape encoded as
+MessagePack (Decimal and datetime encoded as in JSON). JSON stays the default,
+and errors are always JSON.
+"""
+from decimal import Decimal
+from functools import wraps
+from contextvars import ContextVar
+from typing import Any
+import asyncio
+import json
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.routing import request_response
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional, JSON only
+    msgpack = None
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+# Body format negotiated for the current request ("json" or "msgpack")
+response_format: ContextVar[str] = ContextVar("response_format", default="json")
+
+
+def _default(obj: Any) -> Any:
+    """Types neither encoder handles natively"""
+    if isinstance(obj, Decimal):
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, BaseModel):
+        return obj.dict()
+    # Anything else (bytes, Enum subclasses, dataclasses...) as FastAPI would encode it
+    return jsonable_encoder(obj)
+
+
+def _std_default(obj: Any) -> Any:
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    return _default(obj)
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(content: Any) -> bytes:
+        """Serialize content (Decimal, datetime and nested item maps included) to JSON bytes"""
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+else:
+    def dumps(content: Any) -> bytes:
+        """Serialize content (Decimal, datetime and nested item maps included) to JSON bytes"""
+        return json.dumps(
+            content, default=_std_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+
+
+def packb(content: Any) -> bytes:
+    """Serialize content to MessagePack with the same shape as dumps()"""
+    return msgpack.packb(content, default=_std_default, use_bin_type=True)
+
+
+def negotiate_format(accept: str) -> str:
+    """Body format for an Accept header: msgpack when it prefers MessagePack over JSON"""
+    if msgpack is None or "msgpack" not in accept:
+        return "json"
+    msgpack_q = json_q = 0.0
+    for part in accept.split(","):
+        media_type, _, params = part.strip().partition(";")
+        media_type = media_type.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_q = max(msgpack_q, q)
+        elif media_type == "application/json":
+            json_q = max(json_q, q)
+    return "msgpack" if msgpack_q > 0 and msgpack_q >= json_q else "json"
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps() (or packb() when the request negotiated MessagePack)"""
+
+    def render(self, content: Any) -> bytes:
+        if response_format.get() == "msgpack":
+            self.media_type = MSGPACK_MEDIA_TYPES[0]
+            return packb(content)
+        return dumps(content)
+
+
+def _plain_json_endpoint(endpoint, status_code):
+    """Wrap endpoint so plain dict/list results skip FastAPI's jsonable_encoder pass"""
+    def to_response(result):
+        if isinstance(result, (dict, list)):
+            return FastJSONResponse(result, status_code=status_code or 200)
+        return result
+
+    if asyncio.iscoroutinefunction(endpoint):
+        @wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            return to_response(await endpoint(*args, **kwargs))
+    else:
+        @wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            return to_response(endpoint(*args, **kwargs))
+    return wrapper
+
+
+class FastJSONRoute(APIRoute):
+    """APIRoute with JSON/MessagePack negotiation that renders plain dict/list results directly"""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, endpoint, **kwargs)
+        response_class = self.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+        if self.response_model is None and self.status_code not in (204, 304) \
+                and issubclass(response_class, JSONResponse):
+            # Endpoint signature (and so the OpenAPI schema) is unchanged; only the call is wrapped
+            self.dependant.call = _plain_json_endpoint(self.endpoint, self.status_code)
+            self.app = request_response(self.get_route_handler())
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def negotiating_handler(request: Request):
+            token = response_format.set(negotiate_format(request.headers.get("accept", "")))
+            try:
+                response = await handler(request)
+            finally:
+                response_format.reset(token)
+            response.headers.add_vary_header("Accept")
+            return response
+        return negotiating_handler
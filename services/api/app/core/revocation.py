@@ -0,0 +1,268 @@
+"""
+Access token revocation.
+
+Revoked token IDs (jti) are stored as TTL'd DynamoDB items and mirrored in
+process as a Bloom filter. A token whose jti is not in the filter is
+definitely not revoked, so the common case costs no round-trip. Filter hits
+are confirmed against a small exact set, falling back to one keyed read
+for false positives (which are then remembered).
+
+Other instances' revocations become visible after the next incremental sync
+(REVOCATION_SYNC_SECONDS). The entity_type GSI is eventually consistent, so
+each incremental sync starts REVOCATION_SYNC_SKEW_SECONDS before the cursor
+and skips the jtis it already loaded.
+
+If the first (cold start) sync fails, the error is logged and each token is
+checked with a keyed read instead; the sync is retried after
+REVOCATION_SYNC_SECONDS. If that read fails too, the check fails open, so a
+DynamoDB problem never turns authenticated requests into 500s. Reads use a
+single attempt with a REVOCATION_TIMEOUT_SECONDS timeout, and after a failed
+read the keyed checks are skipped (fail open) for
+REVOCATION_FAILURE_TTL_SECONDS, so an outage costs one timeout per TTL
+instead of one per request.
+"""
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+import asyncio
+import hashlib
+import math
+import threading
+import time
+from app.core.config import settings
+from app.core.database import get_dynamodb_table, get_fail_fast_table
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on blake2b)"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.num_bits = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
+
+
+class TokenRevocationList:
+    """In-process view of revoked jtis, synchronized from DynamoDB"""
+
+    def __init__(self, capacity: int, error_rate: float, max_exact: int = 4096):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.max_exact = max_exact
+        self._bloom = BloomFilter(capacity, error_rate)
+        # Small exact sets: jti -> exp (epoch seconds)
+        self._revoked: "OrderedDict[str, float]" = OrderedDict()
+        self._not_revoked: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._cursor = ''  # created_at of the newest synced revocation
+        # jti -> created_at of revocations inside the skew window (already in the filter)
+        self._recent: dict = {}
+        self._last_sync = 0.0
+        self._last_full_sync = 0.0
+        self._sync_failed_at: Optional[float] = None
+        self._lookup_failed_at: Optional[float] = None
+        self._sync_task: Optional[asyncio.Future] = None
+
+    @staticmethod
+    def _key(jti: str) -> dict:
+        return {'PK': f'REVOKED#{jti}', 'SK': 'METADATA'}
+
+    @staticmethod
+    def _table():
+        return get_fail_fast_table(settings.REVOCATION_TIMEOUT_SECONDS)
+
+    def _remember(self, cache: "OrderedDict[str, float]", jti: str, exp: float) -> None:
+        with self._lock:
+            cache[jti] = exp
+            cache.move_to_end(jti)
+            while len(cache) > self.max_exact:
+                cache.popitem(last=False)
+
+    async def is_revoked(self, jti: str) -> bool:
+        """Check a jti; only Bloom filter hits may cost a DynamoDB read"""
+        now = time.time()
+        exp = self._revoked.get(jti)
+        if exp is not None and exp > now:
+            return True
+
+        # Without a loaded filter (failed cold-start sync) every jti is checked by key
+        if await self._synced() and jti not in self._bloom:
+            return False
+
+        exp = self._not_revoked.get(jti)
+        if exp is not None and exp > now:
+            return False
+
+        return await self._lookup(jti, now)
+
+    async def _synced(self) -> bool:
+        """Whether the filter is loaded; loads it on cold start, schedules syncs otherwise"""
+        if self._last_full_sync != 0.0:
+            self._schedule_sync()
+            return True
+        if self._sync_failed_at is not None \
+                and time.monotonic() - self._sync_failed_at < settings.REVOCATION_SYNC_SECONDS:
+            return False
+        try:
+            await self._ensure_sync(full=True)
+            return True
+        except Exception as e:
+            self._sync_failed_at = time.monotonic()
+            print(f"Warning: Revocation list sync failed, checking tokens by key: {e}")
+            return False
+
+    async def _lookup(self, jti: str, now: float) -> bool:
+        """Keyed read of a jti's revocation item (fails open when the read fails)"""
+        if self._lookup_failed_at is not None \
+                and time.monotonic() - self._lookup_failed_at < settings.REVOCATION_FAILURE_TTL_SECONDS:
+            return False
+        try:
+            response = await run_in_threadpool(
+                self._table().get_item, Key=self._key(jti), ConsistentRead=True
+            )
+        except Exception as e:
+            self._lookup_failed_at = time.monotonic()
+            print(f"Warning: Revocation lookup failed for token {jti}, "
+                  f"skipping lookups for {settings.REVOCATION_FAILURE_TTL_SECONDS}s: {e}")
+            return False
+        self._lookup_failed_at = None
+        item = response.get('Item')
+        if item and int(item.get('ttl', 0)) > now:
+            self._remember(self._revoked, jti, float(item['ttl']))
+            return True
+        # Not revoked (a Bloom false positive when the filter is loaded): remember it briefly
+        self._remember(self._not_revoked, jti, now + settings.REVOCATION_SYNC_SECONDS)
+        return False
+
+    async def revoke(self, jti: str, exp: float) -> None:
+        """Revoke a jti until exp (the token's own expiry)"""
+        now = datetime.utcnow().isoformat() + 'Z'
+        item = {
+            **self._key(jti),
+            'entity_type': 'revoked_token',
+            'jti': jti,
+            'created_at': now,
+            'ttl': int(exp)
+        }
+        await run_in_threadpool(get_dynamodb_table().put_item, Item=item)
+        self._bloom.add(jti)
+        self._recent[jti] = now
+        with self._lock:
+            self._not_revoked.pop(jti, None)
+        self._remember(self._revoked, jti, float(exp))
+
+    def _schedule_sync(self) -> None:
+        """Start a background sync when one is due (never blocks the request)"""
+        now = time.monotonic()
+        if self._sync_task is not None and not self._sync_task.done():
+            return
+        full = now - self._last_full_sync >= settings.REVOCATION_FULL_SYNC_SECONDS
+        if full or now - self._last_sync >= settings.REVOCATION_SYNC_SECONDS:
+            self._sync_task = asyncio.ensure_future(run_in_threadpool(self.sync, full))
+            self._sync_task.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+    async def _ensure_sync(self, full: bool) -> None:
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.ensure_future(run_in_threadpool(self.sync, full))
+        await asyncio.shield(self._sync_task)
+
+    def sync(self, full: bool = False) -> int:
+        """
+        Pull revocations from DynamoDB (blocking).
+        Incremental syncs fetch items created since REVOCATION_SYNC_SKEW_SECONDS
+        before the cursor, so revocations that reached the GSI late are not
+        missed; a full sync rebuilds the filter so expired revocations drop out of it.
+        Returns the number of revocations loaded.
+        """
+        from boto3.dynamodb.conditions import Key
+
+        table = self._table()
+        cursor = '' if full else self._cursor
+        condition = Key('entity_type').eq('revoked_token')
+        if cursor:
+            condition = condition & Key('created_at').gte(_seconds_before(cursor, settings.REVOCATION_SYNC_SKEW_SECONDS))
+
+        bloom = BloomFilter(self.capacity, self.error_rate) if full else self._bloom
+        recent = {} if full else dict(self._recent)
+        now = time.time()
+        loaded = 0
+        query = {
+            'IndexName': settings.ENTITY_TYPE_INDEX,
+            'KeyConditionExpression': condition,
+            'ProjectionExpression': 'jti, created_at, #ttl',
+            'ExpressionAttributeNames': {'#ttl': 'ttl'}
+        }
+        while True:
+            response = table.query(**query)
+            for item in response.get('Items', []):
+                created_at = item.get('created_at', '')
+                cursor = max(cursor, created_at)
+                if item['jti'] in recent:
+                    continue
+                recent[item['jti']] = created_at
+                if int(item.get('ttl', 0)) > now:
+                    bloom.add(item['jti'])
+                    loaded += 1
+            if 'LastEvaluatedKey' not in response:
+                break
+            query['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        if full:
+            # Keep revocations made in this process while the query ran
+            with self._lock:
+                for jti, exp in self._revoked.items():
+                    if exp > now:
+                        bloom.add(jti)
+        if cursor:
+            # Only the skew window can be read again
+            since = _seconds_before(cursor, settings.REVOCATION_SYNC_SKEW_SECONDS)
+            recent = {jti: created_at for jti, created_at in recent.items() if created_at >= since}
+        self._bloom = bloom
+        self._recent = recent
+        self._cursor = cursor
+        self._last_sync = time.monotonic()
+        if full:
+            self._last_full_sync = self._last_sync
+        return loaded
+
+    def stats(self) -> dict:
+        return {
+            "bloom_entries": self._bloom.count,
+            "bloom_bytes": self._bloom.size_bytes,
+            "bloom_hashes": self._bloom.num_hashes,
+            "exact_revoked": len(self._revoked),
+            "known_false_positives": len(self._not_revoked),
+            "cursor": self._cursor,
+        }
+
+
+def _seconds_before(timestamp: str, seconds: int) -> str:
+    """created_at-formatted timestamp, seconds earlier"""
+    moment = datetime.fromisoformat(timestamp.rstrip('Z')) - timedelta(seconds=seconds)
+    return moment.isoformat(timespec='microseconds') + 'Z'
+
+
+revocation_list = TokenRevocationList(
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+)
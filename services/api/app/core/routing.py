@@ -0,0 +1,82 @@
+"""
+Router registration, eager or lazy.
+
+In lazy mode (LAZY_ROUTERS=true, the default for Lambda) each /v1 router
+module - and the heavy dependencies it imports - is loaded and mounted on
+the first request under its prefix instead of at import time.
+"""
+import importlib
+import threading
+from typing import Optional
+from fastapi import FastAPI
+
+# /v1/<prefix> -> module under app.api.v1
+V1_ROUTERS = {
+    "auth": "auth",
+    "languages": "languages",
+    "topics": "topics",
+    "levels": "levels",
+    "exercises": "exercises",
+    "progress": "progress",
+    "leaderboards": "leaderboards",
+    "batch": "batch",
+    "admin": "admin",
+}
+
+# Paths that need every router mounted (OpenAPI schema)
+SCHEMA_PATHS = ("/docs", "/redoc", "/openapi.json")
+
+_mount_lock = threading.Lock()
+
+
+def include_v1_router(app: FastAPI, module_name: str) -> None:
+    """Import app.api.v1.<module_name> and mount its router under /v1"""
+    module = importlib.import_module(f"app.api.v1.{module_name}")
+    app.include_router(module.router, prefix="/v1")
+
+
+def mount_pending_routers(app: FastAPI, prefixes: Optional[list] = None) -> None:
+    """Mount lazily registered routers now (all of them when prefixes is None)"""
+    pending = getattr(app.state, "pending_routers", None)
+    if not pending:
+        return
+    with _mount_lock:
+        for prefix in list(pending) if prefixes is None else prefixes:
+            module_name = pending.pop(prefix, None)
+            if module_name is not None:
+                include_v1_router(app, module_name)
+        if not pending:
+            # The schema may have been generated with routers missing
+            app.openapi_schema = None
+
+
+class LazyRouterMiddleware:
+    """ASGI middleware that mounts a /v1 router the first time it is requested"""
+
+    def __init__(self, app, fastapi_app: FastAPI):
+        self.app = app
+        self.fastapi_app = fastapi_app
+
+    def ensure_loaded(self, path: str) -> None:
+        """Mount whatever routers are needed to serve path"""
+        if not self.fastapi_app.state.pending_routers:
+            return
+        if path in SCHEMA_PATHS:
+            mount_pending_routers(self.fastapi_app)
+        elif path.startswith("/v1/"):
+            mount_pending_routers(self.fastapi_app, [path[len("/v1/"):].split("/", 1)[0]])
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            self.ensure_loaded(scope["path"])
+        await self.app(scope, receive, send)
+
+
+def register_v1_routers(app: FastAPI, lazy: bool = False) -> None:
+    """Mount every /v1 router now, or on first use when lazy"""
+    if lazy:
+        app.state.pending_routers = dict(V1_ROUTERS)
+        app.add_middleware(LazyRouterMiddleware, fastapi_app=app)
+    else:
+        for module_name in V1_ROUTERS.values():
+            include_v1_router(app, module_name)
@@ -0,0 +1,99 @@
+"""
+Snapshot cache with single-flight computation and stale-while-revalidate.
+Used for expensive aggregate reads (leaderboards) that are requested in bursts.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+@dataclass
+class Snapshot:
+    """A computed value and the moment it was computed"""
+    value: Any
+    computed_at: float  # time.monotonic(), used for freshness checks
+    as_of: str          # ISO-8601 UTC timestamp exposed to clients
+
+
+class SnapshotCache:
+    """
+    Bounded in-process cache of computed snapshots.
+
+    - Fresh snapshots are returned as-is.
+    - Stale snapshots (older than fresh_for but younger than fresh_for + stale_for)
+      are returned immediately while a single background refresh runs.
+    - Missing or expired snapshots are computed in the foreground; concurrent
+      callers for the same key await the same computation (single-flight).
+    """
+
+    def __init__(
+        self,
+        fresh_for: Callable[[Hashable], float],
+        stale_for: Callable[[Hashable], float],
+        max_entries: int = 256,
+    ):
+        self._fresh_for = fresh_for
+        self._stale_for = stale_for
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Snapshot]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def get(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Snapshot:
+        """Return a snapshot for key, computing or refreshing it as needed"""
+        snapshot = self._entries.get(key)
+        if snapshot is not None:
+            age = time.monotonic() - snapshot.computed_at
+            fresh_for = self._fresh_for(key)
+            if age < fresh_for:
+                self._entries.move_to_end(key)
+                return snapshot
+            if age < fresh_for + self._stale_for(key):
+                self._entries.move_to_end(key)
+                self._refresh(key, compute, background=True)
+                return snapshot
+
+        return await asyncio.shield(self._refresh(key, compute))
+
+    def peek(self, key: Hashable) -> Optional[Snapshot]:
+        """Return the cached snapshot for key without computing anything"""
+        return self._entries.get(key)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one snapshot, or every snapshot when key is None"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def _refresh(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        background: bool = False,
+    ) -> asyncio.Future:
+        """Start (or join) the single in-flight computation for key"""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._compute(key, compute))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+            if background:
+                # Background failures keep serving the stale snapshot
+                future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        return future
+
+    async def _compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Snapshot:
+        value = await compute()
+        snapshot = Snapshot(
+            value=value,
+            computed_at=time.monotonic(),
+            as_of=datetime.utcnow().isoformat() + 'Z',
+        )
+        self._entries[key] = snapshot
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return snapshot
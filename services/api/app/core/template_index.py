@@ -0,0 +1,97 @@
+"""
+Memory-mapped index of reference landmark templates for sign scoring.
+
+scripts/build_template_index.py packs every CAMERA_PRODUCE template into
+two files:
+- <name>.npy: one contiguous float32 array of templates that are already
+  normalized and resampled (app.core.landmarks.normalize)
+- <name>.index.json: {"resample_frames", "entries": {"<exercise_id>@<model_version>":
+  [offset, count, frames, keypoints]}}, where offset counts float32 values
+
+Nothing is read at import. On first lookup the index JSON is parsed and the
+array is opened with mmap_mode="r". Lookups return reshaped views of the
+mapping (no copy), and pages are shared between worker processes through
+the OS page cache. When the file was built for another SIGN_RESAMPLE_FRAMES,
+or has no entry for an exercise, the caller falls back to the templates in
+the exercise's answer_schema.
+"""
+from typing import Optional
+import json
+import os
+import threading
+from app.core.config import settings
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_MODEL_VERSION = "default"
+
+
+def index_key(exercise_id: str, model_version: Optional[str]) -> str:
+    return f"{exercise_id}@{model_version or DEFAULT_MODEL_VERSION}"
+
+
+def index_paths(path: str) -> tuple:
+    """(array path, index JSON path) for a .npy path (relative paths are under services/api)"""
+    if not os.path.isabs(path):
+        path = os.path.join(API_DIR, path)
+    json_path = (path[:-len(".npy")] if path.endswith(".npy") else path) + ".index.json"
+    return path, json_path
+
+
+class TemplateIndex:
+    """Lazily opened, read-only view of a packed template file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Optional[dict] = None
+        self._data = None
+        self._resample_frames = None
+        self._lock = threading.Lock()
+
+    def _open(self) -> bool:
+        """Map the files on first use; False when there is no usable index"""
+        if self._entries is not None:
+            return bool(self._entries)
+        with self._lock:
+            if self._entries is not None:
+                return bool(self._entries)
+            entries = {}
+            array_path, json_path = index_paths(self.path)
+            if self.path and os.path.exists(array_path) and os.path.exists(json_path):
+                try:
+                    import numpy as np
+                    with open(json_path, encoding="utf-8") as f:
+                        meta = json.load(f)
+                    self._data = np.load(array_path, mmap_mode="r")
+                    self._resample_frames = meta.get("resample_frames")
+                    entries = meta.get("entries", {})
+                except Exception as e:
+                    print(f"Warning: Template index {array_path} unusable: {e}")
+                    entries = {}
+            self._entries = entries
+        return bool(entries)
+
+    def lookup(self, exercise_id: str, model_version: Optional[str] = None):
+        """
+        count x frames x (keypoints*3) view of an exercise's normalized templates,
+        or None when the index has none for it at the configured resample length.
+        """
+        if not self._open() or self._resample_frames != settings.SIGN_RESAMPLE_FRAMES:
+            return None
+        entry = self._entries.get(index_key(exercise_id, model_version))
+        if entry is None:
+            return None
+        offset, count, frames, keypoints = entry
+        size = count * frames * keypoints * 3
+        return self._data[offset:offset + size].reshape(count, frames, keypoints * 3)
+
+    def stats(self) -> dict:
+        opened = self._entries is not None
+        return {
+            "path": self.path,
+            "opened": opened,
+            "entries": len(self._entries) if opened else None,
+            "bytes": int(self._data.nbytes) if self._data is not None else 0
+        }
+
+
+template_index = TemplateIndex(settings.SIGN_TEMPLATE_INDEX_PATH)
@@ -0,0 +1,151 @@
+"""
+Warm-up for provisioned or pre-warmed containers.
+
+Establishes DynamoDB/S3 connections, mounts lazily registered routers and
+preloads the published catalog and hot leaderboard snapshots into the
+in-process caches, so the first real requests skip those costs.
+
+It runs through the normal Mangum handler: lambda handlers turn a warm-up
+invocation ({"warmup": true}, e.g. from a scheduled rule) into a synthetic
+POST /internal/warmup request (see build_warmup_event). The route only
+accepts events built that way, so it cannot be triggered through API Gateway.
+"""
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+import inspect
+import os
+import time
+from app.core.config import settings
+from app.core.database import get_dynamodb_table, get_s3_client
+from app.core.routing import mount_pending_routers
+from app.core.responses import FastJSONRoute
+
+WARMUP_PATH = "/internal/warmup"
+
+router = APIRouter(include_in_schema=False, route_class=FastJSONRoute)
+
+# Reported by /readyz
+warmup_state = {
+    "finished": False,
+    "finished_at": None,
+    "timings_ms": {},
+    "errors": {},
+}
+
+
+def is_warmup_event(event: dict) -> bool:
+    """Raw Lambda events that request a warm-up"""
+    return isinstance(event, dict) and (
+        event.get("warmup") is True or event.get("source") == "serverless-plugin-warmup"
+    )
+
+
+def build_warmup_event(include_leaderboards: bool = True) -> dict:
+    """Synthetic API Gateway HTTP API event for POST /internal/warmup"""
+    path = WARMUP_PATH
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": path,
+        "rawQueryString": "" if include_leaderboards else "leaderboards=false",
+        "headers": {"host": "localhost", "content-type": "application/json"},
+        "requestContext": {
+            "accountId": "internal", "apiId": "warmup", "domainName": "localhost",
+            "domainPrefix": "warmup", "requestId": "warmup", "routeKey": "$default",
+            "stage": "$default", "time": datetime.utcnow().strftime("%d/%b/%Y:%H:%M:%S +0000"),
+            "timeEpoch": int(time.time() * 1000),
+            "http": {"method": "POST", "path": path, "protocol": "HTTP/1.1",
+                     "sourceIp": "127.0.0.1", "userAgent": "warmup"}
+        },
+        "isBase64Encoded": False,
+        # Not settable by API Gateway clients: marks the event as internal
+        "warmup": True,
+    }
+
+
+# Default query parameters of the public list endpoints (what a plain GET is served)
+CATALOG_QUERY = {
+    "published_only": True, "fields": None, "limit": None, "cursor": None, "current_user": None
+}
+
+
+async def preload_catalog() -> int:
+    """Load languages, published topics and their levels into the content cache"""
+    from app.api.v1 import languages, topics, levels
+
+    loaded = 0
+    language_list = (await languages.list_languages(fields=None))["languages"]
+    loaded += 1
+    codes = [lang.get("code") or lang["PK"].split("#", 1)[-1] for lang in language_list]
+
+    topic_list = (await topics.list_topics(language=None, **CATALOG_QUERY))["topics"]
+    loaded += 1
+    for code in codes:
+        await topics.list_topics(language=code, **CATALOG_QUERY)
+        loaded += 1
+
+    for topic in topic_list:
+        await levels.list_levels_by_topic(topic["topic_id"], language=None, **CATALOG_QUERY)
+        loaded += 1
+    return loaded
+
+
+async def preload_leaderboards() -> int:
+    """Compute the default leaderboard snapshots for the configured hot scopes"""
+    from app.api.v1 import leaderboards
+
+    for scope in settings.WARMUP_LEADERBOARD_SCOPES:
+        await leaderboards.get_leaderboard_snapshot(scope)
+    return len(settings.WARMUP_LEADERBOARD_SCOPES)
+
+
+async def run_warmup(app, include_leaderboards: bool = True) -> dict:
+    """Run every warm-up step and return a timing breakdown (failures are reported, not raised)"""
+    timings, errors = {}, {}
+    started = time.perf_counter()
+
+    async def step(name, func, *args):
+        start = time.perf_counter()
+        try:
+            result = func(*args)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            errors[name] = str(e)
+        timings[name] = round((time.perf_counter() - start) * 1000, 2)
+
+    await step("routers", mount_pending_routers, app)
+    await step("dynamodb", run_in_threadpool,
+               lambda: get_dynamodb_table().get_item(Key={'PK': 'WARMUP', 'SK': 'WARMUP'}))
+    await step("s3", run_in_threadpool,
+               lambda: get_s3_client().head_bucket(Bucket=settings.S3_BUCKET))
+    await step("catalog", preload_catalog)
+    if include_leaderboards:
+        await step("leaderboards", preload_leaderboards)
+    timings["total"] = round((time.perf_counter() - started) * 1000, 2)
+
+    warmup_state.update({
+        "finished": True,
+        "finished_at": datetime.utcnow().isoformat() + 'Z',
+        "timings_ms": timings,
+        "errors": errors,
+    })
+    return warmup_state
+
+
+def should_warm_up_on_init() -> bool:
+    """WARMUP_ON_INIT: true, false, or auto (only for provisioned concurrency)"""
+    mode = settings.WARMUP_ON_INIT.lower()
+    if mode == "auto":
+        return os.environ.get("AWS_LAMBDA_INITIALIZATION_TYPE") == "provisioned-concurrency"
+    return mode == "true"
+
+
+@router.post(WARMUP_PATH)
+async def warmup(request: Request, leaderboards: bool = True):
+    """Run the warm-up routine (internal Lambda invocations only)"""
+    event = request.scope.get("aws.event") or {}
+    if event.get("warmup") is not True:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return await run_warmup(request.app, include_leaderboards=leaderboards)
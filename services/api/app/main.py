@@ -1,13 +1,18 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.v1 import auth, languages, topics, levels, exercises, progress, leaderboards
+from app.core.config import settings
+from app.core.routing import register_v1_routers
+from app.core import warmup
+from app.core.compression import CompressionMiddleware, compressed_cache
+from app.core.responses import FastJSONResponse
 
 app = FastAPI(
     title="Aplicación Señas API",
     description="Secure gamified sign language learning API with JWT auth",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse
 )
 
 # CORS middleware
@@ -17,6 +22,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE"],
     allow_headers=["*"],
+    expose_headers=["X-Leaderboard-As-Of"],
+)
+
+# Compress large JSON responses (gzip, or brotli when installed)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    cache=compressed_cache,
 )
 
 # Health endpoints
@@ -27,8 +40,12 @@ async def health_check():
 
 @app.get("/readyz", tags=["health"])
 async def readiness_check():
-    """Readiness check"""
-    return {"status": "ready"}
+    """Readiness check (reports whether container warm-up has finished)"""
+    return {
+        "status": "ready",
+        "warmed_up": warmup.warmup_state["finished"],
+        "warmup": warmup.warmup_state
+    }
 
 @app.get("/", tags=["root"])
 async def root():
@@ -44,16 +61,14 @@ async def root():
             "levels": "/v1/levels (CRUD - admin protected)",
             "exercises": "/v1/exercises (CRUD - admin protected)",
             "progress": "/v1/progress (user progress tracking)",
-            "leaderboards": "/v1/leaderboards (rankings - global, topic, level)"
+            "leaderboards": "/v1/leaderboards (rankings - global, topic, level)",
+            "batch": "/v1/batch (several GET reads in one request)",
+            "admin": "/v1/admin/import, /v1/admin/jobs/{job_id} (bulk import, job status - admin protected)"
         },
         "authentication": "JWT Bearer token required for protected endpoints"
     }
 
-# Include routers
-app.include_router(auth.router, prefix="/v1")
-app.include_router(languages.router, prefix="/v1")
-app.include_router(topics.router, prefix="/v1")
-app.include_router(levels.router, prefix="/v1")
-app.include_router(exercises.router, prefix="/v1")
-app.include_router(progress.router, prefix="/v1")
-app.include_router(leaderboards.router, prefix="/v1")
+# Include routers (loaded on first use when LAZY_ROUTERS is enabled)
+register_v1_routers(app, lazy=settings.LAZY_ROUTERS)
+app.include_router(warmup.router)
+
@@ -1,5 +1,27 @@
+import os
+
+# Mount routers and import their heavy dependencies on first use
+os.environ.setdefault("LAZY_ROUTERS", "true")
+
 from mangum import Mangum
 from app.main import app
+from app.core.database import get_dynamodb_table
+from app.core.warmup import build_warmup_event, is_warmup_event, should_warm_up_on_init
+
+# Build AWS clients during the Lambda init phase so requests reuse them
+get_dynamodb_table()
 
 # Mangum handler for AWS Lambda
-handler = Mangum(app)
+asgi_handler = Mangum(app)
+
+
+def handler(event, context):
+    """Lambda entry point; warm-up invocations are routed through Mangum as POST /internal/warmup"""
+    if is_warmup_event(event):
+        event = build_warmup_event()
+    return asgi_handler(event, context)
+
+
+# Provisioned / pre-warmed containers warm up during init (WARMUP_ON_INIT)
+if should_warm_up_on_init():
+    handler({"warmup": True}, None)
@@ -1,10 +1,10 @@
 #!/usr/bin/env bash
 set -euo pipefail
 
-# Packages the example FastAPI app into a zip suitable for AWS Lambda (zip with requirements installed).
+# Packages the FastAPI app into a zip suitable for AWS Lambda (zip with requirements installed).
 # This script creates a temporary folder, installs dependencies, copies source, and zips.
 
-OUT=build/lambda_package.zip
+OUT=lambda_package.zip
 rm -rf build
 mkdir -p build
 
@@ -14,9 +14,15 @@ pip install --upgrade pip
 pip install -r requirements.txt -t build/python
 
 cp lambda_handler.py build/
+cp -r app build/
+# Packed sign templates (scripts/build_template_index.py), memory-mapped at runtime
+if [ -d data ]; then
+  cp -r data build/
+fi
+find build/app -name '__pycache__' -prune -exec rm -rf {} +
 
 pushd build
-zip -r ../lambda_package.zip .
+zip -r "../$OUT" .
 popd
 
-echo "Packaged $OUT"
+echo "Packaged $OUT (handler lambda_handler.handler)"
@@ -0,0 +1,105 @@
+"""
+Benchmark of authentication overhead per request on the progress endpoints.
+
+Compares get_current_user with the verified-token cache disabled (jwt.decode on
+every request) and enabled, both in isolation and end-to-end through the
+/v1/progress routes (DynamoDB replaced by an in-memory table, and the
+revocation list by a stub, so only the app and auth overhead are measured).
+
+Usage (from services/api):
+    python scripts/bench_auth.py [iterations]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.testclient import TestClient
+
+from app.core import auth
+from app.api.v1 import progress
+from app.main import app
+
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+
+class InMemoryProgressTable:
+    """Minimal table returning a fixed progress item (no network)"""
+    item = {
+        'PK': 'USER#bench', 'SK': 'PROGRESS#ex-1', 'entity_type': 'user_progress',
+        'user_id': 'bench', 'exercise_id': 'ex-1', 'level_id': 'lvl-1',
+        'status': 'completed', 'best_score': '90', 'attempts': 2
+    }
+
+    def get_item(self, Key, **kwargs):
+        return {'Item': dict(self.item)}
+
+    def query(self, **kwargs):
+        return {'Items': [dict(self.item) for _ in range(10)]}
+
+
+class NothingRevoked:
+    """Revocation list stub: no token is revoked (no DynamoDB sync or lookups)"""
+
+    async def is_revoked(self, jti):
+        return False
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def report(label, samples):
+    print(f"  {label:<28} p50={percentile(samples, 50) * 1e6:8.1f}us  "
+          f"p95={percentile(samples, 95) * 1e6:8.1f}us  mean={statistics.mean(samples) * 1e6:8.1f}us")
+
+
+def bench_dependency(token):
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    loop = asyncio.new_event_loop()
+    samples = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        loop.run_until_complete(auth.get_current_user(credentials))
+        samples.append(time.perf_counter() - start)
+    loop.close()
+    return samples
+
+
+def bench_endpoint(client, path, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    samples = []
+    for _ in range(ITERATIONS // 10):
+        start = time.perf_counter()
+        response = client.get(path, headers=headers)
+        samples.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.text
+    return samples
+
+
+def main():
+    token = auth.create_access_token({"sub": "bench", "email": "bench@example.com", "role": "user"})
+    progress.get_dynamodb_table = lambda: InMemoryProgressTable()
+    auth.revocation_list = NothingRevoked()
+    client = TestClient(app)
+    max_entries = auth.token_cache.max_entries
+
+    print(f"Auth overhead ({ITERATIONS} iterations)")
+    for label, entries in (("jwt.decode every request", 0), ("verified-token cache", max_entries)):
+        auth.token_cache.clear()
+        auth.token_cache.max_entries = entries
+        print(f"\n{label}:")
+        report("get_current_user", bench_dependency(token))
+        for path in ("/v1/progress/summary", "/v1/progress/exercise/ex-1", "/v1/progress/level/lvl-1"):
+            report(path, bench_endpoint(client, path, token))
+
+    auth.token_cache.max_entries = max_entries
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Cold-start benchmark for the Lambda handler.
+
+Each run launches a fresh interpreter that imports the handler (Lambda init
+phase), serves one request through Mangum with an API Gateway HTTP API
+event, then serves --warm more requests to measure warm latency. Results are
+appended to a JSONL history file so cold-start cost can be tracked over time
+(one line per benchmark run, tagged with the commit).
+
+cold_ms is init plus the first request: with lazy routers the requested
+router is loaded on that request, so init alone understates the cold start.
+--compare benchmarks lazy and eager router loading side by side on a content
+read (/v1/topics unless --path is given).
+
+Usage (from services/api):
+    python scripts/bench_cold_start.py [--runs 10] [--warm 50] [--path /healthz] [--eager]
+                                       [--handler lambda_handler] [--compare]
+                                       [--history scripts/cold_start_history.jsonl]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r'''
+import json, sys, time
+start = time.perf_counter()
+import {handler} as entry
+init_ms = (time.perf_counter() - start) * 1000
+
+class Context:
+    function_name = "bench"
+    aws_request_id = "bench"
+
+path = {path!r}
+event = {{
+    "version": "2.0",
+    "routeKey": "$default",
+    "rawPath": path,
+    "rawQueryString": "",
+    "headers": {{"host": "localhost", "accept": "application/json"}},
+    "requestContext": {{
+        "accountId": "000000000000", "apiId": "bench", "domainName": "localhost",
+        "domainPrefix": "bench", "requestId": "bench", "routeKey": "$default",
+        "stage": "$default", "time": "01/Jan/2025:00:00:00 +0000", "timeEpoch": 0,
+        "http": {{"method": "GET", "path": path, "protocol": "HTTP/1.1",
+                 "sourceIp": "127.0.0.1", "userAgent": "bench"}}
+    }},
+    "isBase64Encoded": False
+}}
+start = time.perf_counter()
+response = entry.handler(event, Context())
+first_ms = (time.perf_counter() - start) * 1000
+warm = []
+for _ in range({warm}):
+    start = time.perf_counter()
+    entry.handler(event, Context())
+    warm.append((time.perf_counter() - start) * 1000)
+warm.sort()
+print(json.dumps({{"init_ms": init_ms, "first_request_ms": first_ms, "cold_ms": init_ms + first_ms,
+                  "warm_request_ms": warm[len(warm) // 2] if warm else 0.0,
+                  "status": response["statusCode"]}}))
+'''
+
+
+METRICS = ("init_ms", "first_request_ms", "cold_ms", "warm_request_ms", "process_ms")
+
+
+def run_once(handler: str, path: str, lazy: bool, warm: int) -> dict:
+    env = dict(os.environ, LAZY_ROUTERS="true" if lazy else "false")
+    wall_start = datetime.utcnow()
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD.format(handler=handler, path=path, warm=warm)],
+        cwd=API_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Cold-start run failed:\n{result.stderr}")
+    sample = json.loads(result.stdout.strip().splitlines()[-1])
+    if sample["status"] != 200:
+        raise SystemExit(f"{handler} answered {path} with {sample['status']}")
+    sample["process_ms"] = (datetime.utcnow() - wall_start).total_seconds() * 1000
+    return sample
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=API_DIR, capture_output=True, text=True
+        ).stdout.strip()
+    except OSError:
+        return ""
+
+
+def benchmark(lazy: bool, args) -> dict:
+    """Run the cold-start benchmark for one router loading mode and summarize it"""
+    samples = [run_once(args.handler, args.path, lazy, args.warm) for _ in range(args.runs)]
+    summary = {
+        "timestamp": datetime.utcnow().isoformat() + 'Z',
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "handler": args.handler,
+        "mode": "lazy" if lazy else "eager",
+        "path": args.path,
+        "runs": args.runs,
+        "warm_requests": args.warm,
+    }
+    for metric in METRICS:
+        values = [s[metric] for s in samples]
+        summary[f"{metric}_p50"] = round(statistics.median(values), 2)
+        summary[f"{metric}_max"] = round(max(values), 2)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--warm", type=int, default=50, help="warm requests per run")
+    parser.add_argument("--path", help="request path (default: /healthz, /v1/topics with --compare)")
+    parser.add_argument("--handler", default="lambda_handler")
+    parser.add_argument("--compare", action="store_true",
+                        help="benchmark lazy and eager router loading side by side")
+    parser.add_argument("--eager", action="store_true", help="disable lazy router loading")
+    parser.add_argument("--history", default=os.path.join(API_DIR, "scripts", "cold_start_history.jsonl"))
+    args = parser.parse_args()
+    if args.path is None:
+        args.path = "/v1/topics" if args.compare else "/healthz"
+
+    modes = [True, False] if args.compare else [not args.eager]
+    summaries = [benchmark(lazy, args) for lazy in modes]
+
+    print(f"{args.handler} {args.path} x{args.runs} runs, {args.warm} warm requests each")
+    print(f"{'mode':<8}" + "".join(f"{m + ' p50':>22}" for m in METRICS))
+    for summary in summaries:
+        print(f"{summary['mode']:<8}" + "".join(f"{summary[m + '_p50']:>22.2f}" for m in METRICS))
+
+    with open(args.history, "a") as history:
+        for summary in summaries:
+            history.write(json.dumps(summary) + "\n")
+    print(f"\nappended to {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Latency of CAMERA_PRODUCE landmark scoring (app/core/landmarks.py).
+
+Synthetic 21-keypoint hand sequences: templates are smooth random motions,
+clips are a template replayed at a different speed with jitter, position
+and scale changes (should pass) or a different motion (should fail).
+For each clip length and template count, reports p50/p95/p99 of
+score_landmarks() once the templates are compiled, plus the request-body
+parse of the same clip (pydantic SignLandmarks), against the 50 ms p95
+target for 3-second clips.
+
+Usage (from services/api):
+    python scripts/bench_landmarks.py [iterations]
+"""
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import landmarks
+from app.core.config import settings
+
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+KEYPOINTS = 21
+FPS = 30
+TARGET_P95_MS = 50.0
+# (clip seconds, templates per exercise)
+CASES = [(1, 1), (3, 1), (3, 3), (3, 5), (5, 3), (10, 3)]
+
+
+def motion(rng, frames):
+    """A smooth random hand motion, frames x 21 x 3"""
+    np = landmarks.np
+    hand = rng.normal(0.0, 0.05, (KEYPOINTS, 3))
+    hand[0] = 0.0
+    phase = rng.uniform(0, 2 * np.pi, (KEYPOINTS, 3))
+    speed = rng.uniform(0.5, 2.0, (KEYPOINTS, 3))
+    t = np.linspace(0.0, 1.0, frames)[:, None, None]
+    return hand + 0.03 * np.sin(2 * np.pi * speed * t + phase)
+
+
+def replay(rng, template, frames):
+    """template at another speed, with jitter, an offset and a scale change"""
+    np = landmarks.np
+    index = np.linspace(0, len(template) - 1, frames).round().astype(int)
+    clip = template[index] + rng.normal(0.0, 0.002, (frames, KEYPOINTS, 3))
+    return clip * rng.uniform(0.7, 1.4) + rng.uniform(-0.3, 0.3, 3)
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    if not landmarks.available():
+        print("numpy is not installed (pip install numpy)")
+        return
+    from app.api.v1.exercises import SignLandmarks
+
+    rng = landmarks.np.random.default_rng(7)
+    print(f"{ITERATIONS} iterations per case, {KEYPOINTS} keypoints at {FPS} fps\n")
+    print(f"{'clip':>6} {'templates':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'parse ms':>9}  similarity same/other")
+    for seconds, count in CASES:
+        frames = seconds * FPS
+        templates = [motion(rng, frames) for _ in range(count)]
+        exercise = {
+            "exercise_id": f"bench-{seconds}-{count}",
+            "exercise_type": "CAMERA_PRODUCE",
+            "version": 1,
+            "answer_schema": {"templates": [template.tolist() for template in templates]},
+            "config": {"required_confidence": 0.8}
+        }
+        same = replay(rng, templates[0], min(int(frames * rng.uniform(0.8, 1.2)), settings.SIGN_MAX_FRAMES)).tolist()
+        other = motion(rng, frames).tolist()
+        landmarks.score_landmarks(exercise, same)
+
+        samples = []
+        for _ in range(ITERATIONS):
+            start = time.perf_counter()
+            landmarks.score_landmarks(exercise, same)
+            samples.append((time.perf_counter() - start) * 1000)
+
+        body = json.dumps({"frames": same})
+        parse = []
+        for _ in range(max(1, ITERATIONS // 10)):
+            start = time.perf_counter()
+            SignLandmarks.parse_raw(body)
+            parse.append((time.perf_counter() - start) * 1000)
+
+        p95 = percentile(samples, 0.95)
+        flag = "" if seconds != 3 or p95 + statistics.median(parse) < TARGET_P95_MS else "  OVER TARGET"
+        print(
+            f"{seconds:>5}s {count:>9} {statistics.median(samples):>8.2f} {p95:>8.2f} "
+            f"{percentile(samples, 0.99):>8.2f} {statistics.median(parse):>9.2f}  "
+            f"{landmarks.score_landmarks(exercise, same)['similarity']:.2f}/"
+            f"{landmarks.score_landmarks(exercise, other)['similarity']:.2f}{flag}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Load test: does a burst of logins inflate content endpoint latency?
+
+Fires N concurrent /v1/auth/login requests while a steady stream of
+/v1/languages requests is measured, once with bcrypt running inline on the
+event loop (previous behaviour) and once on the bcrypt worker pool.
+DynamoDB is replaced by an in-memory table, and the content cache runs
+memory-only (no shared version item, no /tmp tier), so only app work is
+measured.
+
+Usage (from services/api):
+    python scripts/bench_login_burst.py [logins] [content_requests]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.core import auth as core_auth
+from app.core.content_cache import content_cache
+from app.api.v1 import auth as auth_router
+from app.api.v1 import languages
+from app.main import app
+
+LOGINS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+CONTENT_REQUESTS = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+PASSWORD = "BenchPassword1!"
+
+
+class InMemoryTable:
+    """Serves one user for login and a static language list, stores refresh tokens"""
+
+    def __init__(self, password_hash):
+        self.user = {
+            'PK': 'USER#bench', 'SK': 'METADATA', 'entity_type': 'user',
+            'user_id': 'bench', 'email': 'bench@example.com', 'name': 'Bench',
+            'password_hash': password_hash, 'role': 'user', 'is_active': True
+        }
+        self.languages = [
+            {'PK': f'LANG#{c}', 'SK': 'METADATA', 'entity_type': 'language', 'code': c}
+            for c in ('pt_BR', 'en_US', 'es_ES')
+        ]
+        self.items = {}
+
+    def scan(self, **kwargs):
+        return {'Items': [self.user]}
+
+    def query(self, **kwargs):
+        return {'Items': list(self.languages)}
+
+    def get_item(self, Key, **kwargs):
+        return {'Item': self.user}
+
+    def update_item(self, **kwargs):
+        return {}
+
+    def put_item(self, Item, **kwargs):
+        self.items[(Item['PK'], Item['SK'])] = Item
+        return {}
+
+    def delete_item(self, Key, **kwargs):
+        item = self.items.pop((Key['PK'], Key['SK']), None)
+        return {'Attributes': item} if item else {}
+
+
+async def inline_verify(plain_password, hashed_password):
+    """Previous behaviour: bcrypt directly on the event loop"""
+    return core_auth.verify_password(plain_password, hashed_password)
+
+
+async def run_scenario(client):
+    content_latencies = []
+
+    async def content_stream():
+        for _ in range(CONTENT_REQUESTS):
+            start = time.perf_counter()
+            response = await client.get("/v1/languages")
+            content_latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.text
+            await asyncio.sleep(0)
+
+    async def login():
+        response = await client.post(
+            "/v1/auth/login",
+            json={"email": "bench@example.com", "password": PASSWORD}
+        )
+        assert response.status_code == 200, response.text
+
+    start = time.perf_counter()
+    await asyncio.gather(content_stream(), *(login() for _ in range(LOGINS)))
+    elapsed = time.perf_counter() - start
+    return content_latencies, elapsed
+
+
+def report(label, latencies, elapsed):
+    ordered = sorted(latencies)
+    p50 = ordered[len(ordered) // 2] * 1000
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000
+    print(f"  {label:<22} content p50={p50:7.2f}ms  p99={p99:8.2f}ms  "
+          f"max={ordered[-1] * 1000:8.2f}ms  mean={statistics.mean(latencies) * 1000:7.2f}ms  "
+          f"wall={elapsed:6.2f}s")
+
+
+async def main():
+    table = InMemoryTable(core_auth.hash_password(PASSWORD))
+    auth_router.get_dynamodb_table = lambda: table
+    languages.get_dynamodb_table = lambda: table
+    content_cache.disk = None
+    content_cache.version = None
+
+    print(f"{LOGINS} concurrent logins vs {CONTENT_REQUESTS} /v1/languages requests "
+          f"(bcrypt rounds={core_auth.settings.BCRYPT_ROUNDS})")
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        original_verify = auth_router.verify_password_async
+        auth_router.verify_password_async = inline_verify
+        report("bcrypt on event loop", *await run_scenario(client))
+
+        auth_router.verify_password_async = original_verify
+        report("bcrypt worker pool", *await run_scenario(client))
+
+    print(f"\npool stats: {core_auth.password_pool.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
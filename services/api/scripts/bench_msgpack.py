@@ -0,0 +1,68 @@
+"""
+Size and encode-time comparison of JSON and MessagePack response bodies.
+
+Renders the exercise list, leaderboard and catalog payloads from
+bench_serialization.py with FastJSONResponse for both negotiated formats
+(Accept: application/json and Accept: application/msgpack), and reports raw
+and gzip-compressed sizes plus median encode times.
+
+Usage (from services/api):
+    python scripts/bench_msgpack.py [iterations]
+"""
+import gzip
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import responses
+from app.core.responses import FastJSONResponse, response_format
+from bench_serialization import catalog_payload, exercises_payload, leaderboard_payload
+
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+
+def render(content, body_format):
+    token = response_format.set(body_format)
+    try:
+        return FastJSONResponse(content)
+    finally:
+        response_format.reset(token)
+
+
+def measure(content, body_format):
+    samples = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        render(content, body_format)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    if responses.msgpack is None:
+        print("msgpack is not installed (pip install msgpack)")
+        return
+
+    payloads = {
+        "exercises (200)": exercises_payload(),
+        "leaderboard (100)": leaderboard_payload(),
+        "catalog (20x10)": catalog_payload(),
+    }
+    print(f"Median encode time over {ITERATIONS} iterations")
+    for name, content in payloads.items():
+        print(f"\n{name}:")
+        json_size = None
+        for body_format in ("json", "msgpack"):
+            response = render(content, body_format)
+            size = len(response.body)
+            json_size = json_size or size
+            elapsed = measure(content, body_format)
+            print(f"  {response.media_type:<22} {size / 1024:8.1f} KB ({size / json_size:5.1%})  "
+                  f"gzip {len(gzip.compress(response.body)) / 1024:7.1f} KB  {elapsed * 1000:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark of response serialization on realistic payload sizes.
+
+Compares FastAPI's default path (jsonable_encoder followed by JSONResponse,
+i.e. json.dumps) with FastJSONResponse rendering the raw DynamoDB-shaped
+items directly (orjson when installed, plus the standard library fallback).
+Payloads mimic /auth/users, a catalog tree with translations, an exercise
+list and a leaderboard, with numbers as boto3 Decimals.
+
+Usage (from services/api):
+    python scripts/bench_serialization.py [iterations]
+"""
+from datetime import datetime
+from decimal import Decimal
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core import responses
+from app.core.responses import FastJSONResponse
+
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+LANGUAGES = ("es", "en", "pt")
+NOW = datetime.utcnow().isoformat() + 'Z'
+
+
+def users_payload(count=2000):
+    return {"users": [{
+        'PK': f'USER#{i}', 'SK': 'PROFILE', 'entity_type': 'user', 'user_id': f'user-{i:05d}',
+        'email': f'user{i}@example.com', 'role': 'admin' if i % 50 == 0 else 'user',
+        'created_at': NOW, 'updated_at': NOW, 'total_score': Decimal(i * 7 % 5000),
+        'streak_days': Decimal(i % 30)
+    } for i in range(count)]}
+
+
+def translations(prefix):
+    return {code: {'title': f'{prefix} title ({code})', 'description': f'{prefix} description ' * 4}
+            for code in LANGUAGES}
+
+
+def catalog_payload(topics=20, levels=10):
+    return {"topics": [{
+        'PK': f'TOPIC#{t}', 'SK': 'METADATA', 'entity_type': 'topic', 'topic_id': f'topic-{t}',
+        'slug': f'topic-{t}', 'order': Decimal(t), 'is_published': True, 'created_at': NOW,
+        'translations': translations(f'Topic {t}'),
+        'levels': [{
+            'PK': f'TOPIC#{t}', 'SK': f'LEVEL#{l}', 'entity_type': 'level', 'level_id': f'level-{t}-{l}',
+            'difficulty': 'easy', 'order': Decimal(l), 'min_score_to_pass': Decimal('70.5'),
+            'is_published': True, 'translations': translations(f'Level {l}')
+        } for l in range(levels)]
+    } for t in range(topics)]}
+
+
+def exercises_payload(count=200):
+    return {"exercises": [{
+        'PK': 'LEVEL#level-0', 'SK': f'EXERCISE#{i}', 'entity_type': 'exercise', 'exercise_id': f'ex-{i}',
+        'exercise_type': 'multiple_choice', 'order': Decimal(i), 'points': Decimal(10),
+        'media_refs': {'video': f's3://bucket/ex-{i}.mp4', 'thumbnail': f's3://bucket/ex-{i}.jpg'},
+        'correct_answer': 'b', 'created_at': NOW,
+        'translations': {code: {
+            'prompt_text': f'Which sign means word {i}? ({code})',
+            'choice_texts': [f'choice {c} ({code})' for c in 'abcd'],
+            'feedback_text': f'The correct sign for word {i} uses both hands. ({code})'
+        } for code in LANGUAGES}
+    } for i in range(count)]}
+
+
+def leaderboard_payload(count=100):
+    return {"scope": "global", "period": "all_time", "as_of": NOW, "entries": [{
+        'rank': i + 1, 'user_id': f'user-{i:05d}', 'email': f'user{i}@example.com',
+        'total_score': Decimal(10000 - i * 37), 'exercises_completed': Decimal(500 - i)
+    } for i in range(count)]}
+
+
+def fastapi_default(content):
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def fast_response(content):
+    return FastJSONResponse(content).body
+
+
+def stdlib_fallback(content):
+    return json.dumps(
+        content, default=responses._std_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def measure(func, content):
+    samples = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        func(content)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    payloads = {
+        "users (2000)": users_payload(),
+        "catalog (20x10)": catalog_payload(),
+        "exercises (200)": exercises_payload(),
+        "leaderboard (100)": leaderboard_payload(),
+    }
+    encoders = [("jsonable_encoder+json", fastapi_default), ("stdlib fallback", stdlib_fallback)]
+    if responses.orjson is not None:
+        encoders.append(("FastJSONResponse (orjson)", fast_response))
+    else:
+        print("orjson not installed: FastJSONResponse uses the stdlib fallback")
+
+    print(f"Median render time over {ITERATIONS} iterations")
+    for name, content in payloads.items():
+        assert json.loads(fast_response(content)) == json.loads(fastapi_default(content)), name
+        size_kb = len(fast_response(content)) / 1024
+        baseline = measure(fastapi_default, content)
+        print(f"\n{name}: {size_kb:.1f} KB")
+        for label, func in encoders:
+            elapsed = baseline if func is fastapi_default else measure(func, content)
+            print(f"  {label:<28} {elapsed * 1000:8.3f} ms  ({baseline / elapsed:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Throughput of micro-batched vs unbatched sign scoring (app/core/microbatch.py).
+
+Fires N concurrent 3-second, 21-keypoint clips at a set of synthetic
+CAMERA_PRODUCE exercises, the way concurrent score-sign requests would:
+- unbatched: each request runs score_landmarks on the thread pool
+- batched: each request awaits a MicroBatcher over landmarks.score_batch
+  with SIGN_BATCH_WORKERS workers and SIGN_BATCH_MAX_WAIT_MS, for several
+  max batch sizes
+Reports requests/s, p50/p95 latency and the batcher's average batch size,
+and checks that batched results equal the unbatched ones.
+
+Usage (from services/api):
+    python scripts/bench_sign_batching.py [concurrent requests] [exercises]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import landmarks
+from app.core.config import settings
+from bench_landmarks import FPS, motion, percentile, replay
+
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+EXERCISES = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+TEMPLATES = 3
+CLIP_SECONDS = 3
+BATCH_SIZES = [1, 8, 32, 64]
+
+
+def workload(rng):
+    """REQUESTS (exercise, frames) jobs spread over EXERCISES exercises"""
+    frames = CLIP_SECONDS * FPS
+    exercises = []
+    for number in range(EXERCISES):
+        templates = [motion(rng, frames) for _ in range(TEMPLATES)]
+        exercises.append((templates, {
+            "exercise_id": f"bench-batch-{number}",
+            "exercise_type": "CAMERA_PRODUCE",
+            "version": 1,
+            "answer_schema": {"templates": [template.tolist() for template in templates]},
+            "config": {"required_confidence": 0.8}
+        }))
+    jobs = []
+    for number in range(REQUESTS):
+        templates, exercise = exercises[number % EXERCISES]
+        clip = replay(rng, templates[number % TEMPLATES], int(frames * rng.uniform(0.8, 1.2)))
+        jobs.append((exercise, clip.tolist()))
+    return jobs
+
+
+async def timed(call):
+    start = time.perf_counter()
+    result = await call
+    return result, (time.perf_counter() - start) * 1000
+
+
+async def unbatched(jobs):
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=settings.SIGN_BATCH_WORKERS)
+    try:
+        return await asyncio.gather(*[
+            timed(loop.run_in_executor(executor, landmarks.score_landmarks, exercise, frames))
+            for exercise, frames in jobs
+        ])
+    finally:
+        executor.shutdown()
+
+
+async def batched(jobs, batcher):
+    return await asyncio.gather(*[timed(batcher.submit(job)) for job in jobs])
+
+
+def report(label, started, timings, extra=""):
+    elapsed = time.perf_counter() - started
+    latencies = [latency for _, latency in timings]
+    print(
+        f"{label:>12} {len(timings) / elapsed:>10.0f} {statistics.median(latencies):>8.1f} "
+        f"{percentile(latencies, 0.95):>8.1f}{extra}"
+    )
+    return elapsed
+
+
+def main():
+    if not landmarks.available():
+        print("numpy is not installed (pip install numpy)")
+        return
+    from app.core.microbatch import MicroBatcher
+
+    jobs = workload(landmarks.np.random.default_rng(11))
+    # Compile every template set up front, so both runs only score
+    landmarks.score_batch(jobs[:EXERCISES])
+
+    print(
+        f"{REQUESTS} concurrent requests, {EXERCISES} exercises x {TEMPLATES} templates, "
+        f"{CLIP_SECONDS}s clips, {settings.SIGN_BATCH_WORKERS} workers, "
+        f"max wait {settings.SIGN_BATCH_MAX_WAIT_MS} ms\n"
+    )
+    print(f"{'mode':>12} {'req/s':>10} {'p50 ms':>8} {'p95 ms':>8}  batches")
+    started = time.perf_counter()
+    expected = asyncio.run(unbatched(jobs))
+    baseline = report("unbatched", started, expected)
+
+    for size in BATCH_SIZES:
+        batcher = MicroBatcher(
+            landmarks.score_batch,
+            max_batch_size=size,
+            max_wait_ms=settings.SIGN_BATCH_MAX_WAIT_MS,
+            max_workers=settings.SIGN_BATCH_WORKERS,
+            max_queue=REQUESTS,
+            name="bench",
+        )
+        started = time.perf_counter()
+        timings = asyncio.run(batched(jobs, batcher))
+        stats = batcher.stats()
+        elapsed = report(
+            f"batch {size}", started, timings,
+            f"  avg {stats['avg_batch_size']:.1f}, max queued {stats['max_queued']}"
+        )
+        mismatches = sum(result != reference for (result, _), (reference, _) in zip(timings, expected))
+        print(f"{'':>12} {baseline / elapsed:>9.2f}x" + (f"  {mismatches} RESULTS DIFFER" if mismatches else ""))
+
+
+if __name__ == "__main__":
+    main()
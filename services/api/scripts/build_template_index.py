@@ -0,0 +1,124 @@
+"""
+Build the memory-mapped sign template index (see app/core/template_index.py).
+
+Collects reference landmark templates for CAMERA_PRODUCE exercises,
+normalizes and resamples them once (SIGN_RESAMPLE_FRAMES), and packs them
+into one contiguous float32 .npy file plus a JSON offset index keyed by
+exercise_id and config.model_version.
+
+Sources (can be combined; later ones win for the same key):
+- --dynamodb: answer_schema.templates of every CAMERA_PRODUCE exercise
+- --from-dir DIR: files named <exercise_id>[@<model_version>].json (a list
+  of frames x keypoints x 3 sequences) or .npy (one sequence, or a stack)
+
+The files are written next to each other and swapped in atomically. Package
+them with the Lambda (package_lambda.sh copies data/ when present).
+
+Usage (from services/api):
+    python scripts/build_template_index.py --dynamodb [--output data/sign_templates.npy]
+    python scripts/build_template_index.py --from-dir templates/
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import landmarks
+from app.core.config import settings
+from app.core.template_index import index_key, index_paths
+
+
+def from_dynamodb():
+    """(exercise_id, model_version, templates) for every CAMERA_PRODUCE exercise with templates"""
+    from boto3.dynamodb.conditions import Attr
+    from app.core.database import get_dynamodb_table
+
+    table = get_dynamodb_table()
+    scan = {
+        'FilterExpression': Attr('entity_type').eq('exercise') & Attr('exercise_type').eq('CAMERA_PRODUCE'),
+        'ProjectionExpression': 'exercise_id, config, answer_schema',
+    }
+    while True:
+        response = table.scan(**scan)
+        for item in response.get('Items', []):
+            templates = (item.get('answer_schema') or {}).get('templates')
+            if templates:
+                yield item['exercise_id'], (item.get('config') or {}).get('model_version'), templates
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            return
+        scan['ExclusiveStartKey'] = last_key
+
+
+def from_dir(directory: str):
+    """(exercise_id, model_version, templates) from <exercise_id>[@<model_version>].json/.npy files"""
+    np = landmarks.np
+    for name in sorted(os.listdir(directory)):
+        stem, extension = os.path.splitext(name)
+        if extension not in (".json", ".npy"):
+            continue
+        exercise_id, _, model_version = stem.partition("@")
+        path = os.path.join(directory, name)
+        if extension == ".json":
+            with open(path, encoding="utf-8") as f:
+                templates = json.load(f)
+        else:
+            array = np.load(path)
+            templates = [array] if array.ndim == 3 else list(array)
+        yield exercise_id, model_version or None, templates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dynamodb", action="store_true", help="read templates from exercise items")
+    parser.add_argument("--from-dir", help="directory of <exercise_id>[@<model_version>].json/.npy files")
+    parser.add_argument("--output", default=settings.SIGN_TEMPLATE_INDEX_PATH, help="target .npy path")
+    args = parser.parse_args()
+
+    if not landmarks.available():
+        raise SystemExit("numpy is not installed (pip install numpy)")
+    if not (args.dynamodb or args.from_dir):
+        parser.error("pass --dynamodb and/or --from-dir")
+    np = landmarks.np
+
+    packed = {}
+    sources = []
+    if args.dynamodb:
+        sources.append(from_dynamodb())
+    if args.from_dir:
+        sources.append(from_dir(args.from_dir))
+    for source in sources:
+        for exercise_id, model_version, templates in source:
+            try:
+                packed[index_key(exercise_id, model_version)] = landmarks.normalize_templates(templates)
+            except landmarks.GradingError as e:
+                print(f"Warning: {exercise_id} ({model_version or 'default'}) skipped: {e}")
+    if not packed:
+        raise SystemExit("No templates found")
+
+    entries, chunks, offset = {}, [], 0
+    for key in sorted(packed):
+        stack = np.ascontiguousarray(packed[key], dtype=np.float32)
+        count, frames, features = stack.shape
+        entries[key] = [offset, count, frames, features // 3]
+        chunks.append(stack.ravel())
+        offset += stack.size
+
+    array_path, json_path = index_paths(args.output)
+    os.makedirs(os.path.dirname(array_path), exist_ok=True)
+    with open(array_path + ".tmp", "wb") as f:
+        np.save(f, np.concatenate(chunks))
+    with open(json_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"resample_frames": settings.SIGN_RESAMPLE_FRAMES, "entries": entries}, f, separators=(",", ":"))
+    # Running processes keep their mapping of the old file until they restart
+    os.replace(array_path + ".tmp", array_path)
+    os.replace(json_path + ".tmp", json_path)
+
+    templates = sum(entry[1] for entry in entries.values())
+    print(f"✓ {len(entries)} exercises, {templates} templates, {offset * 4 / 1024:.1f} KB -> {array_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Guard the import graph of the content read path.
+
+With lazy routers (app/core/routing.py), the first content request on a cold
+Lambda loads the languages, topics, levels and exercises routers. This
+imports lambda_handler and those routers in a fresh interpreter and fails
+when that loads an app module outside ALLOWED_APP_MODULES, or any of
+FORBIDDEN_PACKAGES. Write, grading and scoring code must be imported inside
+the handlers that use it. Run in CI; when a new module genuinely belongs to
+the content path, add it to ALLOWED_APP_MODULES in the same change.
+
+Usage (from services/api):
+    python scripts/check_content_imports.py
+"""
+import json
+import os
+import subprocess
+import sys
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ALLOWED_APP_MODULES = {
+    "app",
+    "app.api",
+    "app.api.v1",
+    "app.api.v1.exercises",
+    "app.api.v1.languages",
+    "app.api.v1.levels",
+    "app.api.v1.topics",
+    "app.core",
+    "app.core.auth",
+    "app.core.compression",
+    "app.core.config",
+    "app.core.content_cache",
+    "app.core.database",
+    "app.core.disk_cache",
+    "app.core.ordering",
+    "app.core.projection",
+    "app.core.responses",
+    "app.core.revocation",
+    "app.core.routing",
+    "app.core.warmup",
+    "app.main",
+}
+# Third-party packages a content request must never load
+FORBIDDEN_PACKAGES = {"numpy", "jose", "passlib", "bcrypt", "uvicorn"}
+
+CHILD = (
+    "import json, sys; import lambda_handler; "
+    "from app.api.v1 import languages, topics, levels, exercises; "
+    "print(json.dumps(sorted(sys.modules)))"
+)
+
+
+def main():
+    env = {**os.environ, "WARMUP_ON_INIT": "false"}
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=API_DIR, env=env, check=True, capture_output=True, text=True
+    ).stdout
+    modules = json.loads(output.strip().splitlines()[-1])
+
+    unexpected = sorted(m for m in modules if m.split(".")[0] == "app" and m not in ALLOWED_APP_MODULES)
+    forbidden = sorted(m for m in modules if m in FORBIDDEN_PACKAGES)
+    for module in unexpected:
+        print(f"✗ content read path imports {module} (not in ALLOWED_APP_MODULES)")
+    for module in forbidden:
+        print(f"✗ content read path imports {module} (forbidden package)")
+    if unexpected or forbidden:
+        sys.exit(1)
+    app_modules = sum(1 for m in modules if m.split(".")[0] == "app")
+    print(f"✓ content read path imports {app_modules} app modules, none outside the allowed set")
+
+
+if __name__ == "__main__":
+    main()
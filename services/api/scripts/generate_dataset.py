@@ -0,0 +1,363 @@
+"""
+Deterministic synthetic dataset in the production data shape, for running
+leaderboard, progress and auth benchmarks against representative volumes.
+
+- catalog: published topics with many levels each, exercises per level, and
+  every topic/level/exercise translated into several languages (built with
+  the same item builders as the create endpoints). Exercises carry the
+  production config and answer_schema (scoring_rules, correct_answer or
+  target_sign, and landmark templates for CAMERA_PRODUCE), so they can be
+  graded and scored
+- users: all share one password (--password), so any of them can log in
+- progress: Zipfian activity across users (a few users have done most of
+  the catalog, most have done a little). Each user walks topics in
+  popularity order and levels in position order. Rows carry retry
+  histories: attempts, last score, best score, failed vs completed.
+
+The same --seed and preset always produce the same items (ids, timestamps
+and the shared password hash, whose bcrypt salt is derived from the seed,
+included), either as NDJSON (for scripts/seed_load.py --file
+or other tools) or written straight to DynamoDB with parallel batch writers.
+
+Usage (from services/api):
+    python scripts/generate_dataset.py --preset small --output data.ndjson
+    python scripts/generate_dataset.py --preset 100k --dynamodb
+    python scripts/generate_dataset.py --preset 10m --dynamodb --workers 32
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import settings
+from seed_load import DEFAULT_PASSWORD, EXERCISE_TYPES, Meter, hash_pool, with_password_hashes, write_items
+
+# Roughly 2k, 100k and 10M items in total (progress rows dominate the larger presets)
+PRESETS = {
+    "small": {"users": 100, "topics": 3, "levels": 5, "exercises": 8, "languages": 2, "progress": 1500},
+    "100k": {"users": 5000, "topics": 10, "levels": 10, "exercises": 10, "languages": 3, "progress": 90000},
+    "10m": {"users": 300000, "topics": 40, "levels": 20, "exercises": 12, "languages": 4, "progress": 9600000},
+}
+LANGUAGES = ["pt_BR", "en_US", "es_ES", "fr_FR", "de_DE", "it_IT"]
+DEFAULT_NOW = "2026-01-01T00:00:00"
+PASS_SCORE = 70
+CREATED_BY = "dataset-generator"
+MCQ_CHOICES = ["A", "B", "C", "D"]
+SIGN_LABELS = [chr(code) for code in range(ord("A"), ord("Z") + 1)] + [str(n) for n in range(1, 11)]
+# Reference landmark sequences: 1 second at 30 fps of a 21-keypoint hand
+TEMPLATE_FRAMES = 30
+HAND_KEYPOINTS = 21
+BCRYPT_ALPHABET = "./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+
+
+def timestamp(moment: datetime) -> str:
+    return moment.isoformat() + 'Z'
+
+
+def make_uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def zipf_counts(users: int, total: int, cap: int, exponent: float) -> list:
+    """
+    Progress rows per activity rank: min(cap, scale / rank**exponent), at least 1,
+    with scale chosen (bisection) so the counts sum to about total.
+    """
+    ranks = [(rank + 1) ** -exponent for rank in range(users)]
+
+    def counts(scale):
+        return [max(1, min(cap, int(scale * weight))) for weight in ranks]
+
+    low, high = 0.0, float(cap) * users ** exponent
+    for _ in range(50):
+        middle = (low + high) / 2
+        if sum(counts(middle)) < total:
+            low = middle
+        else:
+            high = middle
+    return counts(high)
+
+
+def seeded_password_hash(password: str, seed: int) -> str:
+    """Password hash as app.core.auth.hash_password makes it, with a bcrypt salt derived from seed"""
+    from passlib.hash import bcrypt
+    from app.core.auth import _prehash_password
+
+    rng = random.Random(f"password-salt-{seed}")
+    # The last salt character only carries 2 bits, so it comes from the 4 canonical ones
+    salt = "".join(rng.choice(BCRYPT_ALPHABET) for _ in range(21)) + rng.choice(".Oeu")
+    return bcrypt.using(rounds=settings.BCRYPT_ROUNDS, salt=salt).hash(_prehash_password(password))
+
+
+# ==================== CATALOG ====================
+
+def landmark_template(rng: random.Random, frames: int = TEMPLATE_FRAMES) -> list:
+    """A smooth synthetic hand motion, frames x HAND_KEYPOINTS x (x, y, z), rounded to 4 decimals"""
+    hand = [[rng.gauss(0.0, 0.05) for _ in range(3)] for _ in range(HAND_KEYPOINTS)]
+    waves = [[(rng.uniform(0.5, 2.0), rng.uniform(0.0, 2 * math.pi)) for _ in range(3)] for _ in range(HAND_KEYPOINTS)]
+    return [
+        [
+            [round(hand[k][c] + 0.03 * math.sin(2 * math.pi * speed * f / (frames - 1) + phase), 4)
+             for c, (speed, phase) in enumerate(waves[k])]
+            for k in range(HAND_KEYPOINTS)
+        ]
+        for f in range(frames)
+    ]
+
+
+def exercise_content(exercise_type: str, difficulty: int, rng: random.Random) -> tuple:
+    """
+    (config, answer_schema) in the shape scripts/seed_database.py creates and
+    app/core/grading.py (and app/core/landmarks.py for CAMERA_PRODUCE) grade.
+    """
+    time_limit = 30 + 15 * difficulty
+    if exercise_type == "MCQ":
+        config = {"time_limit": time_limit, "choices_count": len(MCQ_CHOICES),
+                  "scoring_rules": {"correct": 20, "incorrect": 0}}
+        return config, {"correct_answer": rng.choice(MCQ_CHOICES)}
+
+    target_sign = rng.choice(SIGN_LABELS)
+    if exercise_type == "CAMERA_PRODUCE":
+        config = {"time_limit": time_limit, "required_confidence": round(0.6 + difficulty / 20, 2),
+                  "model_version": "v1.0",
+                  "scoring_rules": {"high_confidence": 25, "medium_confidence": 15, "low_confidence": 5}}
+        return config, {"target_sign": target_sign, "templates": [landmark_template(rng)]}
+    return {"time_limit": time_limit, "scoring_rules": {"completed": 15}}, {"target_sign": target_sign}
+
+
+def catalog_items(config: dict, languages: list, rng: random.Random, now: datetime, curriculum: list):
+    """
+    Topics, levels and exercises with translations. For each topic, the
+    (level_id, exercise_id, difficulty) tuples in play order are appended to
+    curriculum.
+    """
+    from app.api.v1.admin import ExerciseImport, LevelImport, TopicImport
+    from app.api.v1.exercises import build_exercise_items
+    from app.api.v1.levels import build_level_items
+    from app.api.v1.topics import build_topic_items
+
+    created = timestamp(now - timedelta(days=365))
+    for t in range(config["topics"]):
+        topic_id = make_uuid(rng)
+        topic = TopicImport(
+            slug=f"topic-{t}",
+            default_title=f"Topic {t}",
+            order=t,
+            is_published=True,
+            translations={lang: {"title": f"Topic {t} ({lang})", "description": f"Topic {t} description"}
+                          for lang in languages}
+        )
+        item, translations = build_topic_items(topic_id, topic, CREATED_BY, created)
+        yield item
+        yield from translations
+
+        path = []
+        for l in range(config["levels"]):
+            level_id = make_uuid(rng)
+            difficulty = 1 + l * 5 // config["levels"]
+            level = LevelImport(
+                slug=f"topic-{t}-level-{l}",
+                position=l,
+                difficulty=difficulty,
+                is_published=True,
+                metadata={"estimated_time_minutes": 5 + 5 * difficulty, "min_score_to_pass": PASS_SCORE,
+                          "max_attempts": 5},
+                translations={lang: {"title": f"Level {l} ({lang})", "hint": f"Hint {l}"} for lang in languages}
+            )
+            item, translations = build_level_items(level_id, topic_id, level, CREATED_BY, created)
+            yield item
+            yield from translations
+
+            for e in range(config["exercises"]):
+                exercise_id = make_uuid(rng)
+                exercise_type = EXERCISE_TYPES[rng.randrange(len(EXERCISE_TYPES))]
+                exercise_config, answer_schema = exercise_content(exercise_type, difficulty, rng)
+                exercise = ExerciseImport(
+                    exercise_type=exercise_type,
+                    position=e,
+                    config=exercise_config,
+                    answer_schema=answer_schema,
+                    translations={
+                        lang: {
+                            "prompt_text": f"Sign {t}.{l}.{e} ({lang})",
+                            "choice_texts": [f"Option {c}" for c in MCQ_CHOICES] if exercise_type == "MCQ" else None,
+                            "feedback_text": {"correct": "Well done", "incorrect": "Try again"}
+                        }
+                        for lang in languages
+                    }
+                )
+                item, translations = build_exercise_items(exercise_id, level_id, exercise, CREATED_BY, created)
+                yield item
+                yield from translations
+                path.append((level_id, exercise_id, difficulty))
+        curriculum.append(path)
+
+
+# ==================== USERS AND PROGRESS ====================
+
+def progress_row(user_id: str, level_id: str, exercise_id: str, difficulty: int,
+                 started: datetime, rng: random.Random, in_progress: bool) -> tuple:
+    """(progress item, time of its last attempt) with a retry history"""
+    attempts = 1
+    best = score = rng.randint(30, 100 - 5 * difficulty)
+    # Harder exercises need more retries before passing
+    while best < PASS_SCORE and attempts < 5 and rng.random() < 0.8:
+        attempts += 1
+        score = min(100, score + rng.randint(0, 25))
+        best = max(best, score)
+    last = started + timedelta(minutes=rng.randint(1, 20) * attempts)
+    status = "in_progress" if in_progress else ("completed" if best >= PASS_SCORE else "failed")
+    item = {
+        'PK': f'USER#{user_id}',
+        'SK': f'PROGRESS#{exercise_id}',
+        'entity_type': 'user_progress',
+        'user_id': user_id,
+        'exercise_id': exercise_id,
+        'level_id': level_id,
+        'status': status,
+        'attempts': attempts,
+        'score': str(score),
+        'best_score': str(best),
+        'last_attempt_at': timestamp(last),
+        'created_at': timestamp(started),
+        'updated_at': timestamp(last)
+    }
+    return item, last
+
+
+def user_items(config: dict, languages: list, curriculum: list, rng: random.Random, now: datetime,
+               password_hash: str = None):
+    """Each user item followed by that user's progress rows (Zipfian row counts)"""
+    catalog_size = sum(len(path) for path in curriculum)
+    counts = zipf_counts(config["users"], config["progress"], catalog_size, config["zipf"])
+    rng.shuffle(counts)
+    # Topic popularity is Zipfian as well: users mostly start with the first topics
+    topic_weights = [1 / (t + 1) for t in range(len(curriculum))]
+
+    for i, rows in enumerate(counts):
+        user_id = make_uuid(rng)
+        joined = now - timedelta(minutes=rng.randrange(365 * 24 * 60))
+        user = {
+            'PK': f'USER#{user_id}',
+            'SK': 'METADATA',
+            'entity_type': 'user',
+            'user_id': user_id,
+            'email': f'user{i}@example.com',
+            'name': f'User {i}',
+            'language_preference': languages[rng.randrange(len(languages))],
+            'role': 'user',
+            'is_active': True,
+            'created_at': timestamp(joined),
+            'updated_at': timestamp(joined)
+        }
+        if password_hash:
+            user['password_hash'] = password_hash
+        else:
+            user['password'] = config["password"]
+        yield user
+
+        # Weighted shuffle of topics (Efraimidis-Spirakis keys), then play each in order
+        topic_order = sorted(range(len(curriculum)), key=lambda t: rng.random() ** (1 / topic_weights[t]), reverse=True)
+        played = [step for t in topic_order for step in curriculum[t]][:rows]
+        # Spread the history between joining and now
+        gap = max(1, int((now - joined).total_seconds() / 60 / (len(played) + 1)))
+        moment = joined
+        for index, (level_id, exercise_id, difficulty) in enumerate(played):
+            moment += timedelta(minutes=rng.randint(1, gap))
+            item, last = progress_row(
+                user_id, level_id, exercise_id, difficulty, moment, rng,
+                in_progress=index == len(played) - 1 and rng.random() < 0.3
+            )
+            moment = min(last, now)
+            yield item
+
+
+def dataset(config: dict, seed: int, now: datetime, password_hash: str = None):
+    """Every item, catalog first (the users' progress refers to it)"""
+    rng = random.Random(seed)
+    languages = LANGUAGES[:config["languages"]]
+    curriculum = []
+    yield from catalog_items(config, languages, rng, now, curriculum)
+    yield from user_items(config, languages, curriculum, rng, now, password_hash)
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--users", type=int, help="override the preset's user count")
+    parser.add_argument("--progress", type=int, help="override the preset's total progress rows")
+    parser.add_argument("--zipf", type=float, default=1.1, help="activity skew exponent (0 = uniform)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--now", default=DEFAULT_NOW, help="reference time for generated timestamps (UTC)")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="password of every generated user")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--output", default="-", help="NDJSON output file (default stdout)")
+    output.add_argument("--dynamodb", action="store_true", help="write straight to DynamoDB")
+    parser.add_argument("--workers", type=int, default=8, help="parallel BatchWriteItem writers")
+    parser.add_argument("--unique-hashes", action="store_true",
+                        help="hash each user's password separately (bcrypt per user) instead of sharing one hash")
+    parser.add_argument("--hash-workers", type=int, default=os.cpu_count() or 2, help="bcrypt processes")
+    args = parser.parse_args()
+
+    config = dict(PRESETS[args.preset], zipf=args.zipf, password=args.password)
+    if args.users is not None:
+        config["users"] = args.users
+    if args.progress is not None:
+        config["progress"] = args.progress
+    now = datetime.fromisoformat(args.now.rstrip("Z"))
+
+    # One bcrypt hash shared by every user keeps generation fast and login cost realistic
+    # (salted from the seed, so the output stays reproducible); NDJSON with
+    # --unique-hashes keeps plain passwords for seed_load.py to hash
+    password_hash = None
+    if not args.unique_hashes:
+        password_hash = seeded_password_hash(args.password, args.seed)
+
+    meter = Meter()
+    counts = Counter()
+
+    def counted(items):
+        for item in items:
+            counts[item['entity_type']] += 1
+            yield item
+
+    items = counted(dataset(config, args.seed, now, password_hash))
+    if args.dynamodb:
+        from app.core.database import get_dynamodb_table
+        table = get_dynamodb_table()
+        with hash_pool(args.hash_workers, settings.BCRYPT_ROUNDS) as pool:
+            write_items(with_password_hashes(items, pool), table, args.workers, meter)
+    else:
+        stream = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+        try:
+            for item in items:
+                stream.write(json.dumps(item, default=_json_default, separators=(",", ":")) + "\n")
+                meter.written += 1
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+
+    report = sys.stderr
+    print(f"\n✓ {args.preset} (seed {args.seed}): {meter.summary()}", file=report)
+    for entity_type, count in sorted(counts.items()):
+        print(f"  {entity_type:<22} {count:>12,}", file=report)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,65 @@
+"""
+Import-time report for the Lambda handler.
+
+Runs `python -X importtime -c "import <handler>"` in a fresh interpreter and
+prints the most expensive modules and top-level packages (self time).
+
+Usage (from services/api):
+    python scripts/import_report.py [--handler lambda_handler] [--top 25] [--eager]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def collect(handler: str, lazy: bool) -> list:
+    """Return (module, self_us, cumulative_us) for every import"""
+    env = dict(os.environ, LAZY_ROUTERS="true" if lazy else "false")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {handler}"],
+        cwd=API_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Import failed:\n{result.stderr}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--handler", default="lambda_handler")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--eager", action="store_true", help="disable lazy router loading")
+    args = parser.parse_args()
+
+    rows = collect(args.handler, lazy=not args.eager)
+    total_us = sum(r[1] for r in rows)
+
+    packages = defaultdict(int)
+    for module, self_us, _ in rows:
+        packages[module.split(".")[0]] += self_us
+
+    mode = "eager" if args.eager else "lazy"
+    print(f"import {args.handler} ({mode} routers): {total_us / 1000:.1f} ms, {len(rows)} modules\n")
+
+    print(f"{'package':<32}{'self ms':>10}{'share':>8}")
+    for package, self_us in sorted(packages.items(), key=lambda x: -x[1])[:args.top]:
+        print(f"{package:<32}{self_us / 1000:>10.1f}{self_us / total_us:>8.1%}")
+
+    print(f"\n{'module':<48}{'self ms':>10}{'cumul ms':>10}")
+    for module, self_us, cumulative_us in sorted(rows, key=lambda r: -r[1])[:args.top]:
+        print(f"{module:<48}{self_us / 1000:>10.1f}{cumulative_us / 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Backfill the ordering index attributes (order_pk / order_sk, and published_pk
+for published topics and levels) on existing items, so list endpoints served
+from the ordering and published GSIs see items written before they existed
+(see app/core/ordering.py).
+
+Idempotent: items whose keys are already correct are skipped. Archived items
+(archived_at set: a topic or level whose delete is pending) are skipped too, so
+they stay out of the lists. Each update is a single UpdateItem conditioned on
+the item still existing and not being archived.
+
+Create the GSIs first (scripts/setup_dynamodb.py or terraform), then run
+(from services/api):
+    python scripts/migrate_order_keys.py [--dry-run]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from boto3.dynamodb.conditions import Attr
+
+from app.core.database import get_dynamodb_table
+from app.core.ordering import order_keys
+
+ORDERED_ENTITY_TYPES = ['topic', 'level', 'exercise']
+ATTRIBUTES = [
+    'PK', 'SK', 'entity_type', 'topic_id', 'level_id', 'exercise_id',
+    'order', 'position', 'is_published', 'order_pk', 'order_sk', 'published_pk', 'archived_at'
+]
+
+
+def scan_ordered_items(table):
+    """Yield every topic, level and exercise item (only the attributes needed here)"""
+    names = {f'#a{i}': name for i, name in enumerate(ATTRIBUTES)}
+    scan = {
+        'FilterExpression': Attr('entity_type').is_in(ORDERED_ENTITY_TYPES),
+        'ProjectionExpression': ', '.join(names),
+        'ExpressionAttributeNames': names,
+    }
+    while True:
+        response = table.scan(**scan)
+        yield from response.get('Items', [])
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            return
+        scan['ExclusiveStartKey'] = last_key
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="report changes without writing")
+    args = parser.parse_args()
+
+    table = get_dynamodb_table()
+    scanned = updated = skipped = archived = 0
+    for item in scan_ordered_items(table):
+        scanned += 1
+        if 'archived_at' in item:
+            archived += 1
+            continue
+        try:
+            keys = order_keys(item)
+        except KeyError as e:
+            print(f"Warning: {item['PK']} / {item['SK']} is missing {e}, skipped")
+            skipped += 1
+            continue
+        if all(item.get(name) == value for name, value in keys.items()):
+            continue
+        state = ""
+        if 'published_pk' in keys:
+            state = " (published)" if keys['published_pk'] else " (draft)"
+        print(f"{item['entity_type']:<9} {item['PK']} / {item['SK']} -> {keys['order_pk']} {keys['order_sk']}{state}")
+        if not args.dry_run:
+            to_set = {name: value for name, value in keys.items() if value is not None}
+            to_remove = [name for name, value in keys.items() if value is None]
+            update = 'SET ' + ', '.join(f'{name} = :{name}' for name in to_set)
+            if to_remove:
+                update += ' REMOVE ' + ', '.join(to_remove)
+            try:
+                table.update_item(
+                    Key={'PK': item['PK'], 'SK': item['SK']},
+                    UpdateExpression=update,
+                    ConditionExpression='attribute_exists(PK) AND attribute_not_exists(archived_at)',
+                    ExpressionAttributeValues={f':{name}': value for name, value in to_set.items()}
+                )
+            except table.meta.client.exceptions.ConditionalCheckFailedException:
+                # Deleted or archived since the scan
+                skipped += 1
+                continue
+        updated += 1
+
+    action = "would update" if args.dry_run else "updated"
+    print(f"\nScanned {scanned} items, {action} {updated}, skipped {skipped} (and {archived} archived)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+High-throughput seed loader: writes items straight to DynamoDB through
+parallel BatchWriteItem writers (app/core/bulk_write.py, unprocessed items
+retried) instead of one HTTP request or put_item per item, and hashes user
+passwords on a process pool, each distinct password once (synthetic users
+share one password, so they share one bcrypt hash).
+
+Item sources (can be combined):
+- --file items.ndjson: one DynamoDB item per line ("-" reads stdin); a
+  plain 'password' attribute on an item is replaced by its password_hash
+- synthetic: --users N users, --topics N topics with --levels levels and
+  --exercises exercises each (translated into --languages), and --progress
+  N progress rows per user over the synthetic exercises
+
+Items are streamed in chunks, so memory stays flat for million-row loads.
+Items/second is printed while loading and at the end.
+
+Usage (from services/api):
+    python scripts/seed_load.py --users 100000 --topics 10 --progress 20
+    python scripts/seed_load.py --file items.ndjson --workers 16
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from decimal import Decimal
+from itertools import islice
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.bulk_write import batch_put
+from app.core.config import settings
+from app.core.database import TABLE_NAME, get_dynamodb_table
+
+CHUNK_SIZE = 5000
+HASH_CHUNK_SIZE = 500
+DEFAULT_PASSWORD = "SeedPassword1!"
+PROGRESS_STATUSES = ["in_progress", "completed", "completed", "failed"]
+EXERCISE_TYPES = ["MCQ", "CAMERA_PRODUCE", "COPY_PRACTICE"]
+
+
+class Meter:
+    """Thread-safe written-items counter that prints items/second every few seconds"""
+
+    def __init__(self, interval: float = 2.0):
+        self.interval = interval
+        self.written = 0
+        self.started = time.perf_counter()
+        self._last_report = self.started
+        self._lock = threading.Lock()
+
+    def add(self, count: int):
+        with self._lock:
+            self.written += count
+            now = time.perf_counter()
+            if now - self._last_report < self.interval:
+                return
+            self._last_report = now
+            written = self.written
+        print(f"  {written:>12,} items  {written / (now - self.started):>10,.0f} items/s")
+
+    def summary(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        rate = self.written / elapsed if elapsed else 0.0
+        return f"{self.written:,} items in {elapsed:.1f}s ({rate:,.0f} items/s)"
+
+
+# ==================== HASHING ====================
+
+def _init_hash_worker(rounds: int):
+    """Process pool initializer: use the seed bcrypt cost instead of the configured one"""
+    from app.core import auth
+    settings.BCRYPT_ROUNDS = rounds
+    auth.get_pwd_context.cache_clear()
+
+
+def _hash(password: str) -> str:
+    from app.core.auth import hash_password
+    return hash_password(password)
+
+
+def hash_pool(workers: int, rounds: int) -> ProcessPoolExecutor:
+    """bcrypt process pool hashing at the given cost"""
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_hash_worker, initargs=(rounds,))
+
+
+def with_password_hashes(items, pool: ProcessPoolExecutor):
+    """
+    Replace 'password' on items with 'password_hash', a chunk at a time.
+    Each distinct password is hashed once on the pool and its hash reused
+    (the memo is bounded to HASH_CHUNK_SIZE passwords, so memory stays flat).
+    """
+    hashes = {}
+    while True:
+        chunk = list(islice(items, HASH_CHUNK_SIZE))
+        if not chunk:
+            return
+        pending = [item for item in chunk if 'password' in item]
+        passwords = {item['password'] for item in pending}
+        if len(hashes.keys() | passwords) > HASH_CHUNK_SIZE:
+            hashes = {password: hashed for password, hashed in hashes.items() if password in passwords}
+        new = list(passwords - hashes.keys())
+        if new:
+            hashes.update(zip(new, pool.map(_hash, new, chunksize=16)))
+        for item in pending:
+            item['password_hash'] = hashes[item.pop('password')]
+        yield from chunk
+
+
+def write_items(items, table, workers: int, meter: Meter):
+    """Write an item stream in CHUNK_SIZE chunks with parallel batch writers (table None: count only)"""
+    while True:
+        chunk = list(islice(items, CHUNK_SIZE))
+        if not chunk:
+            return
+        if table is None:
+            meter.add(len(chunk))
+        else:
+            batch_put(table, chunk, workers=workers, on_progress=meter.add)
+
+
+# ==================== SOURCES ====================
+
+def read_ndjson(path: str):
+    """Items from an NDJSON file (numbers become Decimal, as boto3 expects)"""
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line_number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line, parse_float=Decimal)
+            if 'PK' not in item or 'SK' not in item:
+                raise SystemExit(f"{path}:{line_number}: item has no PK/SK")
+            yield item
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def synthetic_users(count: int, password: str, rng: random.Random, user_ids: list):
+    """User items like /auth/register creates them (ids are appended to user_ids)"""
+    now = datetime.utcnow()
+    for i in range(count):
+        user_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        user_ids.append(user_id)
+        created = (now - timedelta(minutes=rng.randrange(525600))).isoformat() + 'Z'
+        yield {
+            'PK': f'USER#{user_id}',
+            'SK': 'METADATA',
+            'entity_type': 'user',
+            'user_id': user_id,
+            'email': f'seed-user-{i}@example.com',
+            'name': f'Seed User {i}',
+            'password': password,
+            'language_preference': rng.choice(['pt_BR', 'en_US']),
+            'role': 'user',
+            'is_active': True,
+            'created_at': created,
+            'updated_at': created
+        }
+
+
+def synthetic_catalog(topics: int, levels: int, exercises: int, languages: list, exercise_refs: list,
+                      rng: random.Random):
+    """
+    Published topics, levels and exercises from generate_dataset.catalog_items, so
+    exercises carry graded answer schemas ((level_id, exercise_id) pairs are
+    appended to exercise_refs once the catalog is written).
+    """
+    # Imported here: generate_dataset itself imports this module
+    from generate_dataset import catalog_items
+
+    curriculum = []
+    config = {"topics": topics, "levels": levels, "exercises": exercises}
+    yield from catalog_items(config, languages, rng, datetime.utcnow(), curriculum)
+    for path in curriculum:
+        exercise_refs.extend((level_id, exercise_id) for level_id, exercise_id, _ in path)
+
+
+def synthetic_progress(per_user: int, user_ids: list, exercise_refs: list, rng: random.Random):
+    """Progress rows like /progress/submit writes them, over distinct exercises per user"""
+    now = datetime.utcnow()
+    per_user = min(per_user, len(exercise_refs))
+    for user_id in user_ids:
+        for level_id, exercise_id in rng.sample(exercise_refs, per_user):
+            score = str(rng.randint(0, 100))
+            attempted = (now - timedelta(minutes=rng.randrange(43200))).isoformat() + 'Z'
+            yield {
+                'PK': f'USER#{user_id}',
+                'SK': f'PROGRESS#{exercise_id}',
+                'entity_type': 'user_progress',
+                'user_id': user_id,
+                'exercise_id': exercise_id,
+                'level_id': level_id,
+                'status': rng.choice(PROGRESS_STATUSES),
+                'attempts': rng.randint(1, 5),
+                'score': score,
+                'best_score': score,
+                'last_attempt_at': attempted,
+                'created_at': attempted,
+                'updated_at': attempted
+            }
+
+
+def all_items(args, rng: random.Random):
+    """Every item to write, lazily (the catalog comes before progress, which needs its ids)"""
+    user_ids, exercise_refs = [], []
+    if args.file:
+        yield from read_ndjson(args.file)
+    if args.users:
+        yield from synthetic_users(args.users, args.password, rng, user_ids)
+    if args.topics:
+        languages = [lang.strip() for lang in args.languages.split(",") if lang.strip()]
+        yield from synthetic_catalog(args.topics, args.levels, args.exercises, languages, exercise_refs, rng)
+    if args.progress:
+        yield from synthetic_progress(args.progress, user_ids, exercise_refs, rng)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--file", help="NDJSON file of items ('-' for stdin)")
+    parser.add_argument("--users", type=int, default=0, help="synthetic users to create")
+    parser.add_argument("--topics", type=int, default=0, help="synthetic published topics")
+    parser.add_argument("--levels", type=int, default=5, help="levels per synthetic topic")
+    parser.add_argument("--exercises", type=int, default=10, help="exercises per synthetic level")
+    parser.add_argument("--languages", default="pt_BR,en_US", help="translation languages")
+    parser.add_argument("--progress", type=int, default=0, help="progress rows per synthetic user")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="password of every synthetic user")
+    parser.add_argument("--bcrypt-rounds", type=int, default=settings.BCRYPT_ROUNDS,
+                        help="bcrypt cost for seeded passwords (lower loads faster)")
+    parser.add_argument("--workers", type=int, default=8, help="parallel BatchWriteItem writers")
+    parser.add_argument("--hash-workers", type=int, default=os.cpu_count() or 2, help="bcrypt processes")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for synthetic data")
+    parser.add_argument("--dry-run", action="store_true", help="generate and hash, but write nothing")
+    args = parser.parse_args()
+
+    if not (args.file or args.users or args.topics):
+        parser.error("nothing to load: pass --file, --users and/or --topics")
+    if args.progress and not (args.users and args.topics):
+        parser.error("--progress needs synthetic --users and --topics in the same run")
+
+    table = None if args.dry_run else get_dynamodb_table()
+    meter = Meter()
+    print(f"Loading into {TABLE_NAME}"
+          f" ({args.workers} writers, {args.hash_workers} hash processes){' [dry run]' if args.dry_run else ''}")
+
+    with hash_pool(args.hash_workers, args.bcrypt_rounds) as pool:
+        write_items(with_password_hashes(all_items(args, random.Random(args.seed)), pool), table, args.workers, meter)
+
+    print(f"\n✓ {'Generated' if args.dry_run else 'Wrote'} {meter.summary()}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,62 @@
+"""VerifiedTokenCache: expiry at exp or max_ttl, LRU bound, invalidation"""
+import time
+
+from app.core.auth import VerifiedTokenCache
+
+
+def test_returns_cached_payload_until_exp():
+    cache = VerifiedTokenCache(max_entries=10, max_ttl=60)
+    payload = {"sub": "user-1", "exp": time.time() + 30}
+    cache.put("token-a", payload)
+    assert cache.get("token-a") is payload
+    assert cache.get("token-b") is None
+
+
+def test_expired_token_is_never_served():
+    cache = VerifiedTokenCache(max_entries=10, max_ttl=60)
+    cache.put("token-a", {"sub": "user-1", "exp": time.time() - 1})
+    assert cache.get("token-a") is None
+
+
+def test_max_ttl_bounds_long_lived_tokens(monkeypatch):
+    cache = VerifiedTokenCache(max_entries=10, max_ttl=5)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    cache.put("token-a", {"sub": "user-1", "exp": now + 3600})
+    assert cache.get("token-a") is not None
+    monkeypatch.setattr(time, "time", lambda: now + 6)
+    assert cache.get("token-a") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = VerifiedTokenCache(max_entries=2, max_ttl=60)
+    cache.put("token-a", {"sub": "a"})
+    cache.put("token-b", {"sub": "b"})
+    cache.get("token-a")
+    cache.put("token-c", {"sub": "c"})
+    assert cache.get("token-b") is None
+    assert cache.get("token-a") == {"sub": "a"}
+    assert cache.get("token-c") == {"sub": "c"}
+
+
+def test_invalidate_and_clear():
+    cache = VerifiedTokenCache(max_entries=10, max_ttl=60)
+    cache.put("token-a", {"sub": "a"})
+    cache.put("token-b", {"sub": "b"})
+    cache.invalidate("token-a")
+    assert cache.get("token-a") is None and cache.get("token-b") is not None
+    cache.clear()
+    assert cache.get("token-b") is None
+
+
+def test_raw_tokens_are_not_stored():
+    cache = VerifiedTokenCache(max_entries=10, max_ttl=60)
+    cache.put("secret-token", {"sub": "a"})
+    assert "secret-token" not in cache._entries
+    assert all(len(key) == 64 for key in cache._entries)
+
+
+def test_zero_entries_disables_the_cache():
+    cache = VerifiedTokenCache(max_entries=0, max_ttl=60)
+    cache.put("token-a", {"sub": "a"})
+    assert cache.get("token-a") is None
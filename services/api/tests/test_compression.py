@@ -0,0 +1,49 @@
+"""Accept-Encoding negotiation"""
+import gzip
+
+import pytest
+
+from app.core import compression
+from app.core.compression import choose_encoding, compress, parse_accept_encoding
+
+
+def test_parse_accept_encoding_reads_q_values():
+    assert parse_accept_encoding("gzip, deflate;q=0.5, BR;q=0.9, *;q=0") == {
+        "gzip": 1.0, "deflate": 0.5, "br": 0.9, "*": 0.0
+    }
+    assert parse_accept_encoding("gzip;q=high, , identity") == {"gzip": 0.0, "identity": 1.0}
+    assert parse_accept_encoding("") == {}
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", "gzip"),
+    ("gzip, deflate, br", "gzip"),
+    ("deflate", None),
+    ("identity", None),
+    ("", None),
+    ("gzip;q=0", None),
+    ("*", "gzip"),
+    ("*;q=0.5, gzip;q=0", None),
+])
+def test_gzip_only_without_brotli(monkeypatch, header, expected):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert choose_encoding(header) == expected
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, br", "br"),
+    ("br;q=0.5, gzip;q=0.8", "gzip"),
+    ("br;q=0, gzip;q=0.1", "gzip"),
+    ("*", "br"),
+    ("*;q=0.3, br;q=0", "gzip"),
+    ("identity", None),
+])
+def test_brotli_preferred_when_available(monkeypatch, header, expected):
+    monkeypatch.setattr(compression, "brotli", object())
+    assert choose_encoding(header) == expected
+
+
+def test_gzip_output_is_deterministic():
+    body = b'{"topics": []}' * 100
+    assert compress(body, "gzip") == compress(body, "gzip")
+    assert gzip.decompress(compress(body, "gzip")) == body
@@ -0,0 +1,100 @@
+"""DiskCache: versioned reads, TTL, LRU eviction by size, corruption recovery"""
+import time
+from decimal import Decimal
+
+import pytest
+
+from app.core.disk_cache import DiskCache
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "content.sqlite")
+
+
+def test_round_trip_converts_decimals(path):
+    cache = DiskCache(path, max_bytes=10_000, ttl=60)
+    cache.set(("topic", "t1"), {"order": Decimal("3"), "score": Decimal("2.5")}, version=1)
+    assert cache.get(("topic", "t1"), version=1) == {"order": 3, "score": 2.5}
+    assert cache.get(("topic", "t2"), version=1) is None
+
+
+def test_entries_of_another_content_version_are_not_served(path):
+    cache = DiskCache(path, max_bytes=10_000, ttl=60)
+    cache.set("topics", [1, 2], version=1)
+    assert cache.get("topics", version=2) is None
+    # ...and are dropped
+    assert cache.get("topics", version=1) is None
+
+
+def test_expired_entries_are_not_served(path, monkeypatch):
+    cache = DiskCache(path, max_bytes=10_000, ttl=5)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    cache.set("topics", [1], version=1)
+    monkeypatch.setattr(time, "time", lambda: now + 6)
+    assert cache.get("topics", version=1) is None
+
+
+def test_survives_a_new_process(path):
+    DiskCache(path, max_bytes=10_000, ttl=60).set("topics", ["a"], version=4)
+    assert DiskCache(path, max_bytes=10_000, ttl=60).get("topics", version=4) == ["a"]
+
+
+def test_least_recently_used_entries_are_evicted_by_size(path, monkeypatch):
+    cache = DiskCache(path, max_bytes=250, ttl=60)
+    clock = iter(range(1_000_000, 2_000_000))
+    monkeypatch.setattr(time, "time", lambda: next(clock))
+    value = "x" * 90
+    cache.set("a", value, version=1)
+    cache.set("b", value, version=1)
+    assert cache.get("a", version=1) == value
+    cache.set("c", value, version=1)
+
+    assert cache.get("b", version=1) is None
+    assert cache.get("a", version=1) == value and cache.get("c", version=1) == value
+    assert cache.stats()["bytes"] <= 250
+
+
+def test_values_larger_than_the_cache_are_skipped(path):
+    cache = DiskCache(path, max_bytes=50, ttl=60)
+    cache.set("big", "x" * 100, version=1)
+    assert cache.get("big", version=1) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_invalidate_drops_everything(path):
+    cache = DiskCache(path, max_bytes=10_000, ttl=60)
+    cache.set("a", 1, version=1)
+    cache.set("b", 2, version=1)
+    cache.invalidate()
+    assert cache.stats()["entries"] == 0
+
+
+def test_corrupted_file_is_recreated(path):
+    with open(path, "wb") as corrupted:
+        corrupted.write(b"this is not an sqlite database" * 100)
+    cache = DiskCache(path, max_bytes=10_000, ttl=60)
+    assert cache.get("topics", version=1) is None
+    cache.set("topics", [1], version=1)
+    assert cache.get("topics", version=1) == [1]
+
+
+def test_file_corrupted_while_open_is_recreated(path):
+    cache = DiskCache(path, max_bytes=10_000, ttl=60)
+    cache.set("topics", [1], version=1)
+    cache._conn.close()
+    cache._conn = None
+    with open(path, "r+b") as corrupted:
+        corrupted.write(b"\0" * 4096)
+    # The failing read resets the file; the cache works again afterwards
+    assert cache.get("topics", version=1) is None
+    cache.set("topics", [2], version=1)
+    assert cache.get("topics", version=1) == [2]
+
+
+def test_disabled_cache_stores_nothing(path):
+    cache = DiskCache(path, max_bytes=0, ttl=60)
+    cache.set("topics", [1], version=1)
+    assert cache.get("topics", version=1) is None
+    assert cache.stats() == {"entries": 0, "bytes": 0, "max_bytes": 0}
@@ -0,0 +1,46 @@
+"""Exercise write handlers drop every cached copy of the exercise they changed"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1 import exercises
+from app.core import cascade, landmarks, partial_update
+from app.core.auth import get_current_admin
+from app.core.grading import validator_cache
+
+
+@pytest.fixture
+def invalidated(monkeypatch):
+    """Records the invalidations; DynamoDB calls are stubbed"""
+    calls = []
+    monkeypatch.setattr(exercises, "get_dynamodb_table", lambda: object())
+    monkeypatch.setattr(validator_cache, "invalidate", lambda exercise_id: calls.append(("validator", exercise_id)))
+    monkeypatch.setattr(landmarks.template_cache, "invalidate", lambda exercise_id: calls.append(("templates", exercise_id)))
+    monkeypatch.setattr(exercises.content_cache, "invalidate", lambda: calls.append(("content", None)))
+    return calls
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(exercises.router, prefix="/v1")
+    app.dependency_overrides[get_current_admin] = lambda: {"user_id": "admin-1", "role": "admin"}
+    return TestClient(app)
+
+
+def test_update_invalidates_grading_templates_and_content(client, invalidated, monkeypatch):
+    monkeypatch.setattr(partial_update, "update_item", lambda table, key, changes, *args, **kwargs: {**key, **changes})
+    response = client.put("/v1/exercises/e1", params={"level_id": "l1"}, json={"answer_schema": {"correct_answer": "B"}})
+    assert response.status_code == 200
+    assert response.json()["answer_schema"] == {"correct_answer": "B"}
+    assert invalidated == [("validator", "e1"), ("templates", "e1"), ("content", None)]
+
+
+def test_delete_invalidates_grading_templates_and_content(client, invalidated, monkeypatch):
+    purged = []
+    monkeypatch.setattr(cascade, "exercise_subtree", lambda table, exercise_id, level_id: [exercise_id])
+    monkeypatch.setattr(cascade, "purge", lambda table, keys: purged.extend(keys))
+    response = client.delete("/v1/exercises/e1", params={"level_id": "l1"})
+    assert response.status_code == 204
+    assert purged == ["e1"]
+    assert invalidated == [("validator", "e1"), ("templates", "e1"), ("content", None)]
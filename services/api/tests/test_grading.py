@@ -0,0 +1,109 @@
+"""Answer validators compiled from answer_schema and scoring_rules"""
+import pytest
+
+from app.core.grading import GradingError, MCQValidator, SignValidator, ValidatorCache, compile_validator
+
+
+def exercise(exercise_type, answer_schema, config=None, exercise_id="e1", version=1):
+    return {
+        "exercise_id": exercise_id,
+        "exercise_type": exercise_type,
+        "answer_schema": answer_schema,
+        "config": config or {},
+        "version": version,
+    }
+
+
+def test_mcq_matches_after_strip_and_casefold():
+    validator = MCQValidator({"correct_answer": "B"}, {"correct": 20})
+    assert validator.grade(" b ") == {
+        "correct": True, "points": 20.0, "max_points": 20.0, "score": 100.0, "status": "completed"
+    }
+    assert validator.grade({"choice": "B"})["correct"]
+    wrong = validator.grade("A")
+    assert not wrong["correct"] and wrong["score"] == 0.0 and wrong["status"] == "failed"
+
+
+def test_mcq_case_sensitive_and_multiple_answers():
+    validator = MCQValidator({"correct_answers": ["A", "c"], "case_sensitive": True}, {})
+    assert validator.grade(["c", "A"])["correct"]
+    assert not validator.grade(["C", "A"])["correct"]
+    assert not validator.grade("A")["correct"]
+    assert validator.points == 100.0
+
+
+def test_mcq_needs_an_answer_key_and_an_answer():
+    with pytest.raises(GradingError):
+        MCQValidator({"correct": "SIGN_1"}, {})
+    with pytest.raises(GradingError):
+        MCQValidator({"correct_answer": "A"}, {}).grade({"sign": "A"})
+
+
+def test_copy_practice_pays_by_confidence_tier():
+    rules = {"high_confidence": 25, "medium_confidence": 15, "low_confidence": 5}
+    validator = SignValidator({"target_sign": "B"}, rules, {"required_confidence": 0.8})
+    assert validator.grade({"sign": "b", "confidence": 0.85})["points"] == 25.0
+    assert validator.grade({"sign": "B", "confidence": 0.7})["points"] == 15.0
+    assert validator.grade({"sign": "B", "confidence": 0.55})["points"] == 5.0
+    assert not validator.grade({"sign": "B", "confidence": 0.4})["correct"]
+    assert not validator.grade({"sign": "C", "confidence": 0.99})["correct"]
+    with pytest.raises(GradingError):
+        validator.grade({"sign": "B", "confidence": "high"})
+
+
+def test_copy_practice_completed_rule():
+    validator = SignValidator({"target_sign": "C"}, {"completed": 15}, {})
+    assert validator.grade({"completed": True})["points"] == 15.0
+    assert validator.grade("C")["correct"]
+    assert not validator.grade({"completed": False})["correct"]
+
+
+def test_camera_produce_is_graded_from_the_server_similarity_only():
+    rules = {"high_confidence": 25, "medium_confidence": 15, "low_confidence": 5}
+    validator = compile_validator(exercise("CAMERA_PRODUCE", {"target_sign": "B"}, {"scoring_rules": rules}))
+    with pytest.raises(GradingError):
+        validator.grade({"sign": "B", "confidence": 1.0})
+    assert validator.grade({"frames": []}, similarity=0.9)["points"] == 25.0
+    assert validator.grade({"frames": []}, similarity=0.66)["points"] == 15.0
+    assert not validator.grade({"frames": []}, similarity=0.3)["correct"]
+
+
+def test_camera_produce_without_tiers_passes_at_required_confidence():
+    validator = compile_validator(exercise(
+        "CAMERA_PRODUCE", {"target_sign": "B"}, {"required_confidence": 0.75, "scoring_rules": {"completed": 10}}
+    ))
+    assert validator.grade_similarity(0.75)["points"] == 10.0
+    assert not validator.grade_similarity(0.74)["correct"]
+
+
+def test_compile_validator_rejects_unknown_shapes():
+    with pytest.raises(GradingError):
+        compile_validator(exercise("VIDEO", {"target_sign": "B"}))
+    with pytest.raises(GradingError):
+        compile_validator(exercise("COPY_PRACTICE", {"correct": "SIGN_1"}))
+
+
+def test_validator_cache_compiles_once_per_version():
+    compiled = []
+
+    def compile(item):
+        compiled.append((item["exercise_id"], item["version"]))
+        return compile_validator(item)
+
+    cache = ValidatorCache(max_entries=2, compile=compile)
+    first = cache.get(exercise("MCQ", {"correct_answer": "A"}))
+    assert cache.get(exercise("MCQ", {"correct_answer": "A"})) is first
+    edited = cache.get(exercise("MCQ", {"correct_answer": "B"}, version=2))
+    assert edited.grade("B")["correct"]
+    assert compiled == [("e1", 1), ("e1", 2)]
+
+    cache.invalidate("e1")
+    cache.get(exercise("MCQ", {"correct_answer": "B"}, version=2))
+    assert compiled[-1] == ("e1", 2) and cache.stats()["compiles"] == 3
+
+
+def test_validator_cache_is_bounded():
+    cache = ValidatorCache(max_entries=2)
+    for number in range(3):
+        cache.get(exercise("MCQ", {"correct_answer": "A"}, exercise_id=f"e{number}"))
+    assert cache.stats()["entries"] == 2
@@ -0,0 +1,106 @@
+"""Landmark DTW scoring on known sequences"""
+import pytest
+
+from app.core import landmarks
+from app.core.grading import GradingError
+
+np = pytest.importorskip("numpy")
+
+
+def column(*values):
+    """pairs=1 x frames x 1 feature sequence"""
+    return np.array(values, dtype=np.float32).reshape(1, -1, 1)
+
+
+def test_identical_sequences_have_zero_distance():
+    assert landmarks.dtw_distances(column(0, 1, 2, 3), column(0, 1, 2, 3), band=10)[0] == 0.0
+
+
+def test_time_warped_copy_has_zero_distance():
+    # (0, 0, 1, 1) and (0, 1, 1, 1) align exactly once 0 and 1 are stretched
+    assert landmarks.dtw_distances(column(0, 0, 1, 1), column(0, 1, 1, 1), band=10)[0] == 0.0
+
+
+def test_distance_is_the_path_cost_over_n_plus_m():
+    # Every cell costs 1; the diagonal path visits 2 cells
+    assert landmarks.dtw_distances(column(0, 0), column(1, 1), band=10)[0] == pytest.approx(2 / 4)
+    # Within a zero-width band only the diagonal is allowed: |0-0| + |0-1| + |1-1| + |1-1|
+    assert landmarks.dtw_distances(column(0, 0, 1, 1), column(0, 1, 1, 1), band=0)[0] == pytest.approx(1 / 8)
+
+
+def test_pairs_are_independent():
+    a = np.concatenate([column(0, 1, 2), column(0, 0, 0), column(4, 2, 0)])
+    b = np.concatenate([column(0, 1, 2), column(1, 1, 1), column(0, 2, 4)])
+    together = landmarks.dtw_distances(a, b, band=10)
+    alone = [landmarks.dtw_distances(a[p:p + 1], b[p:p + 1], band=10)[0] for p in range(3)]
+    assert together.tolist() == pytest.approx(alone)
+    assert together[0] == 0.0 and together[1] == pytest.approx(3 / 6)
+
+
+def hand_motion(frames=30, keypoints=21, seed=5):
+    rng = np.random.default_rng(seed)
+    hand = rng.normal(0, 0.05, (keypoints, 3))
+    phases = rng.uniform(0, 2 * np.pi, (keypoints, 3))
+    t = np.linspace(0, 1, frames)[:, None, None]
+    return (hand[None] + 0.03 * np.sin(2 * np.pi * t + phases[None])).astype(np.float32)
+
+
+def camera_exercise(templates, exercise_id="landmarks-test"):
+    return {
+        "exercise_id": exercise_id,
+        "exercise_type": "CAMERA_PRODUCE",
+        "version": 1,
+        "answer_schema": {"templates": [template.tolist() for template in templates]},
+        "config": {"required_confidence": 0.8},
+    }
+
+
+def test_template_scores_itself_as_a_match():
+    template = hand_motion()
+    result = landmarks.TemplateSet(camera_exercise([template])).score(template.tolist())
+    assert result["similarity"] == pytest.approx(1.0, abs=1e-3)
+    assert result["passed"] and result["template"] == 0 and result["frames"] == 30
+
+
+def test_score_ignores_position_hand_size_and_speed():
+    template = hand_motion()
+    template_set = landmarks.TemplateSet(camera_exercise([template]))
+    moved = template * 2.5 + np.array([0.3, -0.2, 0.1], dtype=np.float32)
+    slower = np.repeat(template, 2, axis=0)
+    assert template_set.score(moved.tolist())["similarity"] == pytest.approx(1.0, abs=1e-3)
+    assert template_set.score(slower.tolist())["similarity"] > 0.95
+
+
+def test_closest_template_wins_and_other_motions_fail():
+    target, other = hand_motion(seed=1), hand_motion(seed=2)
+    template_set = landmarks.TemplateSet(camera_exercise([other, target]))
+    assert template_set.score(target.tolist())["template"] == 1
+    assert not landmarks.TemplateSet(camera_exercise([other])).score(target.tolist())["passed"]
+
+
+def test_batched_scores_equal_single_scores():
+    templates = [hand_motion(seed=seed) for seed in range(3)]
+    exercise = camera_exercise(templates, exercise_id="landmarks-batch")
+    clips = [hand_motion(frames=frames, seed=seed) for frames, seed in ((30, 0), (45, 1), (20, 7))]
+    jobs = [(exercise, clip.tolist()) for clip in clips]
+    assert landmarks.score_batch(jobs) == [landmarks.score_landmarks(*job) for job in jobs]
+
+
+@pytest.mark.parametrize("frames", [
+    [[[0.0, 0.0, 0.0]]],  # one frame
+    [[[0.0, 0.0]] * 21] * 10,  # 2 coordinates
+    [[["x", 0.0, 0.0]] * 21] * 10,
+    [[[float("nan"), 0.0, 0.0]] * 21] * 10,
+    [[[0.0, 0.0, 0.0]] * 5] * 10,  # wrong keypoint count
+])
+def test_malformed_landmarks_are_rejected(frames):
+    template_set = landmarks.TemplateSet(camera_exercise([hand_motion()]))
+    with pytest.raises(GradingError):
+        template_set.score(frames)
+
+
+def test_exercises_without_templates_cannot_be_scored():
+    with pytest.raises(GradingError):
+        landmarks.compile_templates({**camera_exercise([]), "answer_schema": {}})
+    with pytest.raises(GradingError):
+        landmarks.compile_templates({**camera_exercise([hand_motion()]), "exercise_type": "MCQ"})
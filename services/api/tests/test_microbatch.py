@@ -0,0 +1,184 @@
+"""MicroBatcher: batching, max wait, abandoned callers, 503 on a full queue, event loop changes"""
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.microbatch import MicroBatcher
+
+
+def make_batcher(process_batch, **options):
+    settings = {"max_batch_size": 8, "max_wait_ms": 20, "max_workers": 1, "max_queue": 64, "name": "test"}
+    settings.update(options)
+    return MicroBatcher(process_batch, **settings)
+
+
+class Recorder:
+    """process_batch stub: doubles each item and records the batches it saw"""
+
+    def __init__(self, gate: threading.Event = None):
+        self.gate = gate
+        self.batches = []
+
+    def __call__(self, items):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.batches.append(list(items))
+        return [item * 2 for item in items]
+
+
+async def until(condition, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.005)
+
+
+def test_concurrent_submits_are_scored_in_one_batch():
+    recorder = Recorder()
+    batcher = make_batcher(recorder, max_wait_ms=50)
+
+    async def run():
+        return await asyncio.gather(*[batcher.submit(n) for n in range(6)])
+
+    assert asyncio.run(run()) == [0, 2, 4, 6, 8, 10]
+    assert recorder.batches == [[0, 1, 2, 3, 4, 5]]
+    stats = batcher.stats()
+    assert stats["batches"] == 1 and stats["items"] == 6 and stats["avg_batch_size"] == 6
+
+
+def test_batches_are_capped_at_max_batch_size():
+    recorder = Recorder()
+    batcher = make_batcher(recorder, max_batch_size=4, max_wait_ms=50)
+
+    async def run():
+        return await asyncio.gather(*[batcher.submit(n) for n in range(10)])
+
+    assert asyncio.run(run()) == [n * 2 for n in range(10)]
+    assert [len(batch) for batch in recorder.batches] == [4, 4, 2]
+    assert batcher.stats()["largest_batch_size"] == 4
+
+
+def test_partial_batch_is_flushed_after_max_wait():
+    recorder = Recorder()
+    batcher = make_batcher(recorder, max_batch_size=100, max_wait_ms=30)
+
+    async def run():
+        started = time.perf_counter()
+        result = await asyncio.wait_for(batcher.submit(21), timeout=2)
+        return result, time.perf_counter() - started
+
+    result, elapsed = asyncio.run(run())
+    assert result == 42
+    assert recorder.batches == [[21]]
+    assert 0.02 <= elapsed < 1.0
+
+
+def test_callers_that_timed_out_are_not_scored():
+    gate = threading.Event()
+    recorder = Recorder(gate)
+    batcher = make_batcher(recorder, max_batch_size=1, max_wait_ms=0)
+
+    async def run():
+        first = asyncio.ensure_future(batcher.submit(1))
+        await until(lambda: batcher.stats()["running"] == 1)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(batcher.submit(2), timeout=0.05)
+        gate.set()
+        return await first
+
+    assert asyncio.run(run()) == 2
+    assert recorder.batches == [[1]]
+
+
+def test_item_exceptions_reach_only_their_caller():
+    def process(items):
+        return [ValueError(f"bad {item}") if item % 2 else item for item in items]
+
+    batcher = make_batcher(process, max_wait_ms=50)
+
+    async def run():
+        return await asyncio.gather(*[batcher.submit(n) for n in range(4)], return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert results[0] == 0 and results[2] == 2
+    assert isinstance(results[1], ValueError) and str(results[3]) == "bad 3"
+
+
+def test_batch_failure_fails_every_caller():
+    def process(items):
+        raise RuntimeError("scorer down")
+
+    batcher = make_batcher(process, max_wait_ms=50)
+
+    async def run():
+        return await asyncio.gather(*[batcher.submit(n) for n in range(3)], return_exceptions=True)
+
+    assert [str(result) for result in asyncio.run(run())] == ["scorer down"] * 3
+
+
+def test_full_queue_is_rejected_with_503():
+    gate = threading.Event()
+    recorder = Recorder(gate)
+    batcher = make_batcher(recorder, max_batch_size=1, max_wait_ms=0, max_queue=2)
+
+    async def run():
+        # One batch running, one held by the collector waiting for a worker, two queued
+        running = asyncio.ensure_future(batcher.submit(1))
+        await until(lambda: batcher.stats()["running"] == 1)
+        held = asyncio.ensure_future(batcher.submit(2))
+        await asyncio.sleep(0.02)
+        await until(lambda: batcher.stats()["queued"] == 0)
+        queued = [asyncio.ensure_future(batcher.submit(n)) for n in (3, 4)]
+        await until(lambda: batcher.stats()["queued"] == 2)
+
+        with pytest.raises(HTTPException) as rejected:
+            await batcher.submit(5)
+        gate.set()
+        return rejected.value, await asyncio.gather(running, held, *queued)
+
+    rejected, results = asyncio.run(run())
+    assert rejected.status_code == 503
+    assert rejected.headers == {"Retry-After": "1"}
+    assert results == [2, 4, 6, 8]
+    assert batcher.stats()["rejected"] == 1
+
+
+def test_batches_of_an_old_loop_do_not_release_the_new_loop_workers():
+    gate = threading.Event()
+    running_seen = []
+    batcher = None
+
+    def process(items):
+        if items == ["old"]:
+            gate.wait(5)
+        running_seen.append(batcher.stats()["running"])
+        return items
+
+    batcher = make_batcher(process, max_batch_size=1, max_wait_ms=0)
+    old_loop, new_loop = asyncio.new_event_loop(), asyncio.new_event_loop()
+    try:
+        old = old_loop.create_task(batcher.submit("old"))
+        old_loop.run_until_complete(until(lambda: batcher.stats()["running"] == 1))
+
+        # A new loop gets its own queue, collector and semaphore; the old batch finishes meanwhile
+        threading.Timer(0.1, gate.set).start()
+        assert new_loop.run_until_complete(batcher.submit("new")) == "new"
+        assert old_loop.run_until_complete(old) == "old"
+
+        async def burst():
+            return await asyncio.gather(*[batcher.submit(n) for n in range(6)])
+
+        running_seen.clear()
+        assert new_loop.run_until_complete(burst()) == list(range(6))
+        assert max(running_seen) == 1
+    finally:
+        for loop in (old_loop, new_loop):
+            # Stop each loop's collector before closing it
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.close()
@@ -0,0 +1,103 @@
+"""Display-order index keys and page cursors"""
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.ordering import (
+    apply_order_keys, decode_cursor, encode_cursor, levels_list_key, order_key_changes, order_keys,
+    position_key, topics_list_key
+)
+
+
+def test_position_key_pads_clamps_and_defaults():
+    assert position_key(3, "id") == "000003#id"
+    assert position_key("12", "id") == "000012#id"
+    assert position_key(-5, "id") == "000000#id"
+    assert position_key(10 ** 9, "id") == "999999#id"
+    assert position_key(None, "id") == "000999#id"
+    assert position_key("first", "id") == "000999#id"
+
+
+def test_position_keys_sort_in_display_order():
+    keys = [position_key(position, f"id-{position}") for position in (10, 2, 1, 100)]
+    assert sorted(keys) == [position_key(p, f"id-{p}") for p in (1, 2, 10, 100)]
+
+
+def test_order_keys_per_entity_type():
+    topic = {"entity_type": "topic", "topic_id": "t1", "order": "2", "is_published": True}
+    assert order_keys(topic) == {"order_pk": "TOPICS", "order_sk": "000002#t1", "published_pk": "TOPICS"}
+
+    draft = {"entity_type": "level", "topic_id": "t1", "level_id": "l1", "position": "1", "is_published": False}
+    assert order_keys(draft) == {"order_pk": "TOPIC#t1#LEVELS", "order_sk": "000001#l1", "published_pk": None}
+
+    exercise = {"entity_type": "exercise", "level_id": "l1", "exercise_id": "e1", "position": "4"}
+    assert order_keys(exercise) == {"order_pk": "LEVEL#l1#EXERCISES", "order_sk": "000004#e1"}
+
+    assert order_keys({"entity_type": "user"}) == {}
+
+
+def test_apply_order_keys_removes_published_pk_from_drafts():
+    item = {"entity_type": "topic", "topic_id": "t1", "order": "1", "is_published": False, "published_pk": "TOPICS"}
+    apply_order_keys(item)
+    assert "published_pk" not in item
+    assert item["order_pk"] == "TOPICS" and item["order_sk"] == "000001#t1"
+
+
+def test_order_key_changes_follow_the_changed_fields():
+    item = {"entity_type": "level", "topic_id": "t1", "level_id": "l1", "position": "7", "is_published": False}
+    assert order_key_changes(item, {"slug"}) == ({}, [])
+    assert order_key_changes(item, {"position"}) == (
+        {"order_pk": "TOPIC#t1#LEVELS", "order_sk": "000007#l1"}, []
+    )
+    assert order_key_changes(item, {"is_published"}) == ({}, ["published_pk"])
+    assert order_key_changes({**item, "is_published": True}, {"is_published"}) == (
+        {"published_pk": "TOPIC#t1#LEVELS"}, []
+    )
+
+
+def last_key(order_pk, published_only=False):
+    partition = "published_pk" if published_only else "order_pk"
+    return {"PK": "TOPIC#t1", "SK": "METADATA", partition: order_pk, "order_sk": "000001#t1"}
+
+
+def test_cursor_round_trip():
+    key = last_key(topics_list_key())
+    cursor = encode_cursor(key)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, topics_list_key()) == key
+
+    published = last_key(topics_list_key(), published_only=True)
+    assert decode_cursor(encode_cursor(published), topics_list_key(), published_only=True) == published
+
+
+def test_no_cursor_on_the_last_page():
+    assert encode_cursor(None) is None
+    assert encode_cursor({}) is None
+    assert decode_cursor(None, topics_list_key()) is None
+    assert decode_cursor("", topics_list_key()) is None
+
+
+def forge(key) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64 !!",
+    forge(["PK", "SK"]),
+    # Cursor of another list
+    encode_cursor(last_key(levels_list_key("t1"))),
+    # Cursor of the other index
+    encode_cursor(last_key(topics_list_key(), published_only=True)),
+    # Extra or missing attributes
+    forge({**last_key(topics_list_key()), "user_id": "u1"}),
+    forge({"PK": "TOPIC#t1", "SK": "METADATA", "order_pk": "TOPICS"}),
+    # Non-string and empty values
+    forge({**last_key(topics_list_key()), "order_sk": 5}),
+    forge({**last_key(topics_list_key()), "SK": ""}),
+])
+def test_invalid_cursors_are_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, topics_list_key())
+    assert error.value.status_code == 400
@@ -0,0 +1,55 @@
+"""update_item: conditions, 404/409 from the failed condition's item"""
+import pytest
+from fastapi import HTTPException
+
+from app.core.partial_update import update_item
+
+
+class ConditionalCheckFailedException(Exception):
+    def __init__(self, item=None):
+        super().__init__("The conditional request failed")
+        self.response = {'Item': item} if item is not None else {}
+
+
+class FakeClient:
+    class exceptions:
+        ConditionalCheckFailedException = ConditionalCheckFailedException
+
+
+class FakeTable:
+    """Records the UpdateItem call; fails its condition with current_item when given"""
+
+    class meta:
+        client = FakeClient
+
+    def __init__(self, current_item=None, fails=False):
+        self.current_item = current_item
+        self.fails = fails
+        self.request = None
+
+    def update_item(self, **request):
+        self.request = request
+        if self.fails:
+            raise ConditionalCheckFailedException(self.current_item)
+        return {'Attributes': {**request['Key'], 'version': 1}}
+
+
+KEY = {'PK': 'TOPIC#t1', 'SK': 'METADATA'}
+
+
+def test_archived_items_are_excluded_by_the_condition():
+    table = FakeTable()
+    assert update_item(table, KEY, {'is_published': True}, 'admin-1') == {**KEY, 'version': 1}
+    assert table.request['ConditionExpression'] == 'attribute_exists(PK) AND attribute_not_exists(archived_at)'
+
+
+@pytest.mark.parametrize("current_item, status_code", [
+    (None, 404),
+    ({'PK': {'S': 'TOPIC#t1'}, 'archived_at': {'S': '2026-10-19T07:00:00Z'}, 'version': {'N': '3'}}, 404),
+    ({'PK': {'S': 'TOPIC#t1'}, 'version': {'N': '3'}}, 409),
+])
+def test_failed_condition_reports_missing_archived_or_stale_items(current_item, status_code):
+    table = FakeTable(current_item, fails=True)
+    with pytest.raises(HTTPException) as error:
+        update_item(table, KEY, {'position': '2'}, 'admin-1', expected_version=2, entity="Topic")
+    assert error.value.status_code == status_code
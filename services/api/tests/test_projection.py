@@ -0,0 +1,61 @@
+"""fields= parsing, ProjectionExpression building and trimming"""
+import pytest
+from fastapi import HTTPException
+
+from app.core.projection import MAX_FIELDS, parse_fields, projection, trim, without_covered
+
+
+def test_no_fields_means_whole_items():
+    assert parse_fields(None) is None
+    assert parse_fields("") is None
+    assert parse_fields(" , ,") is None
+
+
+def test_fields_are_stripped_deduplicated_and_sorted():
+    assert parse_fields(" slug,topic_id ,slug,config.time_limit") == ("config.time_limit", "slug", "topic_id")
+
+
+def test_paths_under_a_requested_parent_are_dropped():
+    assert parse_fields("config,config.time_limit,config.choices_count") == ("config",)
+    assert without_covered(["a.b", "a.b.c", "ab", "a.bc"]) == ("a.b", "a.bc", "ab")
+
+
+@pytest.mark.parametrize("fields", ["bad name", "1abc", "config..time_limit", "a.*", "#x"])
+def test_invalid_field_names_are_rejected(fields):
+    with pytest.raises(HTTPException) as error:
+        parse_fields(fields)
+    assert error.value.status_code == 400
+
+
+def test_too_many_fields_are_rejected():
+    with pytest.raises(HTTPException) as error:
+        parse_fields(",".join(f"field_{n}" for n in range(MAX_FIELDS + 1)))
+    assert error.value.status_code == 400
+
+
+def test_projection_aliases_every_name_once():
+    kwargs = projection(("config.time_limit", "slug"), required=("PK", "config"))
+    # config.time_limit is covered by the required config
+    assert kwargs["ProjectionExpression"] == "#p0, #p1, #p2"
+    assert kwargs["ExpressionAttributeNames"] == {"#p0": "PK", "#p1": "config", "#p2": "slug"}
+
+
+def test_projection_of_nested_paths_shares_aliases():
+    kwargs = projection(("config.time_limit", "config.choices_count"))
+    names = kwargs["ExpressionAttributeNames"]
+    assert sorted(names.values()) == ["choices_count", "config", "time_limit"]
+    config = next(alias for alias, name in names.items() if name == "config")
+    expressions = kwargs["ProjectionExpression"].split(", ")
+    assert len(expressions) == 2 and all(expression.startswith(config + ".") for expression in expressions)
+
+
+def test_whole_items_need_no_projection():
+    assert projection(None, required=("PK",)) == {}
+
+
+def test_trim_drops_internal_attributes_but_keeps_translations():
+    item = {"PK": "TOPIC#t1", "slug": "a", "config": {"time_limit": 30}, "translation": {"title": "A"}}
+    assert trim(item, ("config.time_limit", "slug")) == {
+        "slug": "a", "config": {"time_limit": 30}, "translation": {"title": "A"}
+    }
+    assert trim(item, None) is item
@@ -0,0 +1,96 @@
+"""Revocation BloomFilter: no false negatives, sizing, false-positive rate; syncs and failed reads"""
+import asyncio
+import time
+
+import pytest
+
+from app.core import revocation
+from app.core.revocation import BloomFilter, TokenRevocationList
+
+
+def test_added_keys_are_always_found():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [f"jti-{n}" for n in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    assert bloom.count == 1000
+
+
+def test_empty_filter_contains_nothing():
+    bloom = BloomFilter(capacity=100, error_rate=0.01)
+    assert "jti-1" not in bloom
+
+
+def test_sized_from_capacity_and_error_rate():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    # m = -n ln p / (ln 2)^2, k = m / n ln 2
+    assert bloom.num_bits == 9585
+    assert bloom.num_hashes == 7
+    assert bloom.size_bytes == 1199
+
+
+def test_false_positive_rate_is_near_the_target():
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    for n in range(2000):
+        bloom.add(f"revoked-{n}")
+    false_positives = sum(f"valid-{n}" in bloom for n in range(20000))
+    assert false_positives / 20000 < 0.02
+
+
+class FakeRevocationTable:
+    """Revocation items of the entity_type GSI; key conditions are evaluated on created_at"""
+
+    def __init__(self, items=(), fail=False):
+        self.items = list(items)
+        self.fail = fail
+        self.calls = 0
+
+    def query(self, KeyConditionExpression, **kwargs):
+        self.calls += 1
+        expression = KeyConditionExpression.get_expression()
+        since = expression['values'][1].get_expression()['values'][1] if expression['operator'] == 'AND' else ''
+        return {'Items': [item for item in self.items if item['created_at'] >= since]}
+
+    def get_item(self, Key, **kwargs):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("DynamoDB unavailable")
+        return {}
+
+
+def revoked(jti, created_at):
+    return {'jti': jti, 'created_at': created_at, 'ttl': int(time.time()) + 3600}
+
+
+@pytest.fixture
+def table(monkeypatch):
+    table = FakeRevocationTable()
+    monkeypatch.setattr(revocation, "get_fail_fast_table", lambda timeout: table)
+    return table
+
+
+def test_incremental_sync_picks_up_revocations_that_reached_the_index_late(table):
+    revocations = TokenRevocationList(capacity=1000, error_rate=0.01)
+    table.items = [revoked("a", "2026-10-19T07:00:05.000000Z")]
+    assert revocations.sync(full=True) == 1
+
+    # Written before "a" but visible in the GSI only now, within the skew window
+    table.items.append(revoked("late", "2026-10-19T07:00:01.000000Z"))
+    assert revocations.sync() == 1
+    assert "late" in revocations._bloom
+    # "a" is read again but not counted twice
+    assert revocations.stats()["bloom_entries"] == 2
+    assert revocations.stats()["cursor"] == "2026-10-19T07:00:05.000000Z"
+
+
+def test_failed_lookups_fail_open_without_calling_dynamodb_again(table, monkeypatch):
+    monkeypatch.setattr(revocation.settings, "REVOCATION_FAILURE_TTL_SECONDS", 60)
+    table.fail = True
+    revocations = TokenRevocationList(capacity=1000, error_rate=0.01)
+
+    async def check():
+        return [await revocations._lookup(f"jti-{n}", time.time()) for n in range(5)]
+
+    assert asyncio.run(check()) == [False] * 5
+    assert table.calls == 1